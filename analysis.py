@@ -0,0 +1,567 @@
+"""
+Position Analysis Module
+
+This module provides a registry of analysis helpers (statistics and board
+annotations) together with the shared intermediates they depend on.
+
+Each helper declares which intermediates it needs (attack maps, pin masks,
+pawn masks, ...). A PositionAnalysis resolves the transitive dependencies of
+the enabled helpers only, and computes every intermediate at most once per
+position.
+
+Intermediates and annotation helpers are python-chess bitboards (int masks
+indexed by chess.Square), so they can be combined with chess.BB_* constants.
+Statistics are counts; each one also has a highlight mask (the pieces or
+squares behind the count), computed from the same intermediates and memoized
+alongside it.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import chess
+from config import GameConstants
+
+# Bump whenever a helper's result changes, so persisted results (analysis_cache.py) are not reused
+ANALYSIS_VERSION = 1
+
+
+class Intermediate:
+    """A shared per-position value that helpers can depend on"""
+
+    def __init__(self, name: str, requires: Tuple[str, ...], compute: Callable):
+        self.name = name
+        self.requires = requires
+        self.compute = compute  # compute(analysis) -> value
+
+
+class Helper:
+    """A statistic or board annotation that can be toggled in the help panel"""
+
+    def __init__(self, key: str, label: str, option_key: str, requires: Tuple[str, ...],
+                 compute: Optional[Callable] = None, higher_is_better: bool = True, kind: str = "statistic",
+                 highlight: Optional[Callable] = None):
+        self.key = key
+        self.label = label
+        self.option_key = option_key  # ChessDisplay help option controlling this helper
+        self.requires = requires
+        # compute(analysis, color) -> value for that color; statistics without one
+        # count the squares of their highlight mask
+        self.compute = compute
+        self.higher_is_better = higher_is_better
+        self.kind = kind  # "statistic" (panel table row) or "annotation" (board overlay)
+        self.highlight = highlight  # highlight(analysis, color) -> mask shown when the statistic is hovered
+
+
+# ---------------------------------------------------------------------------
+# Bitboard helpers
+# ---------------------------------------------------------------------------
+
+def _fill_north(bb: int) -> int:
+    """Smear every set bit towards rank 8"""
+    bb |= (bb << 8) & chess.BB_ALL
+    bb |= (bb << 16) & chess.BB_ALL
+    bb |= (bb << 32) & chess.BB_ALL
+    return bb
+
+
+def _fill_south(bb: int) -> int:
+    """Smear every set bit towards rank 1"""
+    bb |= bb >> 8
+    bb |= bb >> 16
+    bb |= bb >> 32
+    return bb
+
+
+def _file_fill(bb: int) -> int:
+    """Expand every set bit to its whole file"""
+    return _fill_north(bb) | _fill_south(bb)
+
+
+def _adjacent_files(bb: int) -> int:
+    """Squares one file to the left or right of the given squares"""
+    return chess.shift_left(bb) | chess.shift_right(bb)
+
+
+def pawn_attacks_mask(pawns: int, color: bool) -> int:
+    """Squares attacked by the given pawns of the given color"""
+    if color == chess.WHITE:
+        return chess.shift_up_left(pawns) | chess.shift_up_right(pawns)
+    return chess.shift_down_left(pawns) | chess.shift_down_right(pawns)
+
+
+def mask_to_squares(mask: int) -> List[chess.Square]:
+    """Convert a bitboard into an ascending list of squares"""
+    return list(chess.scan_forward(mask))
+
+
+# ---------------------------------------------------------------------------
+# Intermediates
+# ---------------------------------------------------------------------------
+
+def _compute_attack_maps(analysis: 'PositionAnalysis') -> Tuple[int, int]:
+    """Union of attacked squares for (white, black)"""
+    board = analysis.board_state.board
+    maps = []
+    for color in (chess.WHITE, chess.BLACK):
+        attacked = 0
+        for square in chess.scan_forward(board.occupied_co[color]):
+            attacked |= board.attacks_mask(square)
+        maps.append(attacked)
+    return (maps[0], maps[1])
+
+
+def _compute_hanging_masks(analysis: 'PositionAnalysis') -> Tuple[int, int]:
+    """Pieces attacked by the enemy and not defended, for (white, black)"""
+    board = analysis.board_state.board
+    white_attacks, black_attacks = analysis.intermediate("attack_maps")
+    white_pieces = board.occupied_co[chess.WHITE]
+    black_pieces = board.occupied_co[chess.BLACK]
+    return (white_pieces & black_attacks & ~white_attacks,
+            black_pieces & white_attacks & ~black_attacks)
+
+
+def _compute_pawn_masks(analysis: 'PositionAnalysis') -> Tuple[int, int]:
+    """Pawn bitboards for (white, black)"""
+    board = analysis.board_state.board
+    return (board.pieces_mask(chess.PAWN, chess.WHITE),
+            board.pieces_mask(chess.PAWN, chess.BLACK))
+
+
+def _compute_pawn_attack_maps(analysis: 'PositionAnalysis') -> Tuple[int, int]:
+    """Squares attacked by pawns for (white, black)"""
+    white_pawns, black_pawns = analysis.intermediate("pawn_masks")
+    return (pawn_attacks_mask(white_pawns, chess.WHITE),
+            pawn_attacks_mask(black_pawns, chess.BLACK))
+
+
+def _slider_attacks(square: chess.Square, occupied: int) -> int:
+    """Queen-like attacks from square; callers restrict them to one line"""
+    return (chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied] |
+            chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] |
+            chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied])
+
+
+def pinned_pieces_mask(board: chess.Board, color: bool) -> int:
+    """
+    Bitboard version of BoardState.get_pinned_pieces: non-pawn pieces pinned
+    to their king (absolute) or to a more valuable piece or queen (relative).
+    """
+    king_square = board.king(color)
+    if king_square is None:
+        return 0
+
+    own = board.occupied_co[color]
+    enemy = board.occupied_co[not color]
+    occupied = board.occupied
+    candidates = own & ~board.pawns & ~board.kings
+    diagonal = (board.bishops | board.queens) & enemy
+    orthogonal = (board.rooks | board.queens) & enemy
+
+    # Absolute pins: exactly one piece between the king and an enemy slider on its line
+    pinned = 0
+    snipers = ((chess.BB_DIAG_ATTACKS[king_square][0] & diagonal) |
+               ((chess.BB_RANK_ATTACKS[king_square][0] | chess.BB_FILE_ATTACKS[king_square][0]) & orthogonal))
+    for sniper in chess.scan_forward(snipers):
+        blockers = chess.between(king_square, sniper) & occupied
+        if blockers and blockers & (blockers - 1) == 0:
+            pinned |= blockers & candidates
+
+    # Relative pins: an attacking slider sees a more valuable own piece behind the candidate
+    values = GameConstants.PIECE_VALUES
+    for square in chess.scan_forward(candidates & ~pinned):
+        square_mask = chess.BB_SQUARES[square]
+        piece_value = values.get(board.piece_type_at(square), 0)
+        sliders = board.attackers_mask(not color, square) & (diagonal | orthogonal)
+        for attacker in chess.scan_forward(sliders):
+            xray = _slider_attacks(attacker, occupied & ~square_mask) & chess.BB_RAYS[attacker][square] & occupied
+            for behind in chess.scan_forward(xray & ~square_mask):
+                if not chess.between(attacker, behind) & square_mask:
+                    continue  # On the other side of the attacker
+                if own & chess.BB_SQUARES[behind]:
+                    behind_type = board.piece_type_at(behind)
+                    if values.get(behind_type, 0) > piece_value or behind_type == chess.QUEEN:
+                        pinned |= square_mask
+            if pinned & square_mask:
+                break
+
+    return pinned
+
+
+def _compute_pin_masks(analysis: 'PositionAnalysis') -> Tuple[int, int]:
+    """Pinned pieces (absolute and relative) for (white, black)"""
+    board = analysis.board_state.board
+    return (pinned_pieces_mask(board, chess.WHITE), pinned_pieces_mask(board, chess.BLACK))
+
+
+def _compute_reach_maps(analysis: 'PositionAnalysis') -> Tuple[int, int]:
+    """Squares legally reachable by non-pawn pieces for (white, black)"""
+    board = analysis.board_state.board
+    original_turn = board.turn
+    maps = []
+    try:
+        for color in (chess.WHITE, chess.BLACK):
+            board.turn = color
+            reach = 0
+            non_pawns = board.occupied_co[color] & ~board.pawns
+            for move in board.generate_legal_moves(from_mask=non_pawns):
+                reach |= chess.BB_SQUARES[move.to_square]
+            maps.append(reach)
+    finally:
+        board.turn = original_turn
+    return (maps[0], maps[1])
+
+
+def _compute_exchange_masks(analysis: 'PositionAnalysis') -> Dict[chess.Square, int]:
+    """
+    For every piece attacked by the enemy: the piece, its attackers and the
+    friendly pieces that could recapture on its square (exchange evaluation)
+    """
+    board = analysis.board_state.board
+    white_attacks, black_attacks = analysis.intermediate("attack_maps")
+    targets = ((board.occupied_co[chess.WHITE] & black_attacks) |
+               (board.occupied_co[chess.BLACK] & white_attacks))
+    # A piece never blocks lines to its own square, so the recapturing pieces
+    # are exactly the pieces of its color that attack it
+    return {square: (board.attackers_mask(chess.WHITE, square) |
+                     board.attackers_mask(chess.BLACK, square) |
+                     chess.BB_SQUARES[square])
+            for square in chess.scan_forward(targets)}
+
+
+INTERMEDIATES: Dict[str, Intermediate] = {
+    intermediate.name: intermediate for intermediate in [
+        Intermediate("attack_maps", (), _compute_attack_maps),
+        Intermediate("hanging_masks", ("attack_maps",), _compute_hanging_masks),
+        Intermediate("pawn_masks", (), _compute_pawn_masks),
+        Intermediate("pawn_attack_maps", ("pawn_masks",), _compute_pawn_attack_maps),
+        Intermediate("pin_masks", (), _compute_pin_masks),
+        Intermediate("reach_maps", (), _compute_reach_maps),
+        Intermediate("exchange_masks", ("attack_maps",), _compute_exchange_masks),
+    ]
+}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _by_color(pair: Tuple, color: bool):
+    """Pick the white or black entry of a (white, black) pair"""
+    return pair[0] if color == chess.WHITE else pair[1]
+
+
+def _activity_squares(analysis: 'PositionAnalysis', color: bool) -> int:
+    return _by_color(analysis.intermediate("reach_maps"), color)
+
+
+def developed_pieces_mask(board: chess.Board, color: bool) -> int:
+    """
+    Bitboard version of BoardState.count_developed_pieces: minor pieces and
+    queens off the back rank, a king off its starting square, and rooks that
+    left the back rank or are connected on it.
+    """
+    back_rank = chess.BB_RANK_1 if color == chess.WHITE else chess.BB_RANK_8
+    king_start = chess.E1 if color == chess.WHITE else chess.E8
+    own = board.occupied_co[color]
+
+    developed = own & (board.knights | board.bishops | board.queens) & ~back_rank
+    king_square = board.king(color)
+    if king_square is not None and king_square != king_start:
+        developed |= chess.BB_SQUARES[king_square]
+
+    rooks = own & board.rooks
+    developed |= rooks & ~back_rank
+    if chess.popcount(rooks) == 2 and rooks & ~back_rank == 0:
+        first, second = chess.scan_forward(rooks)
+        if not chess.between(first, second) & board.occupied:
+            developed |= rooks
+    return developed
+
+
+def _developed_pieces(analysis: 'PositionAnalysis', color: bool) -> int:
+    return developed_pieces_mask(analysis.board_state.board, color)
+
+
+def _attacked_pieces(analysis: 'PositionAnalysis', color: bool) -> int:
+    board = analysis.board_state.board
+    enemy_attacks = _by_color(analysis.intermediate("attack_maps"), not color)
+    return board.occupied_co[color] & enemy_attacks
+
+
+def _hanging_pieces(analysis: 'PositionAnalysis', color: bool) -> int:
+    return _by_color(analysis.intermediate("hanging_masks"), color)
+
+
+def _pawn_pieces(analysis: 'PositionAnalysis', color: bool) -> int:
+    return _by_color(analysis.intermediate("pawn_masks"), color)
+
+
+def backward_pawns_mask(pawns: int, own_pawn_attacks: int, enemy_pawn_attacks: int, color: bool) -> int:
+    """Pawns that cannot be defended by a pawn and whose advance square is attacked by an enemy pawn"""
+    if color == chess.WHITE:
+        advance_attacked = chess.shift_down(enemy_pawn_attacks)
+    else:
+        advance_attacked = chess.shift_up(enemy_pawn_attacks)
+    return pawns & ~own_pawn_attacks & advance_attacked
+
+
+def isolated_pawns_mask(pawns: int) -> int:
+    """Pawns with no friendly pawn on an adjacent file"""
+    return pawns & ~_adjacent_files(_file_fill(pawns))
+
+
+def doubled_pawn_count(pawns: int) -> int:
+    """Number of extra pawns on files holding more than one pawn"""
+    occupied_files = sum(1 for file_mask in chess.BB_FILES if pawns & file_mask)
+    return chess.popcount(pawns) - occupied_files
+
+
+def doubled_pawns_mask(pawns: int) -> int:
+    """Every pawn on a file holding more than one pawn"""
+    doubled = 0
+    for file_mask in chess.BB_FILES:
+        if chess.popcount(pawns & file_mask) > 1:
+            doubled |= pawns & file_mask
+    return doubled
+
+
+def passed_pawns_mask(pawns: int, enemy_pawns: int, color: bool) -> int:
+    """Pawns with no enemy pawn ahead of them on the same or an adjacent file"""
+    if color == chess.WHITE:
+        front_span = _fill_south(chess.shift_down(enemy_pawns))
+    else:
+        front_span = _fill_north(chess.shift_up(enemy_pawns))
+    blocked = front_span | _adjacent_files(front_span)
+    return pawns & ~blocked
+
+
+def _backward_pawns(analysis: 'PositionAnalysis', color: bool) -> int:
+    pawns = _by_color(analysis.intermediate("pawn_masks"), color)
+    pawn_attacks = analysis.intermediate("pawn_attack_maps")
+    return backward_pawns_mask(pawns, _by_color(pawn_attacks, color),
+                               _by_color(pawn_attacks, not color), color)
+
+
+def _isolated_pawns(analysis: 'PositionAnalysis', color: bool) -> int:
+    return isolated_pawns_mask(_by_color(analysis.intermediate("pawn_masks"), color))
+
+
+def _doubled(analysis: 'PositionAnalysis', color: bool) -> int:
+    return doubled_pawn_count(_by_color(analysis.intermediate("pawn_masks"), color))
+
+
+def _doubled_pawns(analysis: 'PositionAnalysis', color: bool) -> int:
+    return doubled_pawns_mask(_by_color(analysis.intermediate("pawn_masks"), color))
+
+
+def _passed_pawns(analysis: 'PositionAnalysis', color: bool) -> int:
+    pawn_masks = analysis.intermediate("pawn_masks")
+    return passed_pawns_mask(_by_color(pawn_masks, color), _by_color(pawn_masks, not color), color)
+
+
+def _hanging_glows(analysis: 'PositionAnalysis', color: bool) -> Tuple[int, int]:
+    """(hanging, attacked-but-defended) masks for the pieces of one color"""
+    board = analysis.board_state.board
+    hanging = _by_color(analysis.intermediate("hanging_masks"), color)
+    enemy_attacks = _by_color(analysis.intermediate("attack_maps"), not color)
+    return (hanging, board.occupied_co[color] & enemy_attacks & ~hanging)
+
+
+def _pins(analysis: 'PositionAnalysis', color: bool) -> int:
+    return _by_color(analysis.intermediate("pin_masks"), color)
+
+
+# Registry order is the display order of the statistics table
+HELPERS: List[Helper] = [
+    Helper("activity", "Activity", "piece_statistics", ("reach_maps",), highlight=_activity_squares),
+    Helper("development", "Development", "piece_statistics", (), highlight=_developed_pieces),
+    Helper("attacked", "Attacked", "piece_statistics", ("attack_maps",), highlight=_attacked_pieces,
+           higher_is_better=False),
+    Helper("hanging", "Hanging", "piece_statistics", ("hanging_masks",), highlight=_hanging_pieces,
+           higher_is_better=False),
+    Helper("pawns", "Pawns", "pawn_statistics", ("pawn_masks",), highlight=_pawn_pieces),
+    Helper("backward", "Backward", "pawn_statistics", ("pawn_masks", "pawn_attack_maps"),
+           highlight=_backward_pawns, higher_is_better=False),
+    Helper("isolated", "Isolated", "pawn_statistics", ("pawn_masks",), highlight=_isolated_pawns,
+           higher_is_better=False),
+    Helper("doubled", "Doubled", "pawn_statistics", ("pawn_masks",), _doubled, highlight=_doubled_pawns,
+           higher_is_better=False),
+    Helper("passed", "Passed", "pawn_statistics", ("pawn_masks",), highlight=_passed_pawns),
+    Helper("hanging_glows", "Hanging Pieces", "hanging_pieces", ("attack_maps", "hanging_masks"),
+           _hanging_glows, kind="annotation"),
+    Helper("pins", "Pins", "pins", ("pin_masks",), _pins, kind="annotation"),
+]
+
+HELPERS_BY_KEY: Dict[str, Helper] = {helper.key: helper for helper in HELPERS}
+
+
+def helpers_for_options(enabled_options: Iterable[str]) -> List[str]:
+    """Get helper keys (in registry order) controlled by the enabled help options"""
+    enabled_options = set(enabled_options)
+    return [helper.key for helper in HELPERS if helper.option_key in enabled_options]
+
+
+def resolve_intermediates(helper_keys: Iterable[str]) -> List[str]:
+    """Get the transitive intermediates needed by the given helpers, dependencies first"""
+    ordered: List[str] = []
+
+    def visit(name: str) -> None:
+        if name in ordered:
+            return
+        for dependency in INTERMEDIATES[name].requires:
+            visit(dependency)
+        ordered.append(name)
+
+    for key in helper_keys:
+        for name in HELPERS_BY_KEY[key].requires:
+            visit(name)
+    return ordered
+
+
+class PositionAnalysis:
+    """
+    Lazily computed analysis of a single position.
+    Intermediates, helper results and statistic highlights are memoized, so each
+    is computed at most once.
+    With a cache (an AnalysisCache and the position's Zobrist hash), results
+    persisted by earlier runs are reused and new results are written back.
+    """
+
+    def __init__(self, board_state, cache=None, zobrist_hash: Optional[int] = None):
+        self.board_state = board_state
+        self.intermediates: Dict[str, object] = {}
+        self.results: Dict[str, Tuple] = {}
+        self.highlight_masks: Dict[str, Tuple[int, int]] = {}
+        self.cache = cache if zobrist_hash is not None else None
+        self.zobrist_hash = zobrist_hash
+        if self.cache is not None:
+            self.results.update(self.cache.get(zobrist_hash))
+
+    def intermediate(self, name: str):
+        """Get an intermediate, computing it (and its dependencies) on first use"""
+        if name not in self.intermediates:
+            spec = INTERMEDIATES[name]
+            for dependency in spec.requires:
+                self.intermediate(dependency)
+            self.intermediates[name] = spec.compute(self)
+        return self.intermediates[name]
+
+    def get(self, key: str) -> Tuple:
+        """Get a helper result as (white_value, black_value)"""
+        if key not in self.results:
+            helper = HELPERS_BY_KEY[key]
+            if helper.compute is None:
+                white_mask, black_mask = self.highlights(key)
+                self.store(key, (chess.popcount(white_mask), chess.popcount(black_mask)))
+            else:
+                for name in resolve_intermediates([key]):
+                    self.intermediate(name)
+                if helper.highlight is not None:
+                    self.highlights(key)
+                self.store(key, (helper.compute(self, chess.WHITE), helper.compute(self, chess.BLACK)))
+        return self.results[key]
+
+    def store(self, key: str, value: Tuple) -> None:
+        """Memoize a result of this position and persist it in the cache, if any"""
+        self.results[key] = value
+        if self.cache is not None:
+            self.cache.put(self.zobrist_hash, {key: value})
+
+    def highlights(self, key: str) -> Tuple[int, int]:
+        """Get the highlight masks of a statistic as (white_mask, black_mask)"""
+        if key not in self.highlight_masks:
+            helper = HELPERS_BY_KEY[key]
+            for name in resolve_intermediates([key]):
+                self.intermediate(name)
+            self.highlight_masks[key] = (helper.highlight(self, chess.WHITE), helper.highlight(self, chess.BLACK))
+        return self.highlight_masks[key]
+
+    def run(self, helper_keys: Iterable[str]) -> Dict[str, Tuple]:
+        """Compute only the given helpers and their dependencies"""
+        helper_keys = list(helper_keys)
+        missing = [key for key in helper_keys if key not in self.results]
+        for name in resolve_intermediates(missing):
+            self.intermediate(name)
+        return {key: self.get(key) for key in helper_keys}
+
+
+# ---------------------------------------------------------------------------
+# Move review
+# ---------------------------------------------------------------------------
+
+# Flags describing what a move did wrong, judged from the analyses before and after it
+FLAG_HANGS_PIECE = "hangs_piece"          # A piece of the mover is left attacked and undefended
+FLAG_MISSED_CAPTURE = "missed_capture"    # An undefended enemy piece could have been taken
+FLAG_WALKS_INTO_PIN = "walks_into_pin"    # A piece of the mover becomes pinned
+
+MOVE_FLAGS = [FLAG_HANGS_PIECE, FLAG_MISSED_CAPTURE, FLAG_WALKS_INTO_PIN]
+
+# Reviews are stored with the results of the position before the move, under this prefix and the move's UCI
+REVIEW_KEY_PREFIX = "review:"
+
+
+def _follow_move(mask: int, move: chess.Move) -> int:
+    """Carry a square mask across a move, so the moved piece keeps its bit"""
+    from_mask = chess.BB_SQUARES[move.from_square]
+    if mask & from_mask:
+        mask = mask & ~from_mask | chess.BB_SQUARES[move.to_square]
+    return mask
+
+
+def _capturable_mask(board: chess.Board, targets: int) -> int:
+    """Target squares the side to move can legally capture on"""
+    capturable = 0
+    last_rank = chess.BB_RANK_8 if board.turn == chess.WHITE else chess.BB_RANK_1
+    for target in chess.scan_forward(targets):
+        for attacker in chess.scan_forward(board.attackers_mask(board.turn, target)):
+            promotion = None
+            if board.pawns & chess.BB_SQUARES[attacker] and chess.BB_SQUARES[target] & last_rank:
+                promotion = chess.QUEEN
+            if board.is_legal(chess.Move(attacker, target, promotion)):
+                capturable |= chess.BB_SQUARES[target]
+                break
+    return capturable
+
+
+def move_review(before: 'PositionAnalysis', after: 'PositionAnalysis', move: chess.Move) -> Dict[str, int]:
+    """
+    Review a move by comparing the analysis of the position before it with the
+    analysis after it. Returns each flag the move earns (in MOVE_FLAGS order)
+    mapped to the squares it concerns: the newly hanging pieces of the mover,
+    the undefended enemy pieces it could have captured, or its newly pinned
+    pieces. Kings are never counted as hanging or pinned pieces.
+    The review is memoized (and persisted, with a cache) alongside the helper
+    results of the position before the move.
+    """
+    key = REVIEW_KEY_PREFIX + move.uci()
+    if key in before.results:
+        return dict(before.results[key])
+
+    board = before.board_state.board
+    mover = board.turn
+    kings_before = board.kings
+    kings_after = after.board_state.board.kings
+    review = {}
+
+    hanging_before = _follow_move(_by_color(before.get("hanging_glows"), mover)[0] & ~kings_before, move)
+    hanging_after = _by_color(after.get("hanging_glows"), mover)[0] & ~kings_after
+    if hanging_after & ~hanging_before:
+        review[FLAG_HANGS_PIECE] = hanging_after & ~hanging_before
+
+    enemy_hanging = _by_color(before.get("hanging_glows"), not mover)[0] & ~kings_before
+    if enemy_hanging and not enemy_hanging & chess.BB_SQUARES[move.to_square]:
+        capturable = _capturable_mask(board, enemy_hanging)
+        if capturable:
+            review[FLAG_MISSED_CAPTURE] = capturable
+
+    pinned_before = _follow_move(_by_color(before.get("pins"), mover), move)
+    pinned_after = _by_color(after.get("pins"), mover)
+    if pinned_after & ~pinned_before:
+        review[FLAG_WALKS_INTO_PIN] = pinned_after & ~pinned_before
+
+    before.store(key, tuple(review.items()))
+    return review
+
+
+def move_flags(before: 'PositionAnalysis', after: 'PositionAnalysis', move: chess.Move) -> List[str]:
+    """Flags of a move (see move_review)"""
+    return list(move_review(before, after, move))
@@ -0,0 +1,163 @@
+"""
+Analysis Cache Module
+
+This module persists per-position helper results (statistics and board
+annotations from analysis.py) and the reviews of moves played from the
+position (analysis.move_review) in a local SQLite file, so revisiting a
+position in a previously analysed game never recomputes anything.
+
+Rows are keyed by Zobrist hash and ANALYSIS_VERSION. Bumping the version when a
+helper changes makes old rows unreachable; they are then evicted like any other
+stale row. Writes are buffered and committed in batches, the database runs in
+WAL mode, and the least recently used positions are evicted once the live data
+grows past the configured size.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Dict, Tuple
+from analysis import ANALYSIS_VERSION
+from config import DatabaseConfig
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis (
+    hash INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    results TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (hash, version)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS analysis_last_used ON analysis (last_used);
+"""
+
+# Fraction of max_bytes to shrink to when evicting, so eviction does not run on every flush
+_EVICTION_TARGET = 0.8
+
+
+def _to_signed(zobrist_hash: int) -> int:
+    return zobrist_hash - (1 << 64) if zobrist_hash >= 1 << 63 else zobrist_hash
+
+
+def _to_tuples(value):
+    """Restore the nested tuples of helper results from their JSON lists"""
+    if isinstance(value, list):
+        return tuple(_to_tuples(item) for item in value)
+    return value
+
+
+class AnalysisCache:
+    """Persistent map from (Zobrist hash, analysis version) to helper results"""
+
+    def __init__(self, path: str = DatabaseConfig.ANALYSIS_CACHE_PATH,
+                 max_bytes: int = DatabaseConfig.ANALYSIS_CACHE_MAX_BYTES,
+                 batch_size: int = DatabaseConfig.ANALYSIS_CACHE_BATCH_SIZE,
+                 version: int = ANALYSIS_VERSION):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.version = version
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+        # Results merged since the last flush, and positions read since then
+        self.pending: Dict[int, Dict[str, Tuple]] = {}
+        self.touched: Dict[int, float] = {}
+
+    def get(self, zobrist_hash: int) -> Dict[str, Tuple]:
+        """Get all cached helper results of a position (empty if unknown)"""
+        key = _to_signed(zobrist_hash)
+        row = self.connection.execute(
+            "SELECT results FROM analysis WHERE hash = ? AND version = ?",
+            (key, self.version)).fetchone()
+
+        results = {}
+        if row is not None:
+            results = {name: _to_tuples(value) for name, value in json.loads(row[0]).items()}
+            self.touched[key] = time.time()
+        results.update(self.pending.get(key, {}))
+        return results
+
+    def put(self, zobrist_hash: int, results: Dict[str, Tuple]) -> None:
+        """Merge helper results of a position into the cache (written on the next flush)"""
+        if not results:
+            return
+        key = _to_signed(zobrist_hash)
+        self.pending.setdefault(key, {}).update(results)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered results in one transaction, then evict if over size"""
+        if not self.pending and not self.touched:
+            return
+        now = time.time()
+
+        with self.connection:
+            if self.pending:
+                # Merge with results stored by earlier flushes (other helpers of the same position)
+                rows = []
+                for key, results in self.pending.items():
+                    row = self.connection.execute(
+                        "SELECT results FROM analysis WHERE hash = ? AND version = ?",
+                        (key, self.version)).fetchone()
+                    merged = json.loads(row[0]) if row is not None else {}
+                    merged.update(results)
+                    rows.append((key, self.version, json.dumps(merged, separators=(",", ":")), now))
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO analysis (hash, version, results, last_used) VALUES (?, ?, ?, ?)", rows)
+
+            if self.touched:
+                self.connection.executemany(
+                    "UPDATE analysis SET last_used = ? WHERE hash = ? AND version = ?",
+                    [(last_used, key, self.version) for key, last_used in self.touched.items()
+                     if key not in self.pending])
+
+        self.pending = {}
+        self.touched = {}
+        self.evict()
+
+    def size_bytes(self) -> int:
+        """Bytes used by live pages (freed pages are reused, so they are not counted)"""
+        page_size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self.connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def evict(self) -> int:
+        """
+        Delete rows of other analysis versions, then the least recently used
+        positions until the cache is back under its size budget.
+        Returns the number of rows deleted.
+        """
+        size = self.size_bytes()
+        if size <= self.max_bytes:
+            return 0
+
+        with self.connection:
+            deleted = self.connection.execute(
+                "DELETE FROM analysis WHERE version != ?", (self.version,)).rowcount
+            size = self.size_bytes()
+            if size > self.max_bytes:
+                row_count = self.connection.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+                excess = 1.0 - (self.max_bytes * _EVICTION_TARGET) / size
+                to_delete = max(1, int(row_count * excess))
+                deleted += self.connection.execute(
+                    "DELETE FROM analysis WHERE (hash, version) IN "
+                    "(SELECT hash, version FROM analysis ORDER BY last_used LIMIT ?)",
+                    (to_delete,)).rowcount
+        return deleted
+
+    def close(self) -> None:
+        """Flush buffered results and close the database"""
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self) -> 'AnalysisCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,234 @@
+"""
+Batch Analysis Module
+
+This module computes position statistics for many positions at once with
+NumPy bitwise operations, for offline analysis of large game collections.
+
+Positions are given as an N x 12 array of uint64 bitboards, one column per
+(color, piece type) in PIECE_COLUMNS order. Every function returns the same
+values as the matching BoardState method, with a leading batch axis:
+- get_hanging_scores, get_attacked_scores, get_pawn_counts -> (N, 2) as (white, black)
+- get_pawn_statistics -> (N, 2, 4) as (backward, isolated, doubled, passed) per color
+"""
+
+from typing import Dict, Iterable, List
+import numpy as np
+import chess
+
+# Column order of the N x 12 bitboard array
+PIECE_COLUMNS = [(color, piece_type)
+                 for color in (chess.WHITE, chess.BLACK)
+                 for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP,
+                                    chess.ROOK, chess.QUEEN, chess.KING)]
+
+_U64 = np.uint64
+_ZERO = _U64(0)
+_NOT_FILE_A = _U64(~chess.BB_FILE_A & chess.BB_ALL)
+_NOT_FILE_H = _U64(~chess.BB_FILE_H & chess.BB_ALL)
+_NOT_FILE_AB = _U64(~(chess.BB_FILE_A | chess.BB_FILE_B) & chess.BB_ALL)
+_NOT_FILE_GH = _U64(~(chess.BB_FILE_G | chess.BB_FILE_H) & chess.BB_ALL)
+_RANK_1 = _U64(chess.BB_RANK_1)
+
+
+def board_to_bitboards(board: chess.Board) -> List[int]:
+    """Get the 12 piece bitboards of a board in PIECE_COLUMNS order"""
+    return [board.pieces_mask(piece_type, color) for color, piece_type in PIECE_COLUMNS]
+
+
+def boards_to_array(boards: Iterable[chess.Board]) -> np.ndarray:
+    """Pack boards into an N x 12 uint64 array"""
+    rows = [board_to_bitboards(board) for board in boards]
+    return np.array(rows, dtype=np.uint64).reshape(-1, len(PIECE_COLUMNS))
+
+
+# ---------------------------------------------------------------------------
+# Vectorised bitboard primitives
+# ---------------------------------------------------------------------------
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(bb: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(bb).astype(np.int64)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+    def _popcount(bb: np.ndarray) -> np.ndarray:
+        as_bytes = np.ascontiguousarray(bb, dtype=np.uint64).view(np.uint8)
+        return _BYTE_POPCOUNT[as_bytes].reshape(bb.shape + (8,)).sum(axis=-1)
+
+
+def _shl(bb: np.ndarray, n: int) -> np.ndarray:
+    return np.left_shift(bb, _U64(n))
+
+
+def _shr(bb: np.ndarray, n: int) -> np.ndarray:
+    return np.right_shift(bb, _U64(n))
+
+
+# Direction shifts (uint64 left shifts drop bits past h8 just like chess.BB_ALL masking)
+def _north(bb): return _shl(bb, 8)
+def _south(bb): return _shr(bb, 8)
+def _east(bb): return _shl(bb, 1) & _NOT_FILE_A
+def _west(bb): return _shr(bb, 1) & _NOT_FILE_H
+def _north_east(bb): return _shl(bb, 9) & _NOT_FILE_A
+def _north_west(bb): return _shl(bb, 7) & _NOT_FILE_H
+def _south_east(bb): return _shr(bb, 7) & _NOT_FILE_A
+def _south_west(bb): return _shr(bb, 9) & _NOT_FILE_H
+
+
+def _fill_north(bb: np.ndarray) -> np.ndarray:
+    bb = bb | _shl(bb, 8)
+    bb = bb | _shl(bb, 16)
+    return bb | _shl(bb, 32)
+
+
+def _fill_south(bb: np.ndarray) -> np.ndarray:
+    bb = bb | _shr(bb, 8)
+    bb = bb | _shr(bb, 16)
+    return bb | _shr(bb, 32)
+
+
+def _slider_attacks(sliders: np.ndarray, empty: np.ndarray, step) -> np.ndarray:
+    """Kogge-Stone occluded fill in one direction, shifted once more to get attacks"""
+    # step() already masks wrapped files, so masking the propagator by step(all) is implicit
+    gen = sliders
+    pro = empty
+    gen = gen | (pro & step(gen))
+    pro = pro & step(pro)
+    gen = gen | (pro & step(step(gen)))
+    pro = pro & step(step(pro))
+    gen = gen | (pro & step(step(step(step(gen)))))
+    return step(gen)
+
+
+def _knight_attacks(knights: np.ndarray) -> np.ndarray:
+    return ((_shl(knights, 17) & _NOT_FILE_A) | (_shl(knights, 15) & _NOT_FILE_H) |
+            (_shl(knights, 10) & _NOT_FILE_AB) | (_shl(knights, 6) & _NOT_FILE_GH) |
+            (_shr(knights, 17) & _NOT_FILE_H) | (_shr(knights, 15) & _NOT_FILE_A) |
+            (_shr(knights, 10) & _NOT_FILE_GH) | (_shr(knights, 6) & _NOT_FILE_AB))
+
+
+def _king_attacks(kings: np.ndarray) -> np.ndarray:
+    return (_north(kings) | _south(kings) | _east(kings) | _west(kings) |
+            _north_east(kings) | _north_west(kings) | _south_east(kings) | _south_west(kings))
+
+
+def _pawn_attacks(pawns: np.ndarray, color: bool) -> np.ndarray:
+    if color == chess.WHITE:
+        return _north_east(pawns) | _north_west(pawns)
+    return _south_east(pawns) | _south_west(pawns)
+
+
+def _split(bitboards: np.ndarray):
+    """Validate the input and return per-color lists of piece bitboards"""
+    bitboards = np.asarray(bitboards, dtype=np.uint64)
+    if bitboards.ndim != 2 or bitboards.shape[1] != len(PIECE_COLUMNS):
+        raise ValueError(f"Expected an N x {len(PIECE_COLUMNS)} array, got shape {bitboards.shape}")
+    white = [bitboards[:, i] for i in range(6)]
+    black = [bitboards[:, i] for i in range(6, 12)]
+    return white, black
+
+
+def _attack_map(pieces: List[np.ndarray], color: bool, empty: np.ndarray) -> np.ndarray:
+    """Union of squares attacked by one color"""
+    pawns, knights, bishops, rooks, queens, kings = pieces
+    diagonal = bishops | queens
+    orthogonal = rooks | queens
+
+    attacks = _pawn_attacks(pawns, color) | _knight_attacks(knights) | _king_attacks(kings)
+    for step in (_north_east, _north_west, _south_east, _south_west):
+        attacks = attacks | _slider_attacks(diagonal, empty, step)
+    for step in (_north, _south, _east, _west):
+        attacks = attacks | _slider_attacks(orthogonal, empty, step)
+    return attacks
+
+
+def _occupancy(pieces: List[np.ndarray]) -> np.ndarray:
+    occupied = np.zeros_like(pieces[0])
+    for bb in pieces:
+        occupied = occupied | bb
+    return occupied
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+def _attack_context(bitboards: np.ndarray):
+    white, black = _split(bitboards)
+    white_occupied = _occupancy(white)
+    black_occupied = _occupancy(black)
+    empty = ~(white_occupied | black_occupied)
+    white_attacks = _attack_map(white, chess.WHITE, empty)
+    black_attacks = _attack_map(black, chess.BLACK, empty)
+    return white_occupied, black_occupied, white_attacks, black_attacks
+
+
+def get_attacked_scores(bitboards: np.ndarray) -> np.ndarray:
+    """Attacked piece counts per position. Returns (N, 2) as (white, black)"""
+    white_occupied, black_occupied, white_attacks, black_attacks = _attack_context(bitboards)
+    return np.stack([_popcount(white_occupied & black_attacks),
+                     _popcount(black_occupied & white_attacks)], axis=1)
+
+
+def get_hanging_scores(bitboards: np.ndarray) -> np.ndarray:
+    """Hanging piece counts per position. Returns (N, 2) as (white, black)"""
+    white_occupied, black_occupied, white_attacks, black_attacks = _attack_context(bitboards)
+    return np.stack([_popcount(white_occupied & black_attacks & ~white_attacks),
+                     _popcount(black_occupied & white_attacks & ~black_attacks)], axis=1)
+
+
+def get_pawn_counts(bitboards: np.ndarray) -> np.ndarray:
+    """Pawn counts per position. Returns (N, 2) as (white, black)"""
+    white, black = _split(bitboards)
+    return np.stack([_popcount(white[0]), _popcount(black[0])], axis=1)
+
+
+def _pawn_statistics_for(pawns: np.ndarray, enemy_pawns: np.ndarray, color: bool) -> np.ndarray:
+    """(backward, isolated, doubled, passed) counts for one color, shape (N, 4)"""
+    own_attacks = _pawn_attacks(pawns, color)
+    enemy_attacks = _pawn_attacks(enemy_pawns, not color)
+
+    # Backward: not defended by a pawn, and the advance square is attacked by an enemy pawn
+    if color == chess.WHITE:
+        advance_attacked = _south(enemy_attacks)
+        front_span = _fill_south(_south(enemy_pawns))
+    else:
+        advance_attacked = _north(enemy_attacks)
+        front_span = _fill_north(_north(enemy_pawns))
+    backward = pawns & ~own_attacks & advance_attacked
+
+    # Isolated: no friendly pawn on an adjacent file
+    files = _fill_north(pawns) | _fill_south(pawns)
+    isolated = pawns & ~(_east(files) | _west(files))
+
+    # Doubled: pawns beyond the first on each file
+    occupied_files = _popcount(_fill_south(pawns) & _RANK_1)
+    doubled = _popcount(pawns) - occupied_files
+
+    # Passed: no enemy pawn ahead on the same or an adjacent file
+    blocked = front_span | _east(front_span) | _west(front_span)
+    passed = pawns & ~blocked
+
+    return np.stack([_popcount(backward), _popcount(isolated), doubled, _popcount(passed)], axis=1)
+
+
+def get_pawn_statistics(bitboards: np.ndarray) -> np.ndarray:
+    """Pawn structure statistics per position. Returns (N, 2, 4)"""
+    white, black = _split(bitboards)
+    return np.stack([_pawn_statistics_for(white[0], black[0], chess.WHITE),
+                     _pawn_statistics_for(black[0], white[0], chess.BLACK)], axis=1)
+
+
+def analyze_batch(bitboards: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute all batch statistics, sharing the attack maps between them"""
+    white, black = _split(bitboards)
+    white_occupied, black_occupied, white_attacks, black_attacks = _attack_context(bitboards)
+    return {
+        "attacked": np.stack([_popcount(white_occupied & black_attacks),
+                              _popcount(black_occupied & white_attacks)], axis=1),
+        "hanging": np.stack([_popcount(white_occupied & black_attacks & ~white_attacks),
+                             _popcount(black_occupied & white_attacks & ~black_attacks)], axis=1),
+        "pawns": np.stack([_popcount(white[0]), _popcount(black[0])], axis=1),
+        "pawn_statistics": np.stack([_pawn_statistics_for(white[0], black[0], chess.WHITE),
+                                     _pawn_statistics_for(black[0], white[0], chess.BLACK)], axis=1),
+    }
@@ -0,0 +1,180 @@
+"""
+PGN Parser Benchmark
+
+Compares the single-pass tokenizer used by PGNParser against the previous
+regex pipeline (re.sub per comment/variation, re.match per token and string
+concatenation of movetext) on a synthetic multi-MB PGN corpus with comments,
+NAGs and nested variations.
+
+Usage: python bench_pgn_parser.py [--size-mb 8] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List, Tuple
+import chess
+from pgn_manager import PGNParser
+
+
+def legacy_parse_pgn(pgn_text: str) -> List[Tuple[dict, List[str], str]]:
+    """The previous regex-based parser, kept here as the benchmark baseline"""
+    games = []
+    lines = pgn_text.strip().split('\n')
+
+    current_tags = None
+    in_moves = False
+    move_text = ""
+
+    for line in lines:
+        line = line.strip()
+
+        if not line:
+            if in_moves and move_text.strip():
+                moves, result = legacy_parse_moves(move_text)
+                if current_tags is not None:
+                    games.append((current_tags, moves, result))
+                current_tags = None
+                in_moves = False
+                move_text = ""
+            continue
+
+        if line.startswith('[') and line.endswith(']'):
+            if current_tags is None:
+                current_tags = {}
+                in_moves = False
+            tag_match = re.match(r'\[(\w+)\s+"(.*)"\]', line)
+            if tag_match:
+                key, value = tag_match.groups()
+                current_tags[key] = value
+        else:
+            if current_tags is None:
+                current_tags = {}
+            in_moves = True
+            move_text += " " + line
+
+    if current_tags is not None and (in_moves and move_text.strip()):
+        moves, result = legacy_parse_moves(move_text)
+        games.append((current_tags, moves, result))
+
+    return games
+
+
+def legacy_parse_moves(move_text: str) -> Tuple[List[str], str]:
+    """The previous regex-based movetext parser"""
+    text = re.sub(r'\{[^}]*\}', '', move_text)
+    text = re.sub(r'\([^)]*\)', '', text)
+
+    moves = []
+    result = "*"
+    for token in text.split():
+        token = token.strip()
+        if not token:
+            continue
+        if token in ["1-0", "0-1", "1/2-1/2", "*"]:
+            result = token
+            break
+        if re.match(r'\d+\.', token):
+            continue
+        if token == "...":
+            continue
+        move = re.sub(r'[?!+#]+$', '', token)
+        if move and not re.match(r'\d+\.', move):
+            moves.append(move)
+
+    return moves, result
+
+
+def _random_game_pgn(rng: random.Random, index: int) -> str:
+    """Build one random game with comments, NAGs and (nested) variations"""
+    board = chess.Board()
+    parts = []
+    for ply in range(rng.randint(40, 120)):
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        if board.turn == chess.WHITE:
+            parts.append(f"{board.fullmove_number}.")
+        parts.append(board.san(move))
+
+        roll = rng.random()
+        if roll < 0.08:
+            parts.append(rng.choice(["$1", "$2", "$6", "!?"]))
+        elif roll < 0.14:
+            parts.append("{ a short comment about the plan }")
+        elif roll < 0.17:
+            # Nested sideline built from the current position
+            alternative = rng.choice(moves)
+            variation = board.copy(stack=False)
+            inner = variation.san(alternative)
+            variation.push(alternative)
+            replies = list(variation.legal_moves)
+            if replies:
+                reply = rng.choice(replies)
+                inner += f" {variation.san(reply)} ( {variation.san(rng.choice(replies))} )"
+            parts.append(f"( {inner} )")
+        board.push(move)
+
+    result = rng.choice(["1-0", "0-1", "1/2-1/2", "*"])
+    parts.append(result)
+
+    # Wrap movetext at ~80 columns like most PGN writers
+    lines, current = [], ""
+    for part in parts:
+        if current and len(current) + len(part) + 1 > 80:
+            lines.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    lines.append(current)
+
+    headers = (f'[Event "Benchmark {index}"]\n[Site "?"]\n[Date "2024.01.01"]\n[Round "1"]\n'
+               f'[White "Player {index % 97}"]\n[Black "Player {index % 89}"]\n[Result "{result}"]\n')
+    return headers + "\n" + "\n".join(lines) + "\n"
+
+
+def build_corpus(size_mb: float, seed: int = 1) -> str:
+    """Build a synthetic PGN corpus of roughly the given size"""
+    rng = random.Random(seed)
+    unique_games = [_random_game_pgn(rng, i) for i in range(300)]
+    target = int(size_mb * 1024 * 1024)
+
+    chunks, total = [], 0
+    while total < target:
+        game = unique_games[len(chunks) % len(unique_games)]
+        chunks.append(game)
+        total += len(game) + 1
+    return "\n".join(chunks)
+
+
+def _best_time(function, argument, repeat: int) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PGN parsing")
+    parser.add_argument("--size-mb", type=float, default=8.0, help="corpus size in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per parser (best is reported)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size_mb)
+    size_mb = len(corpus) / (1024 * 1024)
+    print(f"Corpus: {size_mb:.1f} MB")
+
+    legacy_time, legacy_games = _best_time(legacy_parse_pgn, corpus, args.repeat)
+    new_time, new_games = _best_time(PGNParser.parse_pgn, corpus, args.repeat)
+
+    print(f"Regex pipeline:       {legacy_time:7.3f} s  {size_mb / legacy_time:6.1f} MB/s  {len(legacy_games)} games")
+    print(f"Single-pass tokenizer: {new_time:6.3f} s  {size_mb / new_time:6.1f} MB/s  {len(new_games)} games")
+    print(f"Speedup: {legacy_time / new_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
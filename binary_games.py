@@ -0,0 +1,338 @@
+"""
+Binary Game Format Module
+
+This module stores games in a compact binary container that replays much
+faster than PGN, since no SAN has to be parsed.
+
+Each move is one byte. The high nibble is the slot of the moving piece among
+the side to move's pieces (in square order). The low nibble is the slot of
+the destination among that piece's pseudo-legal targets (in square order,
+times four plus the piece for promotions). The rare slots above 14 (long queen
+moves) store 15 followed by one extra byte. Decoding a move needs one attack
+mask instead of generating and sorting every legal move.
+
+Container layout ("BLXG" + version byte, then one record per game):
+    varint tag count, then (name ref, value ref) per tag
+    result byte (index into RESULTS)
+    varint ply count, varint move byte count, move bytes
+
+A string ref is 0 followed by a varint length and UTF-8 bytes for a string seen
+for the first time, or the 1-based id of a string seen earlier. Repeated tag
+names, players and events are therefore stored once per file.
+"""
+
+import os
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+import chess
+from pgn_manager import iter_games
+from san_resolver import replay_san
+
+MAGIC = b"BLXG"
+VERSION = 1
+
+RESULTS = ["*", "1-0", "0-1", "1/2-1/2"]
+
+_ESCAPE = 15
+
+
+# ---------------------------------------------------------------------------
+# Move encoding
+# ---------------------------------------------------------------------------
+
+def _targets(piece_type: int, square: chess.Square, color: bool, occupied: int, own: int,
+             ep_square: Optional[chess.Square], castling_rights: int) -> int:
+    """
+    Pseudo-legal destination mask of a piece. Castling is included whenever the
+    right exists (the path is not checked), which is enough to index every move.
+    """
+    if piece_type == chess.PAWN:
+        captures = occupied & ~own
+        if ep_square is not None:
+            captures |= chess.BB_SQUARES[ep_square]
+        targets = chess.BB_PAWN_ATTACKS[color][square] & captures
+        step = 8 if color == chess.WHITE else -8
+        single = square + step
+        if 0 <= single < 64 and not occupied & chess.BB_SQUARES[single]:
+            targets |= chess.BB_SQUARES[single]
+            start_rank = 1 if color == chess.WHITE else 6
+            if square >> 3 == start_rank and not occupied & chess.BB_SQUARES[single + step]:
+                targets |= chess.BB_SQUARES[single + step]
+        return targets
+
+    if piece_type == chess.KNIGHT:
+        attacks = chess.BB_KNIGHT_ATTACKS[square]
+    elif piece_type == chess.KING:
+        attacks = chess.BB_KING_ATTACKS[square]
+        king_square = chess.E1 if color == chess.WHITE else chess.E8
+        if square == king_square:
+            if castling_rights & chess.BB_SQUARES[king_square + 3]:
+                attacks |= chess.BB_SQUARES[king_square + 2]
+            if castling_rights & chess.BB_SQUARES[king_square - 4]:
+                attacks |= chess.BB_SQUARES[king_square - 2]
+    else:
+        attacks = 0
+        if piece_type != chess.ROOK:
+            attacks = chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+        if piece_type != chess.BISHOP:
+            attacks |= (chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] |
+                        chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied])
+    return attacks & ~own
+
+
+def _nth_square(mask: int, n: int) -> chess.Square:
+    """Get the n-th set square (0-based, ascending) of a mask"""
+    for _ in range(n):
+        mask &= mask - 1  # Clear the lowest set bit
+    if not mask:
+        raise ValueError("slot out of range")
+    return (mask & -mask).bit_length() - 1
+
+
+def encode_move(board: chess.Board, move: chess.Move) -> bytes:
+    """Encode one move for the side to move on board"""
+    color = board.turn
+    from_mask = chess.BB_SQUARES[move.from_square]
+    own = board.occupied_co[color]
+    piece_type = board.piece_type_at(move.from_square)
+    if piece_type is None or not own & from_mask:
+        raise ValueError(f"no piece to move for {move.uci()} in {board.fen()}")
+
+    targets = _targets(piece_type, move.from_square, color, board.occupied, own,
+                       board.ep_square, board.castling_rights)
+    to_mask = chess.BB_SQUARES[move.to_square]
+    if not targets & to_mask:
+        raise ValueError(f"illegal move {move.uci()} in {board.fen()}")
+
+    piece_slot = chess.popcount(own & (from_mask - 1))
+    if piece_slot > 15:
+        raise ValueError(f"more than 16 pieces to encode in {board.fen()}")
+    target_slot = chess.popcount(targets & (to_mask - 1))
+    if move.promotion:
+        target_slot = target_slot * 4 + move.promotion - chess.KNIGHT
+
+    if target_slot < _ESCAPE:
+        return bytes([piece_slot << 4 | target_slot])
+    return bytes([piece_slot << 4 | _ESCAPE, target_slot - _ESCAPE])
+
+
+def encode_moves(moves: Iterable[chess.Move], board: Optional[chess.Board] = None) -> bytes:
+    """
+    Encode a move sequence, e.g. BoardState.move_history.
+    Starts from the standard position unless a starting board is given.
+    """
+    board = chess.Board() if board is None else board.copy(stack=False)
+    encoded = bytearray()
+    for move in moves:
+        encoded += encode_move(board, move)
+        board.push(move)
+    return bytes(encoded)
+
+
+def decode_moves(data: bytes, board: Optional[chess.Board] = None) -> List[chess.Move]:
+    """
+    Decode a move sequence produced by encode_moves.
+    Starts from the standard position unless a starting board is given.
+
+    Moves are replayed on plain bitboards and a square -> piece type list
+    rather than a chess.Board, since Board.push dominates the decoding cost.
+    """
+    if board is None:
+        board = chess.Board()
+    piece_types = [board.piece_type_at(square) or 0 for square in chess.SQUARES]
+    occupied_co = [board.occupied_co[chess.BLACK], board.occupied_co[chess.WHITE]]
+    color = board.turn
+    ep_square = board.ep_square
+    castling_rights = board.castling_rights
+
+    moves = []
+    index = 0
+    size = len(data)
+    while index < size:
+        byte = data[index]
+        index += 1
+        target_slot = byte & 0x0F
+        if target_slot == _ESCAPE:
+            if index >= size:
+                raise ValueError("truncated move data")
+            target_slot += data[index]
+            index += 1
+
+        own = occupied_co[color]
+        occupied = own | occupied_co[not color]
+        from_square = _nth_square(own, byte >> 4)
+        piece_type = piece_types[from_square]
+        targets = _targets(piece_type, from_square, color, occupied, own, ep_square, castling_rights)
+
+        promotion = None
+        if piece_type == chess.PAWN and from_square >> 3 == (6 if color == chess.WHITE else 1):
+            target_slot, promotion_offset = divmod(target_slot, 4)
+            promotion = chess.KNIGHT + promotion_offset
+        to_square = _nth_square(targets, target_slot)
+        moves.append(chess.Move(from_square, to_square, promotion))
+
+        # Apply the move
+        from_mask = chess.BB_SQUARES[from_square]
+        to_mask = chess.BB_SQUARES[to_square]
+        occupied_co[not color] &= ~to_mask
+        occupied_co[color] = own & ~from_mask | to_mask
+        piece_types[from_square] = 0
+        piece_types[to_square] = promotion or piece_type
+        castling_rights &= ~(from_mask | to_mask)
+
+        next_ep_square = None
+        if piece_type == chess.PAWN:
+            if to_square == ep_square:
+                captured = to_square - 8 if color == chess.WHITE else to_square + 8
+                occupied_co[not color] &= ~chess.BB_SQUARES[captured]
+                piece_types[captured] = 0
+            elif abs(to_square - from_square) == 16:
+                next_ep_square = (from_square + to_square) // 2
+        elif piece_type == chess.KING:
+            castling_rights &= ~(chess.BB_RANK_1 if color == chess.WHITE else chess.BB_RANK_8)
+            if abs(to_square - from_square) == 2:
+                rook_from, rook_to = (from_square + 3, from_square + 1) if to_square > from_square else (from_square - 4, from_square - 1)
+                occupied_co[color] = occupied_co[color] & ~chess.BB_SQUARES[rook_from] | chess.BB_SQUARES[rook_to]
+                piece_types[rook_from] = 0
+                piece_types[rook_to] = chess.ROOK
+
+        ep_square = next_ep_square
+        color = not color
+    return moves
+
+
+# ---------------------------------------------------------------------------
+# Container
+# ---------------------------------------------------------------------------
+
+def _write_varint(out: BinaryIO, value: int) -> None:
+    while value >= 0x80:
+        out.write(bytes([value & 0x7F | 0x80]))
+        value >>= 7
+    out.write(bytes([value]))
+
+
+def _read_varint(f: BinaryIO) -> Optional[int]:
+    """Read a varint, returning None at end of file"""
+    value = 0
+    shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("truncated varint")
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+class BinaryGame:
+    """A game read from a binary container; moves are decoded on demand"""
+
+    def __init__(self, tags: Dict[str, str], result: str, ply_count: int, move_data: bytes):
+        self.tags = tags
+        self.result = result
+        self.ply_count = ply_count
+        self.move_data = move_data
+
+    def moves(self) -> List[chess.Move]:
+        """Decode the moves of the game"""
+        return decode_moves(self.move_data)
+
+
+class BinaryGameWriter:
+    """Appends games to a binary container, interning repeated strings"""
+
+    def __init__(self, out: BinaryIO):
+        self.out = out
+        self.string_ids: Dict[str, int] = {}
+        out.write(MAGIC + bytes([VERSION]))
+
+    def _write_string(self, value: str) -> None:
+        string_id = self.string_ids.get(value)
+        if string_id is not None:
+            _write_varint(self.out, string_id)
+            return
+        self.string_ids[value] = len(self.string_ids) + 1
+        encoded = value.encode('utf-8')
+        _write_varint(self.out, 0)
+        _write_varint(self.out, len(encoded))
+        self.out.write(encoded)
+
+    def write_game(self, tags: Dict[str, str], result: str, move_data: bytes, ply_count: int) -> None:
+        """Write one game whose moves were encoded with encode_moves"""
+        _write_varint(self.out, len(tags))
+        for name, value in tags.items():
+            self._write_string(name)
+            self._write_string(value)
+        self.out.write(bytes([RESULTS.index(result) if result in RESULTS else 0]))
+        _write_varint(self.out, ply_count)
+        _write_varint(self.out, len(move_data))
+        self.out.write(move_data)
+
+
+def read_binary_games(f: BinaryIO) -> Iterator[BinaryGame]:
+    """Stream games from an open binary container"""
+    header = f.read(len(MAGIC) + 1)
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary game file")
+    if header[len(MAGIC)] != VERSION:
+        raise ValueError(f"unsupported binary game version {header[len(MAGIC)]}")
+
+    strings: List[str] = []
+
+    def read_string() -> str:
+        ref = _read_varint(f)
+        if ref:
+            return strings[ref - 1]
+        value = f.read(_read_varint(f)).decode('utf-8')
+        strings.append(value)
+        return value
+
+    while True:
+        tag_count = _read_varint(f)
+        if tag_count is None:
+            return
+        tags = {}
+        for _ in range(tag_count):
+            name = read_string()
+            tags[name] = read_string()
+        result = RESULTS[f.read(1)[0]]
+        ply_count = _read_varint(f)
+        move_data = f.read(_read_varint(f))
+        yield BinaryGame(tags, result, ply_count, move_data)
+
+
+def iter_binary_games(filename: str) -> Iterator[BinaryGame]:
+    """Stream games from a binary container file"""
+    with open(filename, 'rb') as f:
+        yield from read_binary_games(f)
+
+
+def convert_pgn_to_binary(pgn_path: str, out_path: str) -> int:
+    """
+    Convert a PGN file (plain or compressed) to the binary format.
+    Games with illegal or unencodable moves (such as null moves) are skipped.
+    Returns the number of games written.
+    """
+    # Write to a temporary file first, so a failure never leaves a torn container behind
+    temp_path = out_path + ".tmp"
+    written = 0
+    try:
+        with open(temp_path, 'wb') as out:
+            writer = BinaryGameWriter(out)
+            for game in iter_games(pgn_path):
+                try:
+                    moves = replay_san(game.moves)
+                    move_data = encode_moves(moves)
+                except ValueError:
+                    continue
+                writer.write_game(game.tags, game.result, move_data, len(moves))
+                written += 1
+        os.replace(temp_path, out_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return written
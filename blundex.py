@@ -0,0 +1,104 @@
+"""
+Blundex command line interface
+
+Headless entry points that never import pygame, for batch jobs and servers.
+The interactive GUI is still started with `python main.py`.
+
+Usage:
+    python -m blundex analyze games.pgn --out report.jsonl [--jobs N] [--chunk-size BYTES] [--cache PATH]
+    python -m blundex annotate games.pgn --out annotated.pgn [--jobs N] [--chunk-size BYTES] [--cache PATH]
+
+The analyze command replays every game and writes one JSON line per ply with
+the hanging pieces, pins and pawn statistics of both sides after the move and
+the move's flags (hangs_piece, missed_capture, walks_into_pin). Games that
+cannot be replayed produce a single line with an "error" field.
+
+The annotate command writes a copy of the PGN file with NAGs and comments on
+the flagged moves (see pgn_annotate).
+
+With --cache, analysis results and move reviews are read from and written to
+an AnalysisCache file (the GUI's is .blundex_cache.db), so positions analysed
+by earlier runs are not analysed again.
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from typing import List, Optional
+from pgn_ingest import ingest_pgn, analyze_game_plies
+from pgn_annotate import export_annotated_pgn
+from config import PGNConfig
+
+
+def analyze_command(args: argparse.Namespace) -> int:
+    """Write the per-ply report of a PGN file as JSON lines"""
+    out = sys.stdout if args.out == "-" else open(args.out, 'w', encoding='utf-8')
+    games = plies = errors = 0
+    try:
+        for game_number, record in enumerate(ingest_pgn(args.pgn, workers=args.jobs,
+                                                        chunk_size=args.chunk_size,
+                                                        analyze=analyze_game_plies,
+                                                        cache_path=args.cache)):
+            games += 1
+            if "error" in record:
+                errors += 1
+                out.write(json.dumps({"game": game_number, "error": record["error"]}) + "\n")
+                continue
+            for ply in record["plies"]:
+                out.write(json.dumps({"game": game_number, **ply}) + "\n")
+            plies += len(record["plies"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Analysed {games} games ({plies} plies, {errors} with errors)", file=sys.stderr)
+    return 0
+
+
+def annotate_command(args: argparse.Namespace) -> int:
+    """Write an annotated copy of a PGN file"""
+    games = export_annotated_pgn(args.pgn, args.out, workers=args.jobs, chunk_size=args.chunk_size,
+                                 cache_path=args.cache)
+    print(f"Annotated {games} games", file=sys.stderr)
+    return 0
+
+
+def _add_ingest_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--jobs", type=int, default=PGNConfig.INGEST_WORKERS,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=PGNConfig.INGEST_CHUNK_SIZE,
+                        help="bytes of PGN per worker task")
+    parser.add_argument("--cache", default=None, metavar="PATH",
+                        help="SQLite analysis cache to reuse and extend (default: none)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="blundex", description="Blundex headless tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser("analyze", help="write a per-ply blunder report for a PGN file")
+    analyze.add_argument("pgn", help="PGN file (plain or gzip/bzip2/xz compressed)")
+    analyze.add_argument("--out", default="-", help="JSON lines output file (default: stdout)")
+    _add_ingest_arguments(analyze)
+    analyze.set_defaults(handler=analyze_command)
+
+    annotate = commands.add_parser("annotate", help="write a PGN copy with NAGs and comments on flagged moves")
+    annotate.add_argument("pgn", help="PGN file (plain or gzip/bzip2/xz compressed)")
+    annotate.add_argument("--out", required=True, help="annotated PGN output file")
+    _add_ingest_arguments(annotate)
+    annotate.set_defaults(handler=annotate_command)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"blundex: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,7 @@ from typing import Optional, List, Tuple
 import copy
 import chess
 from config import GameConstants
+from san_resolver import replay_san
 
 
 class BoardState:
@@ -40,6 +41,9 @@ class BoardState:
         self.undo_stack: List[Tuple[chess.Board, List[chess.Move], Optional[chess.Move]]] = []
         self.redo_stack: List[Tuple[chess.Board, List[chess.Move], Optional[chess.Move]]] = []
 
+        # Optional autosave journal (move_journal.MoveJournal) recording every change to the game
+        self.journal = None
+
         self._update_game_status()
 
     @property
@@ -62,6 +66,8 @@ class BoardState:
         self.undo_stack = []
         self.redo_stack = []
 
+        if self.journal is not None:
+            self.journal.start_game()
 
     def is_king_in_check(self, color: bool) -> bool:
         """Check if the king of a specific color is in check"""
@@ -593,6 +599,8 @@ class BoardState:
         self.board.push(chess_move)
         self.last_move = chess_move
         self.move_history.append(chess_move)
+        if self.journal is not None:
+            self.journal.record_move(chess_move)
 
         # Update game status
         self._update_game_status()
@@ -624,6 +632,8 @@ class BoardState:
         self.board.push(chess_move)
         self.last_move = chess_move
         self.move_history.append(chess_move)
+        if self.journal is not None:
+            self.journal.record_move(chess_move)
 
         # Update game status
         self._update_game_status()
@@ -694,6 +704,8 @@ class BoardState:
         self.board = previous_board.copy()
         self.move_history = previous_history
         self.last_move = previous_last_move
+        if self.journal is not None:
+            self.journal.record_undo()
 
         self._update_game_status()
         return True
@@ -712,66 +724,65 @@ class BoardState:
         self.board = next_board.copy()
         self.move_history = next_history
         self.last_move = next_last_move
+        if self.journal is not None:
+            self.journal.record_redo()
 
         self._update_game_status()
         return True
 
-    def load_pgn_file(self, filename: str) -> bool:
-        """Load a game from a PGN file"""
-        try:
-            with open(filename, 'r') as f:
-                pgn_text = f.read()
+    def load_moves(self, moves: List[chess.Move]) -> None:
+        """Replace the game with the given moves played from the starting position"""
+        self.board = chess.Board()
+        for move in moves:
+            self.board.push(move)
+        self.move_history = list(moves)
+        self.last_move = self.move_history[-1] if self.move_history else None
 
-            # Parse the PGN using python-chess
-            import io
-            pgn = chess.pgn.read_game(io.StringIO(pgn_text))
+        # Clear undo/redo stacks after loading
+        self.undo_stack = []
+        self.redo_stack = []
 
-            if pgn is None:
-                return False
+        if self.journal is not None:
+            self.journal.start_game(self.move_history)
 
-            # Reset to starting position
-            self.board = chess.Board()
-            self.move_history = []
-            self.last_move = None
+        self._update_game_status()
 
-            # Replay all moves from the PGN
-            for move in pgn.mainline_moves():
-                self.board.push(move)
-                self.move_history.append(move)
-                self.last_move = move
+    def load_pgn_file(self, filename: str, game_number: int = 0) -> bool:
+        """
+        Load a game from a PGN file (plain or gzip/bzip2/xz compressed).
+        Games of plain files are located through the sidecar game index.
+        """
+        # Imported here to avoid a circular import (pgn_manager depends on BoardState)
+        from pgn_index import load_game
 
-            # Clear undo/redo stacks after loading
-            self.undo_stack = []
-            self.redo_stack = []
+        try:
+            pgn = load_game(filename, game_number)
+            if pgn is None:
+                return False
 
-            self._update_game_status()
+            # Resolve every move before touching the current game
+            self.load_moves(replay_san(pgn.moves))
             return True
 
         except Exception as e:
             print(f"Error loading PGN file: {e}")
             return False
 
-    def save_pgn_file(self, filename: str, white_player: str = "Player", black_player: str = "Opponent", event: str = "Casual Game") -> bool:
-        """Save current game to a PGN file"""
-        try:
-            # Create a new game
-            game = chess.pgn.Game()
-
-            # Set headers
-            game.headers["Event"] = event
-            game.headers["White"] = white_player
-            game.headers["Black"] = black_player
-            game.headers["Result"] = "*"
-
-            # Add moves
-            node = game
-            for move in self.move_history:
-                node = node.add_variation(move)
-
-            # Write to file
-            with open(filename, 'w') as f:
-                f.write(str(game))
+    def save_pgn_file(self, filename: str, white_player: str = "Player", black_player: str = "Opponent",
+                      event: str = "Casual Game", annotate: bool = True) -> bool:
+        """
+        Save current game to a PGN file. Unless annotate is False, moves flagged
+        by the analysis layer get NAGs and comments (see pgn_annotate).
+        """
+        # Imported here to avoid a circular import (pgn_manager depends on BoardState)
+        from pgn_manager import PGNManager
+        from pgn_annotate import annotate_moves
 
+        try:
+            game = PGNManager.create_game_from_board_state(self, white_player, black_player, event)
+            annotations = annotate_moves(self.move_history) if annotate else None
+            with open(filename, 'w', encoding='utf-8') as f:
+                game.write_pgn(f, annotations)
             return True
 
         except Exception as e:
@@ -30,6 +30,7 @@ class GameConfig:
     FONT_MEDIUM_PERCENTAGE = 0.06  # 6% of board size
     FONT_SMALL_PERCENTAGE = 0.045  # 4.5% of board size
     FONT_BUTTON_PERCENTAGE = 0.035  # 3.5% of window width (smaller button font)
+    TEXT_CACHE_SIZE = 256          # Rendered text surfaces kept (least recently used are evicted)
 
 class Colors:
     """Color constants for the game"""
@@ -84,6 +85,11 @@ class Colors:
     STALEMATE_TEXT = (255, 0, 0)            # Red for stalemate text
     STALEMATE_OUTLINE = (0, 0, 0)           # Black outline for stalemate
 
+    # Background PGN loading indicator
+    LOADING_BACKGROUND = (0, 0, 0, 170)     # Translucent strip across the bottom of the board
+    LOADING_BAR = (90, 170, 90)             # Progress bar fill
+    LOADING_TEXT = (255, 255, 255)          # Progress label
+
     # Piece placeholder colors
     PIECE_BORDER = (100, 100, 100)          # Grey border for piece placeholders
 
@@ -109,6 +115,42 @@ class AnimationConfig:
     # Move animation
     MOVE_INDICATOR_RADIUS_FACTOR = 0.25  # Radius as factor of square size
 
+    # Checkmate animation: the losing king turns on its head
+    CHECKMATE_ROTATION_DURATION = 0.5  # Seconds for the 180 degree rotation
+
+    # Frames are only redrawn on a timer while an animation is running
+    FRAME_INTERVAL_MS = 16  # ~60 FPS
+
+class PGNConfig:
+    """PGN file reading settings"""
+
+    READ_BUFFER_SIZE = 1024 * 1024  # 1 MB buffered reads when streaming PGN files
+
+    # Parallel ingestion (pgn_ingest.py)
+    INGEST_WORKERS = None                # Worker processes (None = one per CPU)
+    INGEST_CHUNK_SIZE = 4 * 1024 * 1024  # Target shard size in bytes, aligned to [Event boundaries
+
+    # Background loading in the GUI (pgn_loader.py)
+    LOAD_PREVIEW_PLIES = 16  # Publish the moves replayed so far every this many plies
+    LOAD_POLL_INTERVAL_MS = 50  # How often the GUI checks on a running load
+
+class DatabaseConfig:
+    """On-disk position database and analysis cache settings"""
+
+    POSITION_DB_BATCH_SIZE = 500  # Games per SQLite transaction when ingesting
+
+    # Persistent per-position analysis results (analysis_cache.py)
+    ANALYSIS_CACHE_PATH = ".blundex_cache.db"
+    ANALYSIS_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Least recently used positions are evicted past this
+    ANALYSIS_CACHE_BATCH_SIZE = 32               # Positions buffered per write transaction
+
+class JournalConfig:
+    """Autosave journal settings (move_journal.py)"""
+
+    JOURNAL_PATH = ".blundex_session.journal"
+    JOURNAL_SYNC_EVERY = 16       # fsync once this many records are pending
+    JOURNAL_SYNC_INTERVAL = 1.0   # or once this many seconds have passed since the last fsync
+
 class GameConstants:
     """Chess game constants"""
 
@@ -116,7 +158,8 @@ class GameConstants:
     UNDO_HISTORY_LIMIT = 50  # Maximum moves to keep for undo
 
     # File paths
-    PIECE_IMAGE_DIRECTORY = "pngs/2x/"
+    PIECE_IMAGE_DIRECTORY = "pngs"            # One subdirectory per source resolution
+    PIECE_CACHE_DIRECTORY = ".blundex_pieces" # Scaled piece images, one file per square size
 
     # Piece size factors
     PAWN_SIZE_FACTOR = 0.65     # Pawns are 65% of square size
@@ -6,21 +6,34 @@ It provides functionality to display the board, pieces, and game information.
 """
 
 from typing import Optional, Tuple, List
+from collections import OrderedDict
 import pygame
 import json
 import os
 import math
+import sqlite3
 import chess
+import chess.polyglot
 from chess_board import BoardState, square_from_coords, coords_from_square
-from config import GameConfig, Colors, AnimationConfig, GameConstants
+from analysis import PositionAnalysis, HELPERS, HELPERS_BY_KEY, helpers_for_options
+from analysis_cache import AnalysisCache
+from piece_assets import load_piece_images, piece_image_key, piece_image_size
+from config import GameConfig, Colors, AnimationConfig, GameConstants, DatabaseConfig
 
 class ChessDisplay:
     """Handles the visual display of the chess game"""
     
-    def __init__(self, window_width: int = 800, window_height: int = 600):
-        """Initialize the display with window dimensions"""
+    def __init__(self, window_width: int = 800, window_height: int = 600,
+                 analysis_cache_path: Optional[str] = DatabaseConfig.ANALYSIS_CACHE_PATH,
+                 piece_cache_directory: Optional[str] = GameConstants.PIECE_CACHE_DIRECTORY):
+        """
+        Initialize the display with window dimensions.
+        Pass analysis_cache_path=None or piece_cache_directory=None to keep analysis
+        results or scaled piece images in memory only.
+        """
         self.window_width = window_width
         self.window_height = window_height
+        self.piece_cache_directory = piece_cache_directory
         
         # Colors from config
         self.RGB_WHITE = Colors.RGB_WHITE
@@ -56,11 +69,11 @@ class ChessDisplay:
             self.font_medium_bold = pygame.font.Font(None, int(self.board_size * GameConfig.FONT_MEDIUM_PERCENTAGE))
             self.font_small = pygame.font.Font(None, int(self.board_size * GameConfig.FONT_SMALL_PERCENTAGE))
         
-        # Load piece images (placeholder - you'd load actual piece images here)
-        self.piece_images = self._load_piece_images()
-
-        # Create move indicator circle surface once
-        self.move_indicator = self._create_move_indicator()
+        # Piece images and indicator sprites, packed into one atlas
+        self.sprite_atlas = None
+        self.sprite_rects = {}
+        self.piece_images = {}
+        self._build_sprite_atlas()
 
         # Help panel dimensions and positioning
         self.help_panel_width = int(window_width * GameConfig.HELP_PANEL_WIDTH_PERCENTAGE)
@@ -74,13 +87,18 @@ class ChessDisplay:
         # Help options - load from settings file if available
         self.settings_file = ".blundex"
         self.help_options = [
-            {"name": "Flip Board", "key": "flip_board", "enabled": False}
+            {"name": "Flip Board", "key": "flip_board", "enabled": False},
+            {"name": "Hanging Pieces", "key": "hanging_pieces", "enabled": True},
+            {"name": "Pins", "key": "pins", "enabled": True},
+            {"name": "Piece Statistics", "key": "piece_statistics", "enabled": True},
+            {"name": "Pawn Statistics", "key": "pawn_statistics", "enabled": True}
         ]
         self._load_settings()
 
         # Checkmate animation variables
         self.checkmate_animation_start_time = None
         self.checkmate_king_position = None
+        self.checkmate_animation_finished = False  # The final (upside down) frame has been drawn
 
         # Cache activity scores to avoid constant recalculation
         self.cached_activity_white = 0
@@ -91,71 +109,131 @@ class ChessDisplay:
         self.hovered_statistic = None  # (stat_type, player_or_opponent) e.g., ("activity", "player")
         self.statistic_cell_rects = {}  # Track clickable areas for each statistic
 
-        # Cached gradient surfaces for piece glows
-        self.hanging_glow_surface = None
-        self.hanging_glow_size = None
-        self.attacked_glow_surface = None
-        self.attacked_glow_size = None
+        # Rendered statistics table, keyed by (position hash, flip state, enabled statistics)
+        self.statistics_table = None
+        self.statistics_table_key = None
+        self.statistics_table_rows = []  # Rows drawn into the table
+
+        # Dirty-rectangle rendering: what each square and panel row showed when last drawn,
+        # so a frame only redraws (and pushes to the screen) the parts that changed
+        self.square_keys = {}          # (row, col) -> render key of the square
+        self.panel_layout_key = None   # Checkbox states and statistic rows of the panel
+        self.drawn_flipped = None      # Board orientation of the last frame
+        self.full_redraw_pending = True
+        self.dirty_rects = []          # Screen rects changed by the current frame
+        self.overlay_rects = []        # Areas covered by overlays drawn after update_display
+        self.stale_rects = []          # Overlay areas of the previous frame, repaired this frame
+
+        # Pre-rendered window background (plain squares, border, coordinates) per orientation
+        self.board_layers = {}
+
+        # Board overlay layers: name -> (input key, surface or None), see get_overlay_layers()
+        self.overlay_layers = {}
+
+        # Rendered text: (font, text, color, antialias) -> surface, least recently used first
+        self.text_cache = OrderedDict()
+
+        # Analysis of the most recently drawn position (helpers are computed lazily)
+        self.position_analysis = None
+        self.position_analysis_key = None
+
+        # Persistent analysis results, so revisited positions are never recomputed
+        self.analysis_cache = None
+        if analysis_cache_path is not None:
+            try:
+                self.analysis_cache = AnalysisCache(analysis_cache_path)
+            except sqlite3.Error:
+                # If the cache file is unusable, analyse without persisting results
+                self.analysis_cache = None
+
+    def get_position_analysis(self, board_state) -> PositionAnalysis:
+        """Get the (memoized) helper analysis for the given position"""
+        key = chess.polyglot.zobrist_hash(board_state.board)
+        if self.position_analysis is None or self.position_analysis_key != key:
+            self.position_analysis = PositionAnalysis(board_state, self.analysis_cache, key)
+            self.position_analysis_key = key
+        else:
+            # Same position, possibly a different BoardState object (e.g. a preview copy)
+            self.position_analysis.board_state = board_state
+        return self.position_analysis
+
+    def close_analysis_cache(self) -> None:
+        """Write any buffered analysis results and close the cache"""
+        if self.analysis_cache is not None:
+            try:
+                self.analysis_cache.close()
+            except sqlite3.Error:
+                pass
+            self.analysis_cache = None
+
+    def get_enabled_helpers(self) -> List[str]:
+        """Get keys of analysis helpers whose help option is enabled"""
+        enabled_options = [option["key"] for option in self.help_options if option["enabled"]]
+        return helpers_for_options(enabled_options)
 
     def invalidate_activity_cache(self):
         """Invalidate activity cache when board state changes"""
         self.activity_cache_valid = False
     
     def _load_piece_images(self) -> dict:
-        """Load and scale piece images from PNG files"""
-        images = {}
-
-        # Map piece types to their string representations for filenames
-        piece_symbols = {
-            chess.PAWN: 'P',
-            chess.KNIGHT: 'N',
-            chess.BISHOP: 'B',
-            chess.ROOK: 'R',
-            chess.QUEEN: 'Q',
-            chess.KING: 'K'
-        }
+        """Load piece images scaled for the square size (see piece_assets.py)"""
+        images = load_piece_images(self.square_size, cache_directory=self.piece_cache_directory)
 
         for color in [chess.WHITE, chess.BLACK]:
-            for piece_type in [chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING]:
-                # Calculate piece size based on type (pawns smaller than other pieces)
-                if piece_type == chess.PAWN:
-                    piece_size = int(self.square_size * 0.65)
-                else:
-                    piece_size = int(self.square_size * 0.75)
-
-                # Create filename based on naming convention: {color}{piece}.png
-                color_prefix = "w" if color == chess.WHITE else "b"
-                piece_symbol = piece_symbols[piece_type]
-                filename = f"pngs/2x/{color_prefix}{piece_symbol}.png"
-
-                try:
-                    # Load the original image
-                    original_image = pygame.image.load(filename)
-
-                    # Scale once using smooth scaling and cache it
-                    scaled_image = pygame.transform.smoothscale(original_image, (piece_size, piece_size))
-
-                    # Store with the key format: "w1" for white pawn, "b6" for black king, etc.
-                    color_str = "w" if color == chess.WHITE else "b"
-                    key = f"{color_str}{piece_type}"
-                    images[key] = scaled_image
-
-                except pygame.error as e:
-                    print(f"Warning: Could not load {filename}: {e}")
-                    # Create a fallback colored rectangle if image loading fails
+            for piece_type in chess.PIECE_TYPES:
+                key = piece_image_key(color, piece_type)
+                if key not in images:
+                    print(f"Warning: No image for {chess.piece_name(piece_type)} ({key})")
+                    # Create a fallback colored rectangle if no image could be loaded
+                    piece_size = piece_image_size(self.square_size, piece_type)
                     surface = pygame.Surface((piece_size, piece_size))
                     if color == chess.WHITE:
                         surface.fill(self.RGB_WHITE)
                     else:
                         surface.fill(self.RGB_BLACK)
                     pygame.draw.rect(surface, Colors.PIECE_BORDER, surface.get_rect(), 2)
-
-                    color_str = "w" if color == chess.WHITE else "b"
-                    key = f"{color_str}{piece_type}"
                     images[key] = surface
 
         return images
 
+    def _build_sprite_atlas(self) -> None:
+        """
+        Pack the piece images and the glow, move dot and pin sprites into one atlas surface
+        (a square_size cell each), so the board is drawn with batched blits() of atlas sub-rects.
+        piece_images become subsurfaces of the atlas.
+        """
+        pieces = self._load_piece_images()
+        sprites = dict(pieces)
+        sprites["hanging_glow"] = self._create_hanging_glow_surface(self.square_size)
+        sprites["attacked_glow"] = self._create_attacked_glow_surface(self.square_size)
+        sprites["move_dot"] = self._create_move_indicator()
+        sprites["pin"] = self._create_pin_surface()
+
+        columns = 4
+        rows = -(-len(sprites) // columns)
+        atlas = pygame.Surface((columns * self.square_size, rows * self.square_size), pygame.SRCALPHA)
+        self.sprite_rects = {}
+        for index, (name, sprite) in enumerate(sprites.items()):
+            cell = ((index % columns) * self.square_size, (index // columns) * self.square_size)
+            # The atlas starts transparent, so sprites are copied as they are
+            atlas.blit(sprite, cell, special_flags=pygame.BLEND_RGBA_MAX)
+            self.sprite_rects[name] = pygame.Rect(cell, sprite.get_size())
+
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()  # Match the screen's pixel format for fast blits
+        self.sprite_atlas = atlas
+        self.piece_images = {key: atlas.subsurface(self.sprite_rects[key]) for key in pieces}
+
+    def _sprite_blit(self, name: str, x: int, y: int, special_flags: int = 0) -> tuple:
+        """Get the blits() entry drawing an atlas sprite at x, y"""
+        return (self.sprite_atlas, (x, y), self.sprite_rects[name], special_flags)
+
+    def _piece_blit(self, piece: chess.Piece, x: int, y: int) -> tuple:
+        """Get the blits() entry drawing a piece centered in the square at x, y"""
+        rect = self.sprite_rects[piece_image_key(piece.color, piece.piece_type)]
+        return (self.sprite_atlas, (x + (self.square_size - rect.width) // 2,
+                                    y + (self.square_size - rect.height) // 2), rect)
+
     def _create_move_indicator(self) -> pygame.Surface:
         """Create a translucent circle surface for move indicators"""
         # Create a surface with per-pixel alpha
@@ -172,11 +250,32 @@ class ChessDisplay:
 
         return circle_surface
 
-    def draw_help_panel(self, screen, board_state=None, is_board_flipped=False) -> None:
-        """Draw the help panel with checkboxes on the right side of the board and statistics below"""
-        # Draw panel background (optional - subtle background)
+    def draw_help_panel(self, screen, board_state=None, is_board_flipped=False, redraw_all: bool = True) -> List[pygame.Rect]:
+        """
+        Draw the help panel with checkboxes on the right side of the board and statistics below.
+        Unless redraw_all, only the statistics cells whose values changed are drawn.
+        Returns the screen rects that were drawn.
+        """
         panel_rect = pygame.Rect(self.help_panel_x, self.help_panel_y,
                                self.help_panel_width, self.board_size)
+        table_rects = self._update_statistics_table(board_state, is_board_flipped) if board_state else []
+        table_rows = self.statistics_table_rows if board_state else []
+
+        # Toggling a checkbox changes the table's rows, so the whole panel is redrawn
+        layout_key = (tuple(option["enabled"] for option in self.help_options),
+                      tuple(row[0] for row in table_rows))
+        if layout_key != self.panel_layout_key:
+            redraw_all = True
+            self.panel_layout_key = layout_key
+
+        table_x, table_y = self._statistics_table_position()
+        if not redraw_all:
+            drawn_rects = [rect.move(table_x, table_y) for rect in table_rects]
+            screen.blits([(self.statistics_table, rect, area) for rect, area in zip(drawn_rects, table_rects)],
+                         doreturn=False)
+            return drawn_rects
+
+        # Draw panel background (optional - subtle background)
         pygame.draw.rect(screen, Colors.HELP_PANEL_BACKGROUND, panel_rect)
         pygame.draw.rect(screen, Colors.RGB_BLACK, panel_rect, 1)
 
@@ -188,147 +287,153 @@ class ChessDisplay:
 
         # Draw statistics below checkboxes if board_state is provided
         if board_state:
-            self._draw_panel_statistics(screen, board_state, is_board_flipped, current_y + 20)
+            screen.blit(self.statistics_table, (table_x, table_y))
 
-    def _draw_panel_statistics(self, screen, board_state, is_board_flipped: bool, start_y: int) -> None:
-        """Draw activity and pawn statistics in spreadsheet-style table format"""
-        # Clear previous cell rectangles
-        self.statistic_cell_rects = {}
+        return [panel_rect]
+
+    def _statistics_table_position(self) -> Tuple[int, int]:
+        """Get the screen position of the statistics table (below the checkboxes)"""
+        return (self.help_panel_x + 10,
+                self.help_panel_y + 20 + self.checkbox_spacing * len(self.help_options) + 20)
+
+    def _panel_statistics_rows(self, board_state, is_board_flipped: bool) -> List[Tuple[str, int, int, bool]]:
+        """Get the statistics table rows: (name, player_value, opponent_value, higher_is_better)"""
+        # Compute only the enabled statistics (and the intermediates they share)
+        analysis = self.get_position_analysis(board_state)
+        enabled_helpers = set(self.get_enabled_helpers())
+
+        # Table data: (name, player_value, opponent_value, higher_is_better)
+        table_data = []
+        for helper in HELPERS:
+            if helper.kind != "statistic" or helper.key not in enabled_helpers:
+                continue
+            white_value, black_value = analysis.get(helper.key)
+            if is_board_flipped:
+                player_value, opponent_value = black_value, white_value
+            else:
+                player_value, opponent_value = white_value, black_value
+            table_data.append((helper.label, player_value, opponent_value, helper.higher_is_better))
+        return table_data
+
+    def _update_statistics_table(self, board_state, is_board_flipped: bool) -> List[pygame.Rect]:
+        """
+        Keep the rendered statistics table (self.statistics_table) up to date.
+        It is keyed by (position hash, flip state, enabled statistics): the statistics are
+        only looked up, and the table only re-rendered, when that key changes, and then only
+        the rows and cells whose values changed are redrawn.
+        Returns the redrawn rects, relative to the table.
+        """
+        key = (chess.polyglot.zobrist_hash(board_state.board), is_board_flipped, tuple(self.get_enabled_helpers()))
+        if key == self.statistics_table_key:
+            return []
+        self.statistics_table_key = key
+        table_data = self._panel_statistics_rows(board_state, is_board_flipped)
 
         # Table dimensions
         table_width = self.help_panel_width - 20  # 10px margin on each side
-        table_x = self.help_panel_x + 10
         row_height = self.font_small.get_height() + 6  # Extra padding for readability
+        # The borders reach one pixel past the cells
+        table_size = (table_width + 1, row_height * len(table_data) + 1)
 
         # Column widths (proportional to table width)
         col1_width = int(table_width * 0.5)   # Statistic name (left)
         col2_width = int(table_width * 0.25)  # Player score (center)
         col3_width = int(table_width * 0.25)  # Opponent score (center)
 
-        # Gather all statistics data
-        white_activity, black_activity = board_state.get_activity_scores()
-        white_pawns, black_pawns = board_state.get_pawn_counts()
-        (white_stats, black_stats) = board_state.get_pawn_statistics()
+        previous_rows = self.statistics_table_rows
+        if self.statistics_table is None or self.statistics_table.get_size() != table_size:
+            # New table layout: render every row
+            self.statistics_table = pygame.Surface(table_size)
+            previous_rows = []
+        self.statistics_table_rows = table_data
+        table = self.statistics_table
 
-        if is_board_flipped:
-            player_activity, opponent_activity = black_activity, white_activity
-            player_pawns, opponent_pawns = black_pawns, white_pawns
-            player_stats, opponent_stats = black_stats, white_stats
-        else:
-            player_activity, opponent_activity = white_activity, black_activity
-            player_pawns, opponent_pawns = white_pawns, black_pawns
-            player_stats, opponent_stats = white_stats, black_stats
-
-        player_backward, player_isolated, player_doubled, player_passed = player_stats
-        opponent_backward, opponent_isolated, opponent_doubled, opponent_passed = opponent_stats
-
-        # Get development statistics
-        white_development, black_development = board_state.get_development_scores()
-        if is_board_flipped:
-            player_development, opponent_development = black_development, white_development
-        else:
-            player_development, opponent_development = white_development, black_development
-
-        # Get attacked piece statistics
-        white_attacked, black_attacked = board_state.get_attacked_scores()
-        if is_board_flipped:
-            player_attacked, opponent_attacked = black_attacked, white_attacked
-        else:
-            player_attacked, opponent_attacked = white_attacked, black_attacked
-
-        # Get hanging piece statistics
-        white_hanging, black_hanging = board_state.get_hanging_scores()
-        if is_board_flipped:
-            player_hanging, opponent_hanging = black_hanging, white_hanging
-        else:
-            player_hanging, opponent_hanging = white_hanging, black_hanging
-
-        # Table data: (name, player_value, opponent_value, higher_is_better)
-        table_data = [
-            ("Activity", player_activity, opponent_activity, True),
-            ("Development", player_development, opponent_development, True),
-            ("Attacked", player_attacked, opponent_attacked, False),  # Lower is better
-            ("Hanging", player_hanging, opponent_hanging, False),  # Lower is better
-            ("Pawns", player_pawns, opponent_pawns, True),
-            ("Backward", player_backward, opponent_backward, False),  # Lower is better
-            ("Isolated", player_isolated, opponent_isolated, False),  # Lower is better
-            ("Doubled", player_doubled, opponent_doubled, False),     # Lower is better
-            ("Passed", player_passed, opponent_passed, True)         # Higher is better
-        ]
+        # Store cell rectangles for hover detection
+        self.statistic_cell_rects = {}
+        table_x, table_y = self._statistics_table_position()
+        for row_index, (row_name, _, _, _) in enumerate(table_data):
+            row_y = table_y + row_index * row_height
+            # Use lowercase for consistent key names
+            stat_key = row_name.lower()
+            self.statistic_cell_rects[f"{stat_key}_player"] = pygame.Rect(
+                table_x + col1_width, row_y, col2_width, row_height)
+            self.statistic_cell_rects[f"{stat_key}_opponent"] = pygame.Rect(
+                table_x + col1_width + col2_width, row_y, col3_width, row_height)
 
-        current_y = start_y
+        drawn_rects = []
+        current_y = 0
 
         # Draw each row
-        for row_name, player_val, opponent_val, higher_is_better in table_data:
-            # Determine row background color based on favorability
-            if player_val == opponent_val:
-                row_bg_color = Colors.TABLE_NEUTRAL_BG
-            elif higher_is_better:
-                # For Activity and Pawns: higher is better
-                if player_val > opponent_val:
-                    row_bg_color = Colors.TABLE_FAVORABLE_BG
-                else:
-                    row_bg_color = Colors.TABLE_UNFAVORABLE_BG
+        for row_index, row in enumerate(table_data):
+            row_name, player_val, opponent_val, _ = row
+            row_bg_color = self._statistics_row_color(row)
+
+            # Cells to render: (value, x, width); the whole row when it is new or changed color
+            previous = previous_rows[row_index] if row_index < len(previous_rows) else None
+            cells = [(player_val, col1_width, col2_width), (opponent_val, col1_width + col2_width, col3_width)]
+            if previous is not None and previous[0] == row_name and \
+                    self._statistics_row_color(previous) == row_bg_color:
+                cells = [cell for cell, old_value in zip(cells, previous[1:3]) if cell[0] != old_value]
+                for value, cell_x, cell_width in cells:
+                    # Clear the cell inside its borders
+                    cell_rect = pygame.Rect(cell_x + 1, current_y + 1, cell_width - 1, row_height - 1)
+                    pygame.draw.rect(table, row_bg_color, cell_rect)
+                    drawn_rects.append(cell_rect)
             else:
-                # For Backward, Isolated, Doubled: lower is better
-                if player_val < opponent_val:
-                    row_bg_color = Colors.TABLE_FAVORABLE_BG
-                else:
-                    row_bg_color = Colors.TABLE_UNFAVORABLE_BG
-
-            # Draw row background
-            row_rect = pygame.Rect(table_x, current_y, table_width, row_height)
-            pygame.draw.rect(screen, row_bg_color, row_rect)
-
-            # Draw cell borders (faint gray)
-            # Top border
-            pygame.draw.line(screen, Colors.TABLE_BORDER,
-                           (table_x, current_y), (table_x + table_width, current_y))
-            # Left border
-            pygame.draw.line(screen, Colors.TABLE_BORDER,
-                           (table_x, current_y), (table_x, current_y + row_height))
-            # Vertical separators
-            pygame.draw.line(screen, Colors.TABLE_BORDER,
-                           (table_x + col1_width, current_y), (table_x + col1_width, current_y + row_height))
-            pygame.draw.line(screen, Colors.TABLE_BORDER,
-                           (table_x + col1_width + col2_width, current_y),
-                           (table_x + col1_width + col2_width, current_y + row_height))
-            # Right border
-            pygame.draw.line(screen, Colors.TABLE_BORDER,
-                           (table_x + table_width, current_y), (table_x + table_width, current_y + row_height))
-
-            # Column 1: Statistic name (left-aligned)
-            name_surface = self.font_small.render(row_name, True, Colors.RGB_BLACK)
-            name_x = table_x + 5  # 5px padding from left
-            name_y = current_y + (row_height - name_surface.get_height()) // 2
-            screen.blit(name_surface, (name_x, name_y))
-
-            # Column 2: Player value (center-aligned)
-            player_surface = self.font_small.render(str(player_val), True, Colors.RGB_BLACK)
-            player_x = table_x + col1_width + (col2_width - player_surface.get_width()) // 2
-            player_y = current_y + (row_height - player_surface.get_height()) // 2
-            screen.blit(player_surface, (player_x, player_y))
-
-            # Column 3: Opponent value (center-aligned)
-            opponent_surface = self.font_small.render(str(opponent_val), True, Colors.RGB_BLACK)
-            opponent_x = table_x + col1_width + col2_width + (col3_width - opponent_surface.get_width()) // 2
-            opponent_y = current_y + (row_height - opponent_surface.get_height()) // 2
-            screen.blit(opponent_surface, (opponent_x, opponent_y))
-
-            # Store cell rectangles for hover detection
-            player_cell_rect = pygame.Rect(table_x + col1_width, current_y, col2_width, row_height)
-            opponent_cell_rect = pygame.Rect(table_x + col1_width + col2_width, current_y, col3_width, row_height)
-
-            # Use lowercase for consistent key names
-            stat_key = row_name.lower()
-            self.statistic_cell_rects[f"{stat_key}_player"] = player_cell_rect
-            self.statistic_cell_rects[f"{stat_key}_opponent"] = opponent_cell_rect
+                # Draw row background
+                row_rect = pygame.Rect(0, current_y, table_width, row_height)
+                pygame.draw.rect(table, row_bg_color, row_rect)
+
+                # Draw cell borders (faint gray)
+                # Top border
+                pygame.draw.line(table, Colors.TABLE_BORDER,
+                               (0, current_y), (table_width, current_y))
+                # Left border
+                pygame.draw.line(table, Colors.TABLE_BORDER,
+                               (0, current_y), (0, current_y + row_height))
+                # Vertical separators
+                pygame.draw.line(table, Colors.TABLE_BORDER,
+                               (col1_width, current_y), (col1_width, current_y + row_height))
+                pygame.draw.line(table, Colors.TABLE_BORDER,
+                               (col1_width + col2_width, current_y),
+                               (col1_width + col2_width, current_y + row_height))
+                # Right border
+                pygame.draw.line(table, Colors.TABLE_BORDER,
+                               (table_width, current_y), (table_width, current_y + row_height))
+
+                # Column 1: Statistic name (left-aligned)
+                name_surface = self.render_text(self.font_small, row_name, Colors.RGB_BLACK)
+                name_x = 5  # 5px padding from left
+                name_y = current_y + (row_height - name_surface.get_height()) // 2
+                table.blit(name_surface, (name_x, name_y))
+                drawn_rects.append(pygame.Rect(0, current_y, table_width + 1, row_height + 1))
+
+            # Columns 2 and 3: Player and opponent values (center-aligned)
+            for value, cell_x, cell_width in cells:
+                value_surface = self.render_text(self.font_small, str(value), Colors.RGB_BLACK)
+                value_x = cell_x + (cell_width - value_surface.get_width()) // 2
+                value_y = current_y + (row_height - value_surface.get_height()) // 2
+                table.blit(value_surface, (value_x, value_y))
 
             current_y += row_height
 
         # Draw bottom border of the table
-        pygame.draw.line(screen, Colors.TABLE_BORDER,
-                       (table_x, current_y), (table_x + table_width, current_y))
+        pygame.draw.line(table, Colors.TABLE_BORDER,
+                       (0, current_y), (table_width, current_y))
+
+        return drawn_rects
+
+    def _statistics_row_color(self, row: Tuple[str, int, int, bool]) -> Tuple[int, int, int]:
+        """Get the background color of a statistics row based on favorability"""
+        _, player_val, opponent_val, higher_is_better = row
+        if player_val == opponent_val:
+            return Colors.TABLE_NEUTRAL_BG
+        elif higher_is_better:
+            # For Activity and Pawns: higher is better
+            return Colors.TABLE_FAVORABLE_BG if player_val > opponent_val else Colors.TABLE_UNFAVORABLE_BG
+        else:
+            # For Backward, Isolated, Doubled: lower is better
+            return Colors.TABLE_FAVORABLE_BG if player_val < opponent_val else Colors.TABLE_UNFAVORABLE_BG
 
     def update_statistics_hover(self, mouse_pos: tuple) -> None:
         """Update which statistic cell is being hovered"""
@@ -346,267 +451,17 @@ class ChessDisplay:
 
     def get_highlighted_pieces_for_statistic(self, board_state, stat_type: str, player_side: str, is_board_flipped: bool):
         """Get pieces or squares to highlight based on the hovered statistic"""
-        if not stat_type or not player_side:
+        if not stat_type or not player_side or stat_type not in HELPERS_BY_KEY:
             return []
 
         # Determine which color we're showing (player vs opponent)
-        if is_board_flipped:
-            player_color = chess.BLACK
-            opponent_color = chess.WHITE
-        else:
-            player_color = chess.WHITE
-            opponent_color = chess.BLACK
-
-        target_color = player_color if player_side == "player" else opponent_color
-
-        if stat_type == "activity":
-            return self._get_activity_squares(board_state, target_color)
-        elif stat_type == "development":
-            return self._get_developed_pieces(board_state, target_color)
-        elif stat_type == "attacked":
-            return self._get_attacked_pieces(board_state, target_color)
-        elif stat_type == "hanging":
-            return self._get_hanging_pieces(board_state, target_color)
-        elif stat_type == "pawns":
-            return self._get_pawn_pieces(board_state, target_color)
-        elif stat_type == "backward":
-            return self._get_backward_pawn_pieces(board_state, target_color)
-        elif stat_type == "isolated":
-            return self._get_isolated_pawn_pieces(board_state, target_color)
-        elif stat_type == "doubled":
-            return self._get_doubled_pawn_pieces(board_state, target_color)
-        elif stat_type == "passed":
-            return self._get_passed_pawn_pieces(board_state, target_color)
-
-        return []
-
-    def _get_activity_squares(self, board_state, color: bool):
-        """Get all squares that pieces of this color can legally reach"""
-        reachable_squares = set()
-
-        # Save current turn
-        original_turn = board_state.board.turn
-
-        # Set turn to the color we're checking
-        board_state.board.turn = color
-
-        # Only count squares that pieces can legally reach
-        for move in board_state.board.legal_moves:
-            piece = board_state.board.piece_at(move.from_square)
-            if piece and piece.color == color and piece.piece_type != chess.PAWN:
-                reachable_squares.add(coords_from_square(move.to_square))
-
-        # Restore original turn
-        board_state.board.turn = original_turn
-
-        return list(reachable_squares)
-
-    def _get_developed_pieces(self, board_state, color: bool):
-        """Get all developed pieces of this color"""
-        developed_pieces = []
-
-        if color == chess.WHITE:
-            starting_rank = 0  # rank 1
-            king_start = chess.E1
-        else:
-            starting_rank = 7  # rank 8
-            king_start = chess.E8
-
-        # Knights, bishops, queen: off back rank = developed
-        for piece_type in [chess.KNIGHT, chess.BISHOP, chess.QUEEN]:
-            for square in chess.SQUARES:
-                piece = board_state.board.piece_at(square)
-                if piece and piece.color == color and piece.piece_type == piece_type:
-                    if chess.square_rank(square) != starting_rank:
-                        developed_pieces.append(coords_from_square(square))
-
-        # King: developed if castled (not on starting square)
-        king_square = board_state.board.king(color)
-        if king_square != king_start:
-            developed_pieces.append(coords_from_square(king_square))
-
-        # Rooks: developed if moved OR if rooks are connected
-        rook_squares = []
-        for square in chess.SQUARES:
-            piece = board_state.board.piece_at(square)
-            if piece and piece.color == color and piece.piece_type == chess.ROOK:
-                rook_squares.append(square)
-
-        # Check if rooks are connected
-        rooks_connected = False
-        if len(rook_squares) == 2:
-            r1, r2 = rook_squares
-            if chess.square_rank(r1) == starting_rank and chess.square_rank(r2) == starting_rank:
-                file1, file2 = chess.square_file(r1), chess.square_file(r2)
-                min_file, max_file = min(file1, file2), max(file1, file2)
-                pieces_between = False
-                for file in range(min_file + 1, max_file):
-                    check_square = chess.square(file, starting_rank)
-                    if board_state.board.piece_at(check_square):
-                        pieces_between = True
-                        break
-                if not pieces_between:
-                    rooks_connected = True
-
-        # Add developed rooks to list
-        for rook_square in rook_squares:
-            if chess.square_rank(rook_square) != starting_rank:
-                developed_pieces.append(coords_from_square(rook_square))
-            elif rooks_connected:
-                developed_pieces.append(coords_from_square(rook_square))
-
-        return developed_pieces
-
-    def _get_attacked_pieces(self, board_state, color: bool):
-        """Get all pieces of this color that are attacked by the enemy"""
-        attacked_pieces = []
-        enemy_color = not color
-
-        for square in chess.SQUARES:
-            piece = board_state.board.piece_at(square)
-            if piece and piece.color == color:
-                if board_state.board.is_attacked_by(enemy_color, square):
-                    attacked_pieces.append(coords_from_square(square))
-
-        return attacked_pieces
-
-    def _get_hanging_pieces(self, board_state, color: bool):
-        """Get all hanging pieces of this color"""
-        hanging_squares = board_state.get_hanging_pieces(color)
-        return [coords_from_square(sq) for sq in hanging_squares]
-
-    def _get_pawn_pieces(self, board_state, color: bool):
-        """Get all pawn pieces of this color"""
-        pawn_pieces = []
-        for square in chess.SQUARES:
-            piece = board_state.board.piece_at(square)
-            if piece and piece.color == color and piece.piece_type == chess.PAWN:
-                pawn_pieces.append(coords_from_square(square))
-        return pawn_pieces
-
-    def _get_backward_pawn_pieces(self, board_state, color: bool):
-        """Get backward pawn pieces of this color"""
-        backward_pawns = []
-        enemy_color = not color
-        pawn_direction = 1 if color == chess.WHITE else -1
-
-        for square in chess.SQUARES:
-            piece = board_state.board.piece_at(square)
-            if piece and piece.color == color and piece.piece_type == chess.PAWN:
-                # Check if this is a backward pawn (simplified version of the main logic)
-                rank = chess.square_rank(square)
-                file = chess.square_file(square)
-
-                # Check if pawn can be defended
-                can_be_defended = False
-                defend_rank = rank - pawn_direction
-                if 0 <= defend_rank < 8:
-                    for defend_file in [file - 1, file + 1]:
-                        if 0 <= defend_file < 8:
-                            defend_square = chess.square(defend_file, defend_rank)
-                            defender = board_state.board.piece_at(defend_square)
-                            if defender and defender.color == color and defender.piece_type == chess.PAWN:
-                                can_be_defended = True
-                                break
-
-                # Check if pawn can safely advance
-                can_safely_advance = True
-                advance_rank = rank + pawn_direction
-                if 0 <= advance_rank < 8:
-                    for enemy_file in [file - 1, file + 1]:
-                        if 0 <= enemy_file < 8:
-                            enemy_attack_rank = advance_rank + pawn_direction
-                            if 0 <= enemy_attack_rank < 8:
-                                enemy_square = chess.square(enemy_file, enemy_attack_rank)
-                                enemy_piece = board_state.board.piece_at(enemy_square)
-                                if enemy_piece and enemy_piece.color == enemy_color and enemy_piece.piece_type == chess.PAWN:
-                                    can_safely_advance = False
-                                    break
-
-                if not can_be_defended and not can_safely_advance:
-                    backward_pawns.append(coords_from_square(square))
-
-        return backward_pawns
-
-    def _get_isolated_pawn_pieces(self, board_state, color: bool):
-        """Get isolated pawn pieces of this color"""
-        isolated_pawns = []
-        for square in chess.SQUARES:
-            piece = board_state.board.piece_at(square)
-            if piece and piece.color == color and piece.piece_type == chess.PAWN:
-                # Check if there are friendly pawns on adjacent files
-                file = chess.square_file(square)
-                has_adjacent_pawn = False
-                for adjacent_file in [file - 1, file + 1]:
-                    if 0 <= adjacent_file < 8:
-                        for check_rank in range(8):
-                            check_square = chess.square(adjacent_file, check_rank)
-                            adjacent_piece = board_state.board.piece_at(check_square)
-                            if adjacent_piece and adjacent_piece.color == color and adjacent_piece.piece_type == chess.PAWN:
-                                has_adjacent_pawn = True
-                                break
-                        if has_adjacent_pawn:
-                            break
-
-                if not has_adjacent_pawn:
-                    isolated_pawns.append(coords_from_square(square))
-
-        return isolated_pawns
-
-    def _get_doubled_pawn_pieces(self, board_state, color: bool):
-        """Get doubled pawn pieces of this color"""
-        doubled_pawns = []
-        # Count pawns per file and identify doubled ones
-        for file in range(8):
-            pawns_on_file = []
-            for rank in range(8):
-                square = chess.square(file, rank)
-                piece = board_state.board.piece_at(square)
-                if piece and piece.color == color and piece.piece_type == chess.PAWN:
-                    pawns_on_file.append(coords_from_square(square))
-
-            # If more than one pawn on this file, highlight ALL of them
-            if len(pawns_on_file) > 1:
-                doubled_pawns.extend(pawns_on_file)  # Add all pawns on doubled files
-
-        return doubled_pawns
-
-    def _get_passed_pawn_pieces(self, board_state, color: bool):
-        """Get passed pawn pieces of this color"""
-        passed_pawns = []
-        enemy_color = not color
-        promotion_direction = 1 if color == chess.WHITE else -1
-
-        # Check each pawn
-        for square in chess.SQUARES:
-            piece = board_state.board.piece_at(square)
-            if piece and piece.color == color and piece.piece_type == chess.PAWN:
-                rank = chess.square_rank(square)
-                file = chess.square_file(square)
-
-                # Check if this pawn is passed
-                is_passed = True
-
-                # Check the path to promotion on this file and adjacent files
-                for check_file in [file - 1, file, file + 1]:
-                    if 0 <= check_file <= 7:  # Valid file
-                        # Check all squares from current position to promotion rank
-                        check_rank = rank + promotion_direction
-                        while 0 <= check_rank <= 7:
-                            check_square = chess.square(check_file, check_rank)
-                            enemy_piece = board_state.board.piece_at(check_square)
-                            if enemy_piece and enemy_piece.color == enemy_color and enemy_piece.piece_type == chess.PAWN:
-                                is_passed = False
-                                break
-                            check_rank += promotion_direction
-
-                        if not is_passed:
-                            break
-
-                if is_passed:
-                    passed_pawns.append(coords_from_square(square))
-
-        return passed_pawns
+        player_color = chess.BLACK if is_board_flipped else chess.WHITE
+        target_color = player_color if player_side == "player" else not player_color
+
+        # Highlights are computed with the statistic and memoized per position
+        white_mask, black_mask = self.get_position_analysis(board_state).highlights(stat_type)
+        mask = white_mask if target_color == chess.WHITE else black_mask
+        return [coords_from_square(square) for square in chess.scan_forward(mask)]
 
     def _draw_checkbox(self, screen, x: int, y: int, option: dict) -> None:
         """Draw a single stylish checkbox with label"""
@@ -647,7 +502,7 @@ class ChessDisplay:
             pygame.draw.line(screen, check_color, (check_x2, check_y2), (check_x3, check_y3), check_thickness)
 
         # Draw label with better styling
-        label_text = self.font_small.render(option["name"], True, Colors.LABEL_TEXT_COLOR)
+        label_text = self.render_text(self.font_small, option["name"], Colors.LABEL_TEXT_COLOR)
         label_x = x + self.checkbox_size + 12
         label_y = y + (self.checkbox_size - label_text.get_height()) // 2
         screen.blit(label_text, (label_x, label_y))
@@ -659,7 +514,7 @@ class ChessDisplay:
         current_y = self.help_panel_y + 20  # Starting y position for checkboxes (matches drawing)
         for option in self.help_options:
             # Create expanded clickable area that includes both checkbox and text label
-            label_text = self.font_small.render(option["name"], True, Colors.LABEL_TEXT_COLOR)
+            label_text = self.render_text(self.font_small, option["name"], Colors.LABEL_TEXT_COLOR)
             label_width = label_text.get_width()
 
             # Clickable area extends from checkbox to end of text label
@@ -687,10 +542,6 @@ class ChessDisplay:
                 return option["enabled"]
         return False
 
-    def draw_move_indicator(self, screen, x: int, y: int) -> None:
-        """Draw the pre-created move indicator at specified position"""
-        screen.blit(self.move_indicator, (x, y))
-
     def draw_hanging_piece_indicator(self, screen, x: int, y: int, is_player_piece: bool) -> None:
         """Draw a hanging piece indicator with consistent border thickness"""
 
@@ -711,10 +562,15 @@ class ChessDisplay:
         """Check if any animations are currently running"""
         return self.checkmate_animation_start_time is not None
 
+    def is_animation_running(self) -> bool:
+        """Check if an active animation still needs frames (a finished one holds its final frame)"""
+        return self.checkmate_animation_start_time is not None and not self.checkmate_animation_finished
+
     def start_checkmate_animation(self, board_state: BoardState) -> None:
         """Start the checkmate animation for the losing king"""
         import time
         self.checkmate_animation_start_time = time.time()
+        self.checkmate_animation_finished = False
 
         # Find the checkmated king position
         losing_color = board_state.board.turn
@@ -722,12 +578,12 @@ class ChessDisplay:
 
     def draw_rotating_king(self, screen, piece: chess.Piece, x: int, y: int, elapsed_time: float) -> None:
         """Draw a king rotating on its head"""
-        # Animation duration is 0.5 seconds for 360 degree rotation
-        animation_duration = 0.5
+        animation_duration = AnimationConfig.CHECKMATE_ROTATION_DURATION
 
         if elapsed_time > animation_duration:
             # Animation finished, draw normally but upside down
             angle = 180
+            self.checkmate_animation_finished = True
         else:
             # Calculate rotation angle (0 to 180 degrees over 0.5 seconds)
             progress = elapsed_time / animation_duration
@@ -759,153 +615,217 @@ class ChessDisplay:
     def draw_board(self, screen, board_state: BoardState, selected_square_coords: Optional[Tuple[int, int]] = None,
                    highlighted_moves: List[Tuple[int, int]] = None, is_board_flipped: bool = False,
                    preview_board_state: Optional[BoardState] = None, dragging_piece=None, drag_origin=None,
-                   mouse_pos: Optional[Tuple[int, int]] = None) -> None:
-        """Draw the chess board with pieces"""
+                   mouse_pos: Optional[Tuple[int, int]] = None, redraw_all: bool = True,
+                   stale_rects: Optional[List[pygame.Rect]] = None) -> List[pygame.Rect]:
+        """
+        Draw the chess board with pieces.
+        Square colors, glows, pins, move dots and dimming come from cached overlay
+        layers (see get_overlay_layers), composited around the pieces.
+        With redraw_all, the whole board is composited on top of the board layer, which
+        must already be on the screen. Otherwise only squares whose content changed since
+        the previous call (or that lie under a stale_rects area) are drawn.
+        Returns the screen rects that were drawn.
+        """
         if highlighted_moves is None:
             highlighted_moves = []
+        evaluation_board = preview_board_state if preview_board_state else board_state
 
-        # Check if any highlighting is active (exchange or statistics)
-        has_exchange_highlights = False
-        has_statistics_highlights = False
-
-        if mouse_pos and not self.hovered_statistic:
-            evaluation_board = preview_board_state if preview_board_state else board_state
-            highlight_positions = self.get_exchange_highlights(mouse_pos, evaluation_board, is_board_flipped)
-            if highlight_positions:
-                has_exchange_highlights = True
-
+        # Squares to emphasize (everything else is grayed out): exchange evaluation when
+        # hovering a square, or the pieces behind a hovered statistic
+        highlight_set = None
         if self.hovered_statistic:
-            has_statistics_highlights = True
-
-        any_highlights_active = has_exchange_highlights or has_statistics_highlights
-
-        # Draw the board squares
+            stat_type, player_side = self.hovered_statistic
+            highlight_set = set(self.get_highlighted_pieces_for_statistic(evaluation_board, stat_type, player_side, is_board_flipped))
+        elif mouse_pos:
+            highlight_set = set(self.get_exchange_highlights(mouse_pos, evaluation_board, is_board_flipped))
+        any_highlights_active = bool(self.hovered_statistic) or bool(highlight_set)
+
+        # Board annotations from the enabled helpers, computed once for the whole board
+        analysis = self.get_position_analysis(evaluation_board)
+        enabled_helpers = self.get_enabled_helpers()
+        hanging_mask = attacked_mask = pinned_mask = 0
+        if "hanging_glows" in enabled_helpers:
+            (white_hanging, white_attacked), (black_hanging, black_attacked) = analysis.get("hanging_glows")
+            hanging_mask = white_hanging | black_hanging
+            attacked_mask = (white_attacked | black_attacked) & ~hanging_mask  # Attacked but not hanging (yellow glow)
+        if "pins" in enabled_helpers:
+            white_pinned, black_pinned = analysis.get("pins")
+            pinned_mask = white_pinned | black_pinned
+
+        # Square colors: last move highlighting (lichess-style green overlay) only if NO
+        # highlights are active, and the selected square on top
+        square_colors = {}
+        if board_state.last_move and not any_highlights_active:
+            for square in (board_state.last_move.from_square, board_state.last_move.to_square):
+                row, col = coords_from_square(square)
+                is_light = (row + col) % 2 == 0
+                square_colors[(row, col)] = Colors.LIGHT_SQUARE_LAST_MOVE if is_light else Colors.DARK_SQUARE_LAST_MOVE
+        if selected_square_coords:
+            square_colors[selected_square_coords] = self.SELECTED
+
+        # Skip the piece being dragged
+        pieces = board_state.board.piece_map()
+        if dragging_piece and drag_origin:
+            pieces.pop(square_from_coords(*drag_origin), None)
+        pinned_mask &= chess.SquareSet(pieces.keys()).mask
+
+        layers = self.get_overlay_layers(is_board_flipped, square_colors, hanging_mask, attacked_mask,
+                                         pinned_mask, highlighted_moves, highlight_set)
+        below_pieces = [layer for layer in layers[:2] if layer is not None]
+        above_pieces = [layer for layer in layers[2:] if layer is not None]
+        board_origin = (self.board_margin_x, self.board_margin_y)
+
+        if redraw_all:
+            self.square_keys = {}
+            for layer in below_pieces:
+                screen.blit(layer, board_origin)
+
+        board_layer = self.get_board_layer(is_board_flipped)
+        drawn_rects = []
+        layer_areas = []
+        piece_blits = []
+        animated_kings = []
         for row in range(8):
             for col in range(8):
-                # Apply flipping transformation
-                display_row = (7 - row) if is_board_flipped else row
-                display_col = (7 - col) if is_board_flipped else col
-                x = self.board_margin_x + display_col * self.square_size
-                y = self.board_margin_y + display_row * self.square_size
-
-                # Determine square color (use original coordinates for coloring)
-                is_light = (row + col) % 2 == 0
-                color = self.LIGHT_SQUARE if is_light else self.DARK_SQUARE
-
-                # Apply last move highlighting (lichess-style green overlay) only if NO highlights are active
-                if board_state.last_move and not any_highlights_active:
-                    from_coords = coords_from_square(board_state.last_move.from_square)
-                    to_coords = coords_from_square(board_state.last_move.to_square)
-                    if (row, col) == from_coords or (row, col) == to_coords:
-                        color = Colors.LIGHT_SQUARE_LAST_MOVE if is_light else Colors.DARK_SQUARE_LAST_MOVE
-
-                # Highlight selected square only
-                if selected_square_coords and selected_square_coords == (row, col):
-                    color = self.SELECTED
-
-                # Draw the square
-                pygame.draw.rect(screen, color,
-                               (x, y, self.square_size, self.square_size))
-
-                # Draw piece glow BEFORE piece (so piece appears on top)
+                x, y = self.get_square_display_position(row, col, is_board_flipped)
                 square = square_from_coords(row, col)
-                evaluation_board = preview_board_state if preview_board_state else board_state
+                square_mask = chess.BB_SQUARES[square]
+                piece = pieces.get(square)
+
+                # Everything that affects the square's pixels; unchanged keys need no redraw
+                key = (square_colors.get((row, col)),
+                       "hanging" if hanging_mask & square_mask else "attacked" if attacked_mask & square_mask else None,
+                       piece, bool(pinned_mask & square_mask), (row, col) in highlighted_moves,
+                       None if not highlight_set else (row, col) in highlight_set)
+                square_rect = pygame.Rect(x, y, self.square_size, self.square_size)
+                if (not redraw_all and self.square_keys.get((row, col)) == key and
+                        not (stale_rects and square_rect.collidelist(stale_rects) >= 0)):
+                    continue
+                self.square_keys[(row, col)] = key
+                drawn_rects.append(square_rect)
+                layer_areas.append(square_rect.move(-self.board_margin_x, -self.board_margin_y))
+                if piece:
+                    if self._is_animated_king(piece, row, col):
+                        animated_kings.append((piece, x, y, row, col))
+                    else:
+                        piece_blits.append(self._piece_blit(piece, x, y))
+
+        # Squares never overlap, so each layer is drawn for all of them in one blits() call:
+        # the square's part of each layer, or the whole layers when redrawing all
+        if not redraw_all:
+            screen.blits([(board_layer, rect, rect) for rect in drawn_rects], doreturn=False)
+            for layer in below_pieces:
+                screen.blits([(layer, rect, area) for rect, area in zip(drawn_rects, layer_areas)], doreturn=False)
+        screen.blits(piece_blits, doreturn=False)
+        for animated_king in animated_kings:
+            self.draw_piece(screen, *animated_king)
+        if redraw_all:
+            for layer in above_pieces:
+                screen.blit(layer, board_origin)
+        else:
+            for layer in above_pieces:
+                screen.blits([(layer, rect, area) for rect, area in zip(drawn_rects, layer_areas)], doreturn=False)
+
+        return drawn_rects
 
-                # Check if piece is hanging (red glow)
-                white_hanging = set(evaluation_board.get_hanging_pieces(chess.WHITE))
-                black_hanging = set(evaluation_board.get_hanging_pieces(chess.BLACK))
-                all_hanging = white_hanging | black_hanging
+    def get_overlay_layers(self, is_board_flipped: bool, square_colors: dict, hanging_mask: int,
+                           attacked_mask: int, pinned_mask: int, move_squares: List[Tuple[int, int]],
+                           highlight_set: Optional[set]) -> List[Optional[pygame.Surface]]:
+        """
+        Get the board overlay layers in drawing order: square colors and glows (below the
+        pieces), then pins, move dots and dimming (above them).
+        Each layer is a board-sized surface, rebuilt only when its input squares change;
+        layers with nothing to show are None.
+        """
+        layer_inputs = [
+            ("square_colors", frozenset(square_colors.items()), self._draw_square_colors_layer),
+            ("glows", (hanging_mask, attacked_mask) if hanging_mask | attacked_mask else 0, self._draw_glows_layer),
+            ("pins", pinned_mask, self._draw_pins_layer),
+            ("move_dots", frozenset(move_squares), self._draw_move_dots_layer),
+            ("dimming", frozenset(highlight_set or ()), self._draw_dimming_layer),
+        ]
 
-                if square in all_hanging:
-                    self.draw_hanging_indicator(screen, x, y)
+        layers = []
+        for name, squares, draw_layer in layer_inputs:
+            key = (is_board_flipped, squares)
+            cached = self.overlay_layers.get(name)
+            if cached is None or cached[0] != key:
+                layer = None
+                if squares:
+                    layer = pygame.Surface((self.square_size * 8, self.square_size * 8), pygame.SRCALPHA)
+                    draw_layer(layer, squares, is_board_flipped)
+                cached = self.overlay_layers[name] = (key, layer)
+            layers.append(cached[1])
+        return layers
+
+    def _layer_position(self, row: int, col: int, is_board_flipped: bool) -> Tuple[int, int]:
+        """Get the position of a board square within an overlay layer"""
+        x, y = self.get_square_display_position(row, col, is_board_flipped)
+        return (x - self.board_margin_x, y - self.board_margin_y)
+
+    def _draw_square_colors_layer(self, layer: pygame.Surface, square_colors: frozenset, is_board_flipped: bool) -> None:
+        for (row, col), color in square_colors:
+            x, y = self._layer_position(row, col, is_board_flipped)
+            pygame.draw.rect(layer, color, (x, y, self.square_size, self.square_size))
+
+    # Layers start transparent, so sprites are copied into them as they are (BLEND_RGBA_MAX)
+
+    def _draw_glows_layer(self, layer: pygame.Surface, masks: Tuple[int, int], is_board_flipped: bool) -> None:
+        hanging_mask, attacked_mask = masks
+        layer.blits([self._sprite_blit(name, *self._layer_position(*coords_from_square(square), is_board_flipped),
+                                       pygame.BLEND_RGBA_MAX)
+                     for name, mask in (("hanging_glow", hanging_mask), ("attacked_glow", attacked_mask))
+                     for square in chess.SquareSet(mask)], doreturn=False)
+
+    def _draw_pins_layer(self, layer: pygame.Surface, pinned_mask: int, is_board_flipped: bool) -> None:
+        layer.blits([self._sprite_blit("pin", *self._layer_position(*coords_from_square(square), is_board_flipped),
+                                       pygame.BLEND_RGBA_MAX)
+                     for square in chess.SquareSet(pinned_mask)], doreturn=False)
+
+    def _draw_move_dots_layer(self, layer: pygame.Surface, move_squares: frozenset, is_board_flipped: bool) -> None:
+        layer.blits([self._sprite_blit("move_dot", *self._layer_position(row, col, is_board_flipped),
+                                       pygame.BLEND_RGBA_MAX)
+                     for row, col in move_squares], doreturn=False)
+
+    def _draw_dimming_layer(self, layer: pygame.Surface, highlight_set: frozenset, is_board_flipped: bool) -> None:
+        # Gray out squares outside the highlight set, outline the ones in it
+        for row in range(8):
+            for col in range(8):
+                x, y = self._layer_position(row, col, is_board_flipped)
+                if (row, col) in highlight_set:
+                    pygame.draw.rect(layer, (255, 255, 255), (x, y, self.square_size, self.square_size), 2)
                 else:
-                    # Check if piece is attacked but not hanging (magenta glow)
-                    piece_at_square = evaluation_board.board.piece_at(square)
-                    if piece_at_square:
-                        enemy_color = not piece_at_square.color
-                        if evaluation_board.board.is_attacked_by(enemy_color, square):
-                            self.draw_attacked_indicator(screen, x, y)
-
-                # Draw piece if present (skip if being dragged)
-                piece = board_state.board.piece_at(square)
-                if piece and not (dragging_piece and drag_origin and (row, col) == drag_origin):
-                    self.draw_piece(screen, piece, x, y, row, col)
-
-                # Draw pin indicator AFTER piece (so it appears on top)
-                if piece:
-                    white_pinned = set(evaluation_board.get_pinned_pieces(chess.WHITE))
-                    black_pinned = set(evaluation_board.get_pinned_pieces(chess.BLACK))
-                    all_pinned = white_pinned | black_pinned
-
-                    if square in all_pinned:
-                        self.draw_pin_indicator(screen, x, y)
-
-                # Draw move indicator circle for possible moves
-                if (row, col) in highlighted_moves:
-                    self.draw_move_indicator(screen, x, y)
-
-                # Exchange evaluation triangles removed
-
-        # Draw exchange evaluation piece highlights (gray out non-highlighted) if hovering
-        # Only run if NOT hovering over statistics (to avoid conflict)
-        if mouse_pos and not self.hovered_statistic:
-            evaluation_board = preview_board_state if preview_board_state else board_state
-            highlight_positions = self.get_exchange_highlights(mouse_pos, evaluation_board, is_board_flipped)
-
-            if highlight_positions:
-                # Convert to set for fast lookup
-                highlight_set = set(highlight_positions)
-
-                # Draw gray overlay on ALL squares NOT in highlight set (both empty and occupied)
-                for row in range(8):
-                    for col in range(8):
-                        if (row, col) not in highlight_set:
-                            display_pos = self.get_square_display_position(row, col, is_board_flipped)
-                            if display_pos:
-                                x, y = display_pos
-                                self.draw_gray_overlay(screen, x, y)
-
-                # Draw thin white border around highlighted squares
-                for row, col in highlight_set:
-                    display_pos = self.get_square_display_position(row, col, is_board_flipped)
-                    if display_pos:
-                        x, y = display_pos
-                        pygame.draw.rect(screen, (255, 255, 255), (x, y, self.square_size, self.square_size), 2)
-
-        # Draw statistics highlighting if hovering over spreadsheet (gray out non-highlighted)
-        if self.hovered_statistic:
-            stat_type, player_side = self.hovered_statistic
-            evaluation_board = preview_board_state if preview_board_state else board_state
-            highlight_items = self.get_highlighted_pieces_for_statistic(evaluation_board, stat_type, player_side, is_board_flipped)
-
-            if highlight_items:
-                # Convert to set for fast lookup
-                highlight_set = set(highlight_items)
-
-                # Draw gray overlay on ALL squares NOT in highlight set (both empty and occupied)
-                for row in range(8):
-                    for col in range(8):
-                        if (row, col) not in highlight_set:
-                            display_pos = self.get_square_display_position(row, col, is_board_flipped)
-                            if display_pos:
-                                x, y = display_pos
-                                self.draw_gray_overlay(screen, x, y)
-
-                # Draw thin white border around highlighted squares
-                for row, col in highlight_set:
-                    display_pos = self.get_square_display_position(row, col, is_board_flipped)
-                    if display_pos:
-                        x, y = display_pos
-                        pygame.draw.rect(screen, (255, 255, 255), (x, y, self.square_size, self.square_size), 2)
-
-        # Draw board border (use actual board size based on squares)
-        actual_board_size = self.square_size * 8
-        border_rect = pygame.Rect(self.board_margin_x - 2, self.board_margin_y - 2,
-                                actual_board_size + 4, actual_board_size + 4)
-        pygame.draw.rect(screen, self.RGB_BLACK, border_rect, 2)
-        
-        # Draw coordinates
-        self.draw_coordinates(screen, is_board_flipped)
+                    self.draw_gray_overlay(layer, x, y)
+
+    def get_board_layer(self, is_board_flipped: bool = False) -> pygame.Surface:
+        """
+        Get the window background: white, with the plain board squares, border and coordinates.
+        It is rendered once per orientation, since it only changes when the board is flipped.
+        """
+        layer = self.board_layers.get(is_board_flipped)
+        if layer is None:
+            layer = pygame.Surface((self.window_width, self.window_height))
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert()  # Match the screen's pixel format for fast blits
+            layer.fill(self.RGB_WHITE)
+
+            for row in range(8):
+                for col in range(8):
+                    x, y = self.get_square_display_position(row, col, is_board_flipped)
+                    color = self.LIGHT_SQUARE if (row + col) % 2 == 0 else self.DARK_SQUARE
+                    pygame.draw.rect(layer, color, (x, y, self.square_size, self.square_size))
+
+            # Draw board border (use actual board size based on squares)
+            actual_board_size = self.square_size * 8
+            border_rect = pygame.Rect(self.board_margin_x - 2, self.board_margin_y - 2,
+                                    actual_board_size + 4, actual_board_size + 4)
+            pygame.draw.rect(layer, self.RGB_BLACK, border_rect, 2)
+
+            # Draw coordinates
+            self.draw_coordinates(layer, is_board_flipped)
+
+            self.board_layers[is_board_flipped] = layer
+        return layer
 
     def draw_dragged_piece(self, screen, piece, mouse_pos: Tuple[int, int], is_board_flipped: bool = False) -> None:
         """Draw a piece being dragged, snapped to center of square under mouse"""
@@ -926,42 +846,31 @@ class ChessDisplay:
                     piece_x, piece_y = square_pos
                     # Draw the piece centered in the square
                     self.draw_piece(screen, piece, piece_x, piece_y, -1, -1)
+                    self.track_overlay(pygame.Rect(piece_x, piece_y, self.square_size, self.square_size))
             else:
                 # If not over a square, draw at cursor position
                 piece_x = mouse_pos[0] - self.square_size // 2
                 piece_y = mouse_pos[1] - self.square_size // 2
                 self.draw_piece(screen, piece, piece_x, piece_y, -1, -1)
+                self.track_overlay(pygame.Rect(piece_x, piece_y, self.square_size, self.square_size))
     
+    def _is_animated_king(self, piece: chess.Piece, board_row: int, board_col: int) -> bool:
+        """Check if this is the checkmated king and its animation is active"""
+        return (self.checkmate_animation_start_time is not None and
+                self.checkmate_king_position is not None and
+                piece.piece_type == chess.KING and
+                (board_row, board_col) == coords_from_square(self.checkmate_king_position))
+
     def draw_piece(self, screen, piece: chess.Piece, x: int, y: int, board_row: int = -1, board_col: int = -1) -> None:
         """Draw a piece at the specified screen coordinates"""
-        # Check if this is the checkmated king and animation is active
-        if (self.checkmate_animation_start_time is not None and
-            self.checkmate_king_position is not None and
-            piece.piece_type == chess.KING):
-            # Check if this is the checkmated king's position
-            if board_row != -1 and board_col != -1:
-                king_coords = coords_from_square(self.checkmate_king_position)
-                if (board_row, board_col) == king_coords:
-                    import time
-                    elapsed_time = time.time() - self.checkmate_animation_start_time
-                    self.draw_rotating_king(screen, piece, x, y, elapsed_time)
-                    return
-
-        # Normal piece drawing
-        color_str = "w" if piece.color == chess.WHITE else "b"
-        key = f"{color_str}{piece.piece_type}"
-        if key in self.piece_images:
-            piece_surface = self.piece_images[key]
-            # Center the piece in the square
-            piece_x = x + (self.square_size - piece_surface.get_width()) // 2
-            piece_y = y + (self.square_size - piece_surface.get_height()) // 2
-            screen.blit(piece_surface, (piece_x, piece_y))
-        else:
-            # Fallback: draw piece as text
-            piece_text = chess.piece_symbol(piece.piece_type).upper() if piece.color == chess.WHITE else chess.piece_symbol(piece.piece_type)
-            text_surface = self.font_large.render(piece_text, True, self.RGB_BLACK)
-            text_rect = text_surface.get_rect(center=(x + self.square_size//2, y + self.square_size//2))
-            screen.blit(text_surface, text_rect)
+        if self._is_animated_king(piece, board_row, board_col):
+            import time
+            elapsed_time = time.time() - self.checkmate_animation_start_time
+            self.draw_rotating_king(screen, piece, x, y, elapsed_time)
+            return
+
+        # Normal piece drawing, centered in the square
+        screen.blit(*self._piece_blit(piece, x, y))
     
     def draw_coordinates(self, screen, is_board_flipped: bool = False) -> None:
         """Draw board coordinates (a-h, 1-8)"""
@@ -971,7 +880,7 @@ class ChessDisplay:
             x = self.board_margin_x + col * self.square_size + self.square_size // 2
             y = self.board_margin_y + self.board_size + 10
             
-            text_surface = self.font_small.render(letter, True, self.RGB_BLACK)
+            text_surface = self.render_text(self.font_small, letter, self.RGB_BLACK)
             text_rect = text_surface.get_rect(center=(x, y))
             screen.blit(text_surface, text_rect)
         
@@ -981,7 +890,7 @@ class ChessDisplay:
             x = self.board_margin_x - 20
             y = self.board_margin_y + row * self.square_size + self.square_size // 2
             
-            text_surface = self.font_small.render(number, True, self.RGB_BLACK)
+            text_surface = self.render_text(self.font_small, number, self.RGB_BLACK)
             text_rect = text_surface.get_rect(center=(x, y))
             screen.blit(text_surface, text_rect)
 
@@ -1176,13 +1085,27 @@ class ChessDisplay:
             current_x += space_surface.get_width()
             screen.blit(opponent_surface, (current_x, current_y))
 
+    def render_text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int],
+                    antialias: bool = True) -> pygame.Surface:
+        """Render text through the text cache (font.render is expensive, and labels repeat every frame)"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.text_cache[key] = surface
+            if len(self.text_cache) > GameConfig.TEXT_CACHE_SIZE:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache.move_to_end(key)
+        return surface
+
     def draw_text(self, screen, text: str, x: int, y: int, font: pygame.font.Font,
                   color: Tuple[int, int, int] = None) -> None:
         """Draw text at the specified position"""
         if color is None:
             color = self.RGB_BLACK
         
-        text_surface = font.render(text, True, color)
+        text_surface = self.render_text(font, text, color)
         screen.blit(text_surface, (x, y))
 
     def draw_exchange_indicator(self, screen, x: int, y: int) -> None:
@@ -1222,25 +1145,11 @@ class ChessDisplay:
 
         return surface
 
-    def draw_hanging_indicator(self, screen, x: int, y: int) -> None:
-        """Draw a red gradient glow behind hanging pieces (uses cached surface)"""
-        # Create or reuse cached gradient surface
-        if self.hanging_glow_surface is None or self.hanging_glow_size != self.square_size:
-            self.hanging_glow_surface = self._create_hanging_glow_surface(self.square_size)
-            self.hanging_glow_size = self.square_size
-
-        # Blit the cached gradient
-        screen.blit(self.hanging_glow_surface, (x, y))
-
-    def draw_attacked_indicator(self, screen, x: int, y: int) -> None:
-        """Draw a yellow gradient glow behind attacked pieces (uses cached surface)"""
-        # Create or reuse cached gradient surface
-        if self.attacked_glow_surface is None or self.attacked_glow_size != self.square_size:
-            self.attacked_glow_surface = self._create_attacked_glow_surface(self.square_size)
-            self.attacked_glow_size = self.square_size
-
-        # Blit the cached gradient
-        screen.blit(self.attacked_glow_surface, (x, y))
+    def _create_pin_surface(self) -> pygame.Surface:
+        """Create the pushpin sprite, drawn in the upper left corner of a square-sized surface"""
+        surface = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
+        self.draw_pin_indicator(surface, 0, 0)
+        return surface
 
     def draw_pin_indicator(self, screen, x: int, y: int) -> None:
         """Draw a red pushpin symbol in the upper left corner of the square"""
@@ -1269,11 +1178,9 @@ class ChessDisplay:
         ]
         pygame.draw.polygon(screen, pin_color, triangle_points)
 
-    def draw_gray_overlay(self, screen, x: int, y: int) -> None:
-        """Draw a semi-transparent gray overlay to dim non-highlighted squares"""
-        overlay = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
-        overlay.fill((128, 128, 128, 153))  # Gray with 60% opacity
-        screen.blit(overlay, (x, y))
+    def draw_gray_overlay(self, layer, x: int, y: int) -> None:
+        """Draw a semi-transparent gray square into an overlay layer to dim a non-highlighted square"""
+        layer.fill((128, 128, 128, 153), (x, y, self.square_size, self.square_size))  # Gray with 60% opacity
 
     def get_exchange_highlights(self, mouse_pos: Tuple[int, int], board_state, is_board_flipped: bool = False) -> List[Tuple[int, int]]:
         """
@@ -1291,26 +1198,10 @@ class ChessDisplay:
         else:
             board_square_coords = hovered_square
 
-        # Convert to chess.Square
+        # Attackers and defenders of every attacked piece are computed once per position
         chess_square = square_from_coords(board_square_coords[0], board_square_coords[1])
-
-        # Check if this square is tactically interesting
-        interesting_squares = board_state.get_tactically_interesting_squares()
-        if chess_square not in interesting_squares:
-            return []
-
-        # Get all attackers and defenders for this square
-        attackers, defenders = board_state.get_all_attackers_and_defenders(chess_square)
-
-        # Convert chess.Square back to (row, col) coordinates
-        attacker_coords = [coords_from_square(sq) for sq in attackers]
-        defender_coords = [coords_from_square(sq) for sq in defenders]
-
-        # Include the hovered square itself (the attacked/defended piece)
-        hovered_coords = coords_from_square(chess_square)
-
-        # Return all positions that should be highlighted
-        return attacker_coords + defender_coords + [hovered_coords]
+        exchange_masks = self.get_position_analysis(board_state).intermediate("exchange_masks")
+        return [coords_from_square(square) for square in chess.scan_forward(exchange_masks.get(chess_square, 0))]
 
     def get_square_display_position(self, row: int, col: int, is_board_flipped: bool = False) -> Optional[Tuple[int, int]]:
         """Get the display position (x, y) of a board square"""
@@ -1342,8 +1233,13 @@ class ChessDisplay:
     def update_display(self, screen, board_state: BoardState, selected_square_coords: Optional[Tuple[int, int]] = None,
                       highlighted_moves: List[Tuple[int, int]] = None, is_board_flipped: bool = False,
                       preview_board_state: Optional[BoardState] = None, dragging_piece=None, drag_origin=None,
-                      mouse_pos: Optional[Tuple[int, int]] = None) -> None:
-        """Update the entire display"""
+                      mouse_pos: Optional[Tuple[int, int]] = None) -> List[pygame.Rect]:
+        """
+        Update the display, redrawing only the squares and statistics rows that changed
+        since the previous frame (everything after invalidate(), a board flip or while
+        an animation or overlay covers more than the board).
+        Returns the changed screen rects, which grow as overlays are drawn on top.
+        """
         # Check for checkmate and start animation if needed
         if board_state.is_in_checkmate and self.checkmate_animation_start_time is None:
             self.start_checkmate_animation(board_state)
@@ -1352,21 +1248,50 @@ class ChessDisplay:
             self.checkmate_animation_start_time = None
             self.checkmate_king_position = None
 
-        # Clear screen
-        screen.fill(self.RGB_WHITE)
+        # Overlays drawn on top of the last frame are repaired by redrawing what lies beneath them
+        board_rect = pygame.Rect(self.board_margin_x, self.board_margin_y, self.square_size * 8, self.square_size * 8)
+        self.stale_rects = self.overlay_rects
+        self.overlay_rects = []
+        redraw_all = (self.full_redraw_pending or is_board_flipped != self.drawn_flipped or
+                      self.is_animation_active() or board_state.is_in_stalemate or
+                      any(not board_rect.contains(rect) for rect in self.stale_rects))
+        self.full_redraw_pending = False
+        self.drawn_flipped = is_board_flipped
+
+        # Start from the pre-rendered background
+        if redraw_all:
+            screen.blit(self.get_board_layer(is_board_flipped), (0, 0))
 
         # Draw all components
-        self.draw_board(screen, board_state, selected_square_coords, highlighted_moves, is_board_flipped, preview_board_state, dragging_piece, drag_origin, mouse_pos)
+        dirty_rects = self.draw_board(screen, board_state, selected_square_coords, highlighted_moves, is_board_flipped,
+                                      preview_board_state, dragging_piece, drag_origin, mouse_pos,
+                                      redraw_all, self.stale_rects)
 
         # Draw help panel with statistics (uses preview_board_state when dragging to legal square)
         stats_board_state = preview_board_state if preview_board_state else board_state
-        self.draw_help_panel(screen, stats_board_state, is_board_flipped)
+        dirty_rects += self.draw_help_panel(screen, stats_board_state, is_board_flipped, redraw_all)
 
         # Draw stalemate overlay if needed
         if board_state.is_in_stalemate:
             self.draw_stalemate_overlay(screen)
 
-        # Note: pygame.display.flip() is called in the main loop, not here
+        # Note: the screen is updated in the main loop (with take_dirty_rects()), not here
+        self.dirty_rects = [screen.get_rect()] if redraw_all else dirty_rects
+        return self.dirty_rects
+
+    def invalidate(self) -> None:
+        """Redraw the whole window on the next frame (after something else drew over it)"""
+        self.full_redraw_pending = True
+
+    def track_overlay(self, rect: pygame.Rect) -> None:
+        """Record an area drawn over the board after update_display, so the next frame repairs it"""
+        self.overlay_rects.append(rect)
+        self.dirty_rects.append(rect)
+
+    def take_dirty_rects(self) -> List[pygame.Rect]:
+        """Get the screen rects changed since the last call, for pygame.display.update()"""
+        dirty_rects, self.dirty_rects = self.dirty_rects, []
+        return dirty_rects
 
     def draw_stalemate_overlay(self, screen) -> None:
         """Draw a semi-transparent stalemate message overlay with rubber stamp effect"""
@@ -1417,6 +1342,30 @@ class ChessDisplay:
         # Draw main red text
         screen.blit(rotated_surface, rotated_rect)
 
+    def draw_loading_indicator(self, screen, label: str, fraction: Optional[float] = None) -> None:
+        """
+        Draw a progress strip across the bottom of the board while a PGN file loads.
+        fraction is the completed share (0.0-1.0), or None while it is not known yet.
+        """
+        board_width = self.square_size * 8
+        strip_height = self.square_size // 2
+        strip_rect = pygame.Rect(self.board_margin_x, self.board_margin_y + board_width - strip_height,
+                                 board_width, strip_height)
+
+        strip = pygame.Surface(strip_rect.size, pygame.SRCALPHA)
+        strip.fill(Colors.LOADING_BACKGROUND)
+        screen.blit(strip, strip_rect.topleft)
+
+        if fraction is not None:
+            bar_height = max(2, strip_height // 8)
+            bar_rect = pygame.Rect(strip_rect.left, strip_rect.bottom - bar_height,
+                                   int(board_width * min(max(fraction, 0.0), 1.0)), bar_height)
+            pygame.draw.rect(screen, Colors.LOADING_BAR, bar_rect)
+
+        text_surface = self.render_text(self.font_small, label, Colors.LOADING_TEXT)
+        screen.blit(text_surface, text_surface.get_rect(center=strip_rect.center))
+        self.track_overlay(strip_rect)
+
     def draw_keyboard_shortcuts_panel(self, screen) -> None:
         """Draw a centered panel showing all keyboard shortcuts with dynamic sizing"""
         # Define shortcuts
@@ -1435,19 +1384,19 @@ class ChessDisplay:
 
         # Calculate text dimensions
         title_text = "Keyboard Shortcuts"
-        title_surface = self.font_large.render(title_text, True, Colors.BLACK_TEXT)
+        title_surface = self.render_text(self.font_large, title_text, Colors.BLACK_TEXT)
         title_width, title_height = title_surface.get_size()
 
         instruction_text = "Press / again to close"
-        instruction_surface = self.font_small.render(instruction_text, True, Colors.LABEL_TEXT_COLOR)
+        instruction_surface = self.render_text(self.font_small, instruction_text, Colors.LABEL_TEXT_COLOR)
         instruction_width, instruction_height = instruction_surface.get_size()
 
         # Calculate maximum width needed for shortcuts
         max_shortcut_width = 0
         shortcut_heights = []
         for key, description in shortcuts:
-            key_surface = self.font_medium.render(f"{key}:", True, Colors.RGB_BLACK)
-            desc_surface = self.font_small.render(description, True, Colors.LABEL_TEXT_COLOR)
+            key_surface = self.render_text(self.font_medium, f"{key}:", Colors.RGB_BLACK)
+            desc_surface = self.render_text(self.font_small, description, Colors.LABEL_TEXT_COLOR)
 
             # Calculate combined width (key + gap + description)
             combined_width = key_surface.get_width() + 20 + desc_surface.get_width()  # 20px gap
@@ -1476,6 +1425,7 @@ class ChessDisplay:
         overlay = pygame.Surface((self.window_width, self.window_height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 150))  # Semi-transparent black
         screen.blit(overlay, (0, 0))
+        self.track_overlay(overlay.get_rect())
 
         # Draw panel background
         panel_rect = pygame.Rect(panel_x, panel_y, panel_width, panel_height)
@@ -1491,8 +1441,8 @@ class ChessDisplay:
 
         for i, (key, description) in enumerate(shortcuts):
             # Render text
-            key_surface = self.font_medium.render(f"{key}:", True, Colors.RGB_BLACK)
-            desc_surface = self.font_small.render(description, True, Colors.LABEL_TEXT_COLOR)
+            key_surface = self.render_text(self.font_medium, f"{key}:", Colors.RGB_BLACK)
+            desc_surface = self.render_text(self.font_small, description, Colors.LABEL_TEXT_COLOR)
 
             # Position key text
             key_x = panel_x + padding
@@ -1570,6 +1520,7 @@ class ChessDisplay:
                 screen.blit(text_surface, text_rect)
 
         pygame.display.flip()
+        self.invalidate()  # The dialog covered the whole window
 
         # Wait for user selection
         while True:
@@ -3,8 +3,10 @@ import sys
 import os
 import chess
 from chess_board import BoardState, square_from_coords, coords_from_square
+from move_journal import MoveJournal
+from pgn_loader import PGNLoadJob, PHASE_DONE, PHASE_FAILED, PHASE_REPLAYING
 from display import ChessDisplay
-from config import GameConfig, Colors
+from config import GameConfig, Colors, AnimationConfig, PGNConfig
 from sound_manager import get_sound_manager
 
 # Try to import file dialog functionality
@@ -42,6 +44,14 @@ sound_manager = get_sound_manager()
 # Create global board state in starting position
 game = BoardState()
 
+# Rebuild the previous session from the autosave journal, then keep journaling moves
+try:
+    journal = MoveJournal()
+    journal.restore(game)
+except OSError as e:
+    journal = None
+    print(f"Autosave journal not available: {e}")
+
 # Create display object
 display = ChessDisplay(WINDOW_WIDTH, WINDOW_HEIGHT)
 
@@ -98,25 +108,61 @@ drag_origin = None     # Original square coordinates
 
 # Rendering optimization
 needs_redraw = True  # Initially need to draw
+current_mouse_pos = pygame.mouse.get_pos()  # Updated from mouse events
 last_hovered_square = None  # Track which board square mouse is over
 last_hover_was_legal = False  # Was the last hovered square a legal move?
 
 # Help panel state
 show_help_panel = False
 
+# Background PGN load (Ctrl+L); the board shows the moves replayed so far until it completes
+load_job = None
+load_preview = None          # BoardState with the moves replayed so far
+last_load_progress = None    # (phase, moves replayed) at the last redraw
+
+# The loop sleeps until an event arrives; these timers only run while something
+# changes without input (an animation playing, a PGN file loading)
+ANIMATION_FRAME_EVENT = pygame.event.custom_type()
+LOAD_POLL_EVENT = pygame.event.custom_type()
+active_timers = set()
+
+def update_timer(event_type, interval_ms, active):
+    """Start or stop the repeating timer posting event_type"""
+    if active and event_type not in active_timers:
+        pygame.time.set_timer(event_type, interval_ms)
+        active_timers.add(event_type)
+    elif not active and event_type in active_timers:
+        pygame.time.set_timer(event_type, 0)
+        active_timers.discard(event_type)
+
 
 # Main game loop
 is_running = True
-clock = pygame.time.Clock()
 
 while is_running:
+    if needs_redraw:
+        events = pygame.event.get()
+    else:
+        # Block until the next event, waking up in time for a pending journal fsync
+        timeout_ms = 0  # Wait indefinitely
+        sync_due_in = journal.sync_due_in() if journal is not None else None
+        if sync_due_in is not None:
+            timeout_ms = int(sync_due_in * 1000) + 1
+        events = [pygame.event.wait(timeout_ms)] + pygame.event.get()
+
     # Handle events
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             is_running = False
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
-                if show_help_panel:
+                if load_job is not None:
+                    # Cancel the background load and keep the current game
+                    load_job.cancel()
+                    load_job = None
+                    load_preview = None
+                    needs_redraw = True
+                elif show_help_panel:
                     show_help_panel = False
                     needs_redraw = True
                 else:
@@ -125,7 +171,7 @@ while is_running:
                 display.toggle_help_option("flip_board")
                 needs_redraw = True
             elif event.key == pygame.K_u:  # U key to undo
-                if game.can_undo():
+                if load_job is None and game.can_undo():
                     success = game.undo_move()
                     if success:
                         # Clear any current selection
@@ -137,7 +183,7 @@ while is_running:
                 else:
                     sound_manager.play_error_sound()
             elif event.key == pygame.K_r:  # R key to redo
-                if game.can_redo():
+                if load_job is None and game.can_redo():
                     success = game.redo_move()
                     if success:
                         # Clear any current selection
@@ -157,7 +203,7 @@ while is_running:
             elif event.key == pygame.K_SLASH:  # Slash (/) key to show help
                 show_help_panel = not show_help_panel
                 needs_redraw = True
-            elif event.key == pygame.K_BACKQUOTE:  # Tilde key (~) to reset game
+            elif event.key == pygame.K_BACKQUOTE and load_job is None:  # Tilde key (~) to reset game
                 game.reset_to_initial_position()
                 # Clear any current selection and highlights
                 selected_square_coords = None
@@ -169,23 +215,19 @@ while is_running:
                 last_hover_was_legal = False
                 needs_redraw = True
             elif event.key == pygame.K_l and pygame.key.get_pressed()[pygame.K_LCTRL]:  # Ctrl+L to load PGN
-                filename = get_load_filename()
+                filename = get_load_filename() if load_job is None else None
                 if filename:
-                    success = game.load_pgn_file(filename)
-                    if success:
-                        # Clear any current selection and highlights
-                        selected_square_coords = None
-                        highlighted_moves = []
-                        dragging_piece = None
-                        drag_origin = None
-                        last_hovered_square = None
-                        last_hover_was_legal = False
-                        display.invalidate_activity_cache()
-                        needs_redraw = True
-                        print(f"Loaded PGN file: {filename}")
-                    else:
-                        sound_manager.play_error_sound()
-                        print(f"Failed to load PGN file: {filename}")
+                    # Read and replay on a worker thread; the game is swapped in once it completes
+                    load_job = PGNLoadJob(filename).start()
+                    last_load_progress = None
+                    # Clear any current selection and highlights
+                    selected_square_coords = None
+                    highlighted_moves = []
+                    dragging_piece = None
+                    drag_origin = None
+                    last_hovered_square = None
+                    last_hover_was_legal = False
+                    needs_redraw = True
                 else:
                     sound_manager.play_error_sound()
             elif event.key == pygame.K_s and pygame.key.get_pressed()[pygame.K_LCTRL]:  # Ctrl+S to save PGN
@@ -199,15 +241,23 @@ while is_running:
                         print(f"Failed to save PGN file: {filename}")
                 else:
                     sound_manager.play_error_sound()
+        elif event.type == pygame.MOUSEMOTION:
+            current_mouse_pos = event.pos
+        elif event.type == ANIMATION_FRAME_EVENT:
+            needs_redraw = True
+        elif event.type == pygame.WINDOWEXPOSED:
+            # The window was uncovered; repaint all of it
+            display.invalidate()
+            needs_redraw = True
         elif event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
-            
+            mouse_pos = current_mouse_pos = event.pos
+
             # Check if a help checkbox was clicked
             checkbox_key = display.get_checkbox_at_pos(mouse_pos)
             if checkbox_key:
                 display.toggle_help_option(checkbox_key)
                 needs_redraw = True
-            else:
+            elif load_job is None:  # The board is read-only while a PGN file loads
                 # Handle board clicks for piece selection/movement
                 square = display.get_square_from_mouse(mouse_pos)
                 if square:
@@ -289,8 +339,8 @@ while is_running:
         elif event.type == pygame.MOUSEBUTTONUP:
             if dragging_piece and drag_origin:
                 # Complete the drag operation
-                mouse_pos = pygame.mouse.get_pos()
-                target_square = display.get_square_from_mouse(mouse_pos)
+                current_mouse_pos = event.pos
+                target_square = display.get_square_from_mouse(current_mouse_pos)
 
                 if target_square:
                     # Convert square coordinates if board is flipped
@@ -325,9 +375,30 @@ while is_running:
                 last_hover_was_legal = False
                 needs_redraw = True
 
-    # Check for smart hover detection (only redraw when entering/leaving legal move squares)
-    current_mouse_pos = pygame.mouse.get_pos()
+    # Follow the background PGN load: preview its moves, then swap the game in atomically
+    if load_job is not None:
+        progress = load_job.progress()
+        if progress.phase == PHASE_DONE:
+            game.load_moves(load_job.result())
+            print(f"Loaded PGN file: {load_job.filename}")
+            load_job = None
+            load_preview = None
+            display.invalidate_activity_cache()
+            needs_redraw = True
+        elif progress.phase == PHASE_FAILED:
+            sound_manager.play_error_sound()
+            print(f"Failed to load PGN file: {load_job.filename} ({progress.error})")
+            load_job = None
+            load_preview = None
+            needs_redraw = True
+        elif (progress.phase, progress.replayed) != last_load_progress:
+            if progress.moves and (load_preview is None or len(progress.moves) != len(load_preview.move_history)):
+                load_preview = BoardState()
+                load_preview.load_moves(progress.moves)
+            last_load_progress = (progress.phase, progress.replayed)
+            needs_redraw = True
 
+    # Check for smart hover detection (only redraw when entering/leaving legal move squares)
     # Get current square under mouse
     current_hovered_square = display.get_square_from_mouse(current_mouse_pos)
     if current_hovered_square and display.is_help_option_enabled("flip_board"):
@@ -336,19 +407,6 @@ while is_running:
     # Check if current hover is over a legal move square
     current_hover_is_legal = (current_hovered_square in highlighted_moves) if current_hovered_square else False
 
-    # Create preview board state if hovering over a legal move
-    preview_game = None
-    if current_hover_is_legal and selected_square_coords:
-        # Create a copy of the board state for preview
-        preview_game = game.copy()
-
-        # Execute the candidate move on the preview board
-        from_row, from_col = selected_square_coords
-        to_row, to_col = current_hovered_square
-        from_square = square_from_coords(from_row, from_col)
-        to_square = square_from_coords(to_row, to_col)
-        preview_game.make_move(from_square, to_square)
-
     # Update statistics hover detection
     previous_hovered_statistic = display.hovered_statistic
     display.update_statistics_hover(current_mouse_pos)
@@ -366,32 +424,60 @@ while is_running:
         last_hover_was_legal = current_hover_is_legal
         needs_redraw = True
 
-
-    # Force redraws during animations (temporarily return to continuous rendering)
-    if display.is_animation_active():
-        needs_redraw = True
-
     # Only redraw if something changed
     if needs_redraw:
+        # Create preview board state if hovering over a legal move
+        preview_game = None
+        if current_hover_is_legal and selected_square_coords:
+            # Create a copy of the board state for preview
+            preview_game = game.copy()
+
+            # Execute the candidate move on the preview board
+            from_row, from_col = selected_square_coords
+            to_row, to_col = current_hovered_square
+            from_square = square_from_coords(from_row, from_col)
+            to_square = square_from_coords(to_row, to_col)
+            preview_game.make_move(from_square, to_square)
+
         # Draw the chess board (with flip consideration)
-        current_mouse_pos = pygame.mouse.get_pos()
-        display.update_display(screen, game, selected_square_coords, highlighted_moves, display.is_help_option_enabled("flip_board"), preview_game, dragging_piece, drag_origin, current_mouse_pos)
+        shown_game = load_preview if load_preview is not None else game
+        display.update_display(screen, shown_game, selected_square_coords, highlighted_moves, display.is_help_option_enabled("flip_board"), preview_game, dragging_piece, drag_origin, current_mouse_pos)
 
         # Draw dragged piece snapped to square center
         if dragging_piece:
             display.draw_dragged_piece(screen, dragging_piece, current_mouse_pos, display.is_help_option_enabled("flip_board"))
 
 
+        # Draw loading progress over the board
+        if load_job is not None:
+            progress = load_job.progress()
+            name = os.path.basename(load_job.filename)
+            if progress.phase == PHASE_REPLAYING and progress.total:
+                display.draw_loading_indicator(screen, f"Loading {name}: {progress.replayed}/{progress.total} moves",
+                                               progress.replayed / progress.total)
+            else:
+                display.draw_loading_indicator(screen, f"Reading {name}...")
+
         # Draw help panel if requested
         if show_help_panel:
             display.draw_keyboard_shortcuts_panel(screen)
 
-        # Update the display
-        pygame.display.flip()
+        # Update only the parts of the screen that changed
+        pygame.display.update(display.take_dirty_rects())
         needs_redraw = False
 
-    # Much lower CPU usage - only check for events frequently
-    clock.tick(30)  # Reduced from 60 FPS to 30 FPS
+    # fsync journaled moves once the batch interval has passed
+    if journal is not None:
+        journal.sync_if_due()
+
+    # Wake up for animation frames and load progress only while they are happening
+    update_timer(ANIMATION_FRAME_EVENT, AnimationConfig.FRAME_INTERVAL_MS, display.is_animation_running())
+    update_timer(LOAD_POLL_EVENT, PGNConfig.LOAD_POLL_INTERVAL_MS, load_job is not None)
+
+# Persist analysis results and the session journal before quitting
+display.close_analysis_cache()
+if journal is not None:
+    journal.close()
 
 # Quit Pygame
 pygame.quit()
@@ -0,0 +1,173 @@
+"""
+Move Journal Module
+
+This module autosaves the current game as an append-only journal, so a crash
+never loses the session and saving costs one small append per move instead
+of rewriting a PGN file.
+
+Journal layout (one record per line, after the JOURNAL_MAGIC header line):
+    g <uci> <uci> ...   game loaded or reset (only ever the first record)
+    m <uci>             move made with make_move / make_move_with_promotion
+    u                   undo
+    r                   redo
+
+Every record is flushed to the operating system as soon as it is written, so
+it survives the application crashing. fsync (which also survives power loss)
+is batched: it runs once enough records are pending or enough time has
+passed. Loading or resetting a game atomically replaces the journal with a
+single "g" record, so the file only ever holds the current session.
+
+On startup, restore() replays the journal through BoardState, rebuilding the
+moves and the undo/redo stacks. A torn last record (from a crash mid-write)
+is dropped.
+"""
+
+import os
+import time
+from typing import Iterable, Optional
+import chess
+from config import JournalConfig
+
+JOURNAL_MAGIC = b"#blundex-journal v1\n"
+
+RECORD_GAME = b"g"
+RECORD_MOVE = b"m"
+RECORD_UNDO = b"u"
+RECORD_REDO = b"r"
+
+
+def _apply_record(board_state, record: bytes) -> bool:
+    """Apply one journal record to a BoardState. Returns False if it does not apply"""
+    kind, _, payload = record.partition(b" ")
+    try:
+        moves = [chess.Move.from_uci(uci) for uci in payload.decode('ascii').split()]
+    except ValueError:
+        return False
+
+    if kind == RECORD_GAME:
+        board = chess.Board()
+        for move in moves:
+            if not board.is_legal(move):
+                return False
+            board.push(move)
+        board_state.load_moves(moves)
+        return True
+    if kind == RECORD_MOVE and len(moves) == 1:
+        move = moves[0]
+        return board_state.make_move_with_promotion(move.from_square, move.to_square,
+                                                    move.promotion or chess.QUEEN)
+    if kind == RECORD_UNDO and not moves:
+        return board_state.undo_move()
+    if kind == RECORD_REDO and not moves:
+        return board_state.redo_move()
+    return False
+
+
+class MoveJournal:
+    """Append-only autosave journal of the moves, undos and redos of one game"""
+
+    def __init__(self, path: str = JournalConfig.JOURNAL_PATH,
+                 sync_every: int = JournalConfig.JOURNAL_SYNC_EVERY,
+                 sync_interval: float = JournalConfig.JOURNAL_SYNC_INTERVAL):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(JOURNAL_MAGIC)
+            self.file.flush()
+
+        # Records written since the last fsync
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def restore(self, board_state) -> int:
+        """
+        Replay the journal into board_state, then record its later changes.
+        Replay stops at the first record that is torn or does not apply; the
+        journal is truncated there. Returns the number of records replayed.
+        """
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        board_state.journal = None  # Replayed changes must not be journaled again
+        replayed = 0
+        good_end = len(JOURNAL_MAGIC)
+        if not data.startswith(JOURNAL_MAGIC):
+            good_end = 0
+        else:
+            position = good_end
+            while True:
+                line_end = data.find(b"\n", position)
+                if line_end < 0 or not _apply_record(board_state, data[position:line_end]):
+                    break
+                replayed += 1
+                position = good_end = line_end + 1
+
+        if good_end < len(data):
+            self._rewrite([] if good_end == 0 else [data[len(JOURNAL_MAGIC):good_end]])
+        board_state.journal = self
+        return replayed
+
+    def _append(self, record: bytes) -> None:
+        self.file.write(record + b"\n")
+        self.file.flush()
+        self.pending += 1
+        self.sync_if_due()
+
+    def _rewrite(self, records: Iterable[bytes]) -> None:
+        """Atomically replace the journal with the given records"""
+        self.file.close()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(JOURNAL_MAGIC)
+            for record in records:
+                f.write(record if record.endswith(b"\n") else record + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        self.file = open(self.path, 'ab')
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def start_game(self, moves: Iterable[chess.Move] = ()) -> None:
+        """Start a new session from a loaded (or empty) game"""
+        self._rewrite([b" ".join([RECORD_GAME] + [move.uci().encode('ascii') for move in moves])])
+
+    def record_move(self, move: chess.Move) -> None:
+        self._append(RECORD_MOVE + b" " + move.uci().encode('ascii'))
+
+    def record_undo(self) -> None:
+        self._append(RECORD_UNDO)
+
+    def record_redo(self) -> None:
+        self._append(RECORD_REDO)
+
+    def sync(self) -> None:
+        """fsync every record written so far"""
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def sync_if_due(self) -> None:
+        """fsync if enough records are pending or the sync interval has passed"""
+        if self.pending and (self.pending >= self.sync_every or
+                             time.monotonic() - self.last_sync >= self.sync_interval):
+            self.sync()
+
+    def sync_due_in(self) -> Optional[float]:
+        """Get the seconds until sync_if_due would fsync, or None if no record is pending"""
+        if not self.pending:
+            return None
+        if self.pending >= self.sync_every:
+            return 0.0
+        return max(0.0, self.sync_interval - (time.monotonic() - self.last_sync))
+
+    def close(self) -> None:
+        """fsync pending records and close the journal"""
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
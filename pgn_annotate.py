@@ -0,0 +1,124 @@
+"""
+Annotated PGN Export Module
+
+This module writes games back to PGN for post-game review, with the move
+review of the analysis layer (analysis.move_review) as standard NAGs and
+comments:
+
+    hangs_piece     $4 (??)   {Leaves the knight on e5 hanging}
+    missed_capture  $2 (?)    {Nxe5 was available, winning the undefended pawn on e5}
+    walks_into_pin  $6 (?!)   {The knight on f6 is now pinned}
+
+A move gets the NAG of its most serious flag and one comment covering all of
+them. Export streams game by game: each game's text is written out before
+later games are read, and whole files are annotated on all cores through
+pgn_ingest.ingest_pgn.
+"""
+
+import io
+from typing import Dict, List, Optional, Sequence
+import chess
+from chess_board import BoardState
+from pgn_manager import PGNGame, MoveAnnotation
+from pgn_ingest import ingest_pgn, snapshot_analysis
+from analysis_cache import AnalysisCache
+from san_resolver import replay_san
+from analysis import (move_review, mask_to_squares, FLAG_HANGS_PIECE,
+                      FLAG_MISSED_CAPTURE, FLAG_WALKS_INTO_PIN)
+from config import GameConstants, PGNConfig
+
+# NAG of every move flag; MOVE_FLAGS lists them from most to least serious
+FLAG_NAGS = {
+    FLAG_HANGS_PIECE: 4,      # ?? blunder
+    FLAG_MISSED_CAPTURE: 2,   # ? mistake
+    FLAG_WALKS_INTO_PIN: 6,   # ?! dubious
+}
+
+
+def _describe_pieces(board: chess.Board, mask: int) -> str:
+    """Describe pieces as e.g. "the knight on e5 and the pawn on d4" """
+    names = [f"the {chess.piece_name(board.piece_type_at(square))} on {chess.square_name(square)}"
+             for square in mask_to_squares(mask)]
+    return names[0] if len(names) == 1 else ", ".join(names[:-1]) + " and " + names[-1]
+
+
+def _describe_missed_capture(board: chess.Board, targets: int) -> str:
+    """Describe the capture of the most valuable piece among the targets"""
+    target = max(mask_to_squares(targets),
+                 key=lambda square: GameConstants.PIECE_VALUES[board.piece_type_at(square)])
+    capture = next(board.generate_legal_moves(chess.BB_ALL, chess.BB_SQUARES[target]))
+    return (f"{board.san(capture)} was available, winning the undefended "
+            f"{chess.piece_name(board.piece_type_at(target))} on {chess.square_name(target)}")
+
+
+def _annotation(before: chess.Board, after: chess.Board, review: Dict[str, int]) -> MoveAnnotation:
+    comments = []
+    if FLAG_HANGS_PIECE in review:
+        comments.append(f"Leaves {_describe_pieces(after, review[FLAG_HANGS_PIECE])} hanging")
+    if FLAG_MISSED_CAPTURE in review:
+        comments.append(_describe_missed_capture(before, review[FLAG_MISSED_CAPTURE]))
+    if FLAG_WALKS_INTO_PIN in review:
+        pinned = review[FLAG_WALKS_INTO_PIN]
+        verb = "is" if chess.popcount(pinned) == 1 else "are"
+        description = _describe_pieces(after, pinned)
+        comments.append(f"{description[0].upper()}{description[1:]} {verb} now pinned")
+
+    # Dicts keep MOVE_FLAGS order, so the first flag is the most serious
+    return [FLAG_NAGS[next(iter(review))]], "; ".join(comments)
+
+
+def annotate_moves(moves: Sequence[chess.Move],
+                   cache: Optional[AnalysisCache] = None) -> List[Optional[MoveAnnotation]]:
+    """
+    Review every move of a game played from the starting position.
+    Returns a (NAGs, comment) pair per move, or None for moves without flags.
+    """
+    board_state = BoardState()
+    before = snapshot_analysis(board_state.board, cache)
+    annotations = []
+    for move in moves:
+        board_state.board.push(move)
+        after = snapshot_analysis(board_state.board, cache)
+        review = move_review(before, after, move)
+        annotations.append(_annotation(before.board_state.board, after.board_state.board, review)
+                           if review else None)
+        before = after
+    return annotations
+
+
+def annotate_game(game: PGNGame, cache: Optional[AnalysisCache] = None) -> Dict:
+    """
+    Annotate one parsed game and render it as PGN text.
+    Games with illegal moves are written without annotations and get an "error" field.
+    """
+    record = {}
+    try:
+        annotations = annotate_moves(replay_san(game.moves), cache)
+    except ValueError as e:
+        annotations = None
+        record["error"] = str(e)
+
+    buffer = io.StringIO()
+    game.write_pgn(buffer, annotations)
+    record["pgn"] = buffer.getvalue()
+    return record
+
+
+def export_annotated_pgn(pgn_path: str, out_path: str,
+                         workers: Optional[int] = PGNConfig.INGEST_WORKERS,
+                         chunk_size: int = PGNConfig.INGEST_CHUNK_SIZE,
+                         cache_path: Optional[str] = None) -> int:
+    """
+    Write an annotated copy of every game of a PGN file (plain or compressed),
+    in file order. Returns the number of games written.
+    With a cache_path, move reviews are shared through that AnalysisCache.
+    """
+    written = 0
+    with open(out_path, 'w', encoding='utf-8') as out:
+        for record in ingest_pgn(pgn_path, workers=workers, chunk_size=chunk_size,
+                                 analyze=annotate_game, cache_path=cache_path):
+            if written:
+                out.write("\n")  # Separate games with blank lines
+            out.write(record["pgn"])
+            written += 1
+    return written
@@ -0,0 +1,135 @@
+"""
+PGN Header Filter Module
+
+This module scans and filters large PGN files by their tag pairs only.
+
+Movetext is never tokenized: games are located by searching the memory-mapped
+file for the next [Event boundary, and only the tag section at the start of
+each game is looked at. A cheap byte search on the tag section rejects most
+non-matching games before any tag is parsed, so selective filters run close
+to disk read speed.
+"""
+
+from typing import Dict, Iterator, NamedTuple, Optional
+from pgn_index import open_mmap, header_block_end, iter_game_spans, parse_header_tags
+
+
+class HeaderMatch(NamedTuple):
+    """A game selected by a header scan"""
+    offset: int
+    length: int
+    tags: Dict[str, str]
+
+
+def normalize_date(date: str, fill: str = "00") -> str:
+    """
+    Normalize a PGN or ISO date to "YYYY.MM.DD" so dates compare as strings.
+    Missing or unknown ("??") parts are replaced by fill.
+    """
+    parts = date.replace("-", ".").replace("/", ".").split(".")
+    parts = [part for part in parts if part][:3]
+    while len(parts) < 3:
+        parts.append(fill)
+    year, month, day = parts
+    year = "0000" if "?" in year else year.zfill(4)
+    month = fill if "?" in month else month.zfill(2)
+    day = fill if "?" in day else day.zfill(2)
+    return f"{year}.{month}.{day}"
+
+
+class GameFilter:
+    """
+    Criteria on the tag pairs of a game. Every given criterion must match.
+
+    player, white and black are case-insensitive substring matches (player
+    matches either side), result is an exact match, eco is a prefix match
+    (eco="B9" selects B90-B99), and date_from/date_to are inclusive bounds
+    that accept partial dates such as "2023" or "2023-06".
+    """
+
+    def __init__(self, player: Optional[str] = None, white: Optional[str] = None,
+                 black: Optional[str] = None, result: Optional[str] = None,
+                 date_from: Optional[str] = None, date_to: Optional[str] = None,
+                 eco: Optional[str] = None, event: Optional[str] = None):
+        self.player = player.casefold() if player else None
+        self.white = white.casefold() if white else None
+        self.black = black.casefold() if black else None
+        self.result = result
+        self.date_from = normalize_date(date_from, "00") if date_from else None
+        self.date_to = normalize_date(date_to, "99") if date_to else None
+        self.eco = eco.upper() if eco else None
+        self.event = event.casefold() if event else None
+
+        # Byte strings that must appear in the tag section of any matching game
+        # (skipped for needles whose raw bytes may differ: non-ASCII or escaped)
+        self._required = []
+        for needle in (player, white, black, event):
+            if needle and needle.isascii() and '"' not in needle and '\\' not in needle:
+                self._required.append(needle.lower().encode('ascii'))
+        if result:
+            self._required.append(f'"{result}"'.encode('utf-8'))
+
+    def could_match(self, header_bytes: bytes) -> bool:
+        """Cheap pre-check on the raw tag section; False means the game cannot match"""
+        if not self._required:
+            return True
+        lowered = header_bytes.lower()
+        return all(needle in lowered for needle in self._required)
+
+    def matches(self, tags: Dict[str, str]) -> bool:
+        """Check the parsed tags of a game against every criterion"""
+        white = tags.get("White", "").casefold()
+        black = tags.get("Black", "").casefold()
+        if self.player and self.player not in white and self.player not in black:
+            return False
+        if self.white and self.white not in white:
+            return False
+        if self.black and self.black not in black:
+            return False
+        if self.result and tags.get("Result", "*") != self.result:
+            return False
+        if self.eco and not tags.get("ECO", "").upper().startswith(self.eco):
+            return False
+        if self.event and self.event not in tags.get("Event", "").casefold():
+            return False
+        if self.date_from or self.date_to:
+            date = normalize_date(tags.get("Date", "????.??.??"))
+            if self.date_from and date < self.date_from:
+                return False
+            if self.date_to and date > self.date_to:
+                return False
+        return True
+
+
+def scan_headers(filename: str, game_filter: Optional[GameFilter] = None) -> Iterator[HeaderMatch]:
+    """
+    Yield the offset, length and tags of every game in a PGN file without
+    parsing movetext. Games rejected by game_filter are skipped.
+    """
+    f, data = open_mmap(filename)
+    try:
+        if data is None:
+            return
+        try:
+            for offset, length in iter_game_spans(data):
+                end = offset + length
+                if game_filter is not None:
+                    header_bytes = data[offset:header_block_end(data, offset, end)]
+                    if not game_filter.could_match(header_bytes):
+                        continue
+                tags = parse_header_tags(data, offset, end)
+                if game_filter is None or game_filter.matches(tags):
+                    yield HeaderMatch(offset, length, tags)
+        finally:
+            data.close()
+    finally:
+        f.close()
+
+
+def filter_games(filename: str, **criteria) -> Iterator[HeaderMatch]:
+    """
+    Yield the games of a PGN file whose headers match the given criteria,
+    e.g. filter_games("games.pgn", player="Carlsen", result="1-0", date_from="2020").
+    See GameFilter for the supported criteria.
+    """
+    return scan_headers(filename, GameFilter(**criteria))
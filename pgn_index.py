@@ -0,0 +1,259 @@
+"""
+PGN Game Index Module
+
+This module builds a sidecar index for random access into large PGN files.
+
+The index is stored next to the PGN file as "<file>.idx". It holds one line per
+game with its byte offset, byte length and key headers (White, Black, Result,
+Date, ECO, PlyCount). The PGN file is scanned through mmap, and a game is
+loaded by slicing the mapped file and parsing only that game.
+
+When the PGN file has been appended to, only the new tail is scanned. Any other
+change to the file triggers a full rebuild.
+
+A game starts at its first tag line, so text before the first game (a '%'
+escape line, a comment or other preamble) is never counted as a game. The
+first game is streamed without building the index, skipping the same
+preamble, so game numbers mean the same game on both paths.
+"""
+
+import mmap
+import os
+import re
+import zlib
+from itertools import chain
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from pgn_manager import PGNGame, PGNParser, GAME_BOUNDARY, is_compressed, open_pgn
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = "#blundex-index v2"
+
+# Tags stored in the index, in column order
+INDEX_TAGS = ["White", "Black", "Result", "Date", "ECO", "PlyCount"]
+
+# Bytes before the indexed size used to detect changes other than appends
+FINGERPRINT_SIZE = 4096
+
+_TAG_LINE = re.compile(rb'\[[ \t]*(\w+)[ \t]*"((?:[^"\\\r\n]|\\.)*)"[ \t]*\]')
+_TAG_LINE_START = re.compile(rb'^[ \t\r]*\[', re.MULTILINE)
+_BLANK_LINE = re.compile(rb'\n[ \t\r]*\n')
+
+
+class GameIndexEntry(NamedTuple):
+    """Location and key headers of one game"""
+    offset: int
+    length: int
+    white: str
+    black: str
+    result: str
+    date: str
+    eco: str
+    ply_count: str
+
+
+def index_path_for(pgn_path: str) -> str:
+    """Get the sidecar index path of a PGN file"""
+    return pgn_path + INDEX_SUFFIX
+
+
+def _fingerprint(data, size: int) -> int:
+    """Checksum of the bytes just before size"""
+    return zlib.crc32(data[max(0, size - FINGERPRINT_SIZE):size])
+
+
+def header_block_end(data, offset: int, end: int) -> int:
+    """Get the end of the tag section of a game (its first blank line)"""
+    while offset < end and data[offset:offset + 1].isspace():
+        offset += 1
+    blank = _BLANK_LINE.search(data, offset, end)
+    return end if blank is None else blank.start() + 1
+
+
+def parse_header_tags(data, offset: int, end: int) -> Dict[str, str]:
+    """
+    Parse the tag pairs at the start of a game without touching its movetext.
+    data may be bytes or an mmap; scanning stops at the first blank line.
+    """
+    tags = {}
+    for name, value in _TAG_LINE.findall(data[offset:header_block_end(data, offset, end)]):
+        value = value.decode('utf-8', errors='replace')
+        if "\\" in value:
+            value = value.replace('\\"', '"').replace('\\\\', '\\')
+        tags[name.decode('ascii')] = value
+    return tags
+
+
+def iter_game_spans(data, start: int = 0) -> Iterator[tuple]:
+    """
+    Yield (offset, length) of every game from start, split on [Event lines.
+    A game starts at its first tag line; spans without one are not games.
+    """
+    size = len(data)
+    offset = start
+    while offset < size:
+        boundary = data.find(GAME_BOUNDARY, offset + 1)
+        end = size if boundary < 0 else boundary + 1
+        tags = _TAG_LINE_START.search(data, offset, end)
+        if tags is not None:
+            yield tags.start(), end - tags.start()
+        offset = end
+
+
+def scan_games(data, start: int = 0) -> List[GameIndexEntry]:
+    """Build index entries for every game in data from start"""
+    entries = []
+    for offset, length in iter_game_spans(data, start):
+        tags = parse_header_tags(data, offset, offset + length)
+        entries.append(GameIndexEntry(offset, length, *(tags.get(tag, "") for tag in INDEX_TAGS)))
+    return entries
+
+
+def open_mmap(pgn_path: str):
+    """Memory-map a PGN file for reading. Returns (file, mmap) or (file, None) if empty"""
+    if is_compressed(pgn_path):
+        raise ValueError(f"Cannot index compressed PGN file: {pgn_path}")
+    f = open(pgn_path, 'rb')
+    if os.fstat(f.fileno()).st_size == 0:
+        return f, None
+    return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\t", " ").replace("\n", " ").replace("\r", " ")
+
+
+class GameIndex:
+    """Random access to the games of a PGN file through its sidecar index"""
+
+    def __init__(self, pgn_path: str, entries: List[GameIndexEntry]):
+        self.pgn_path = pgn_path
+        self.entries = entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, number: int) -> GameIndexEntry:
+        return self.entries[number]
+
+    def game_text(self, number: int) -> str:
+        """Get the raw PGN text of a game by its number (0-based)"""
+        entry = self.entries[number]
+        f, data = open_mmap(self.pgn_path)
+        try:
+            if data is None:
+                raise IndexError(f"Game {number} not found in empty file {self.pgn_path}")
+            try:
+                return data[entry.offset:entry.offset + entry.length].decode('utf-8', errors='replace')
+            finally:
+                data.close()
+        finally:
+            f.close()
+
+    def read_game(self, number: int) -> PGNGame:
+        """Load a game by its number (0-based) with one slice and one parse"""
+        games = PGNParser.parse_pgn(self.game_text(number))
+        if not games:
+            raise ValueError(f"Game {number} of {self.pgn_path} contains no moves or tags")
+        return games[0]
+
+    @staticmethod
+    def build(pgn_path: str) -> 'GameIndex':
+        """Build (or incrementally update) the sidecar index and return it"""
+        entries: List[GameIndexEntry] = []
+        indexed_size = 0
+        fingerprint = None
+
+        index_path = index_path_for(pgn_path)
+        if os.path.exists(index_path):
+            header, entries = GameIndex._read_sidecar(index_path)
+            if header is not None:
+                indexed_size, fingerprint = header
+            else:
+                entries = []
+
+        f, data = open_mmap(pgn_path)
+        try:
+            size = len(data) if data is not None else 0
+
+            if size == indexed_size and fingerprint == (_fingerprint(data, size) if data is not None else 0):
+                return GameIndex(pgn_path, entries)
+
+            appended = (entries and size > indexed_size and
+                        _fingerprint(data, indexed_size) == fingerprint)
+            if appended:
+                # The last indexed game may continue into the appended data, so rescan it
+                start = entries.pop().offset
+            else:
+                entries, start = [], 0
+
+            if data is not None:
+                entries.extend(scan_games(data, start))
+            new_fingerprint = _fingerprint(data, size) if data is not None else 0
+        finally:
+            if data is not None:
+                data.close()
+            f.close()
+
+        try:
+            GameIndex._write_sidecar(index_path, size, new_fingerprint, entries)
+        except OSError as e:
+            # The index still works from memory; it is rebuilt next time
+            print(f"Warning: Could not write game index {index_path}: {e}")
+        return GameIndex(pgn_path, entries)
+
+    @staticmethod
+    def _read_sidecar(index_path: str):
+        """Read a sidecar index. Returns ((size, fingerprint), entries) or (None, []) if invalid"""
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                header = f.readline().rstrip("\n").split("\t")
+                if len(header) != 3 or header[0] != INDEX_MAGIC:
+                    return None, []
+                entries = []
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    if len(fields) != 2 + len(INDEX_TAGS):
+                        return None, []
+                    entries.append(GameIndexEntry(int(fields[0]), int(fields[1]), *fields[2:]))
+            return (int(header[1]), int(header[2])), entries
+        except (ValueError, IndexError):
+            # Truncated or corrupt sidecars are treated as stale and rebuilt
+            return None, []
+
+    @staticmethod
+    def _write_sidecar(index_path: str, size: int, fingerprint: int, entries: List[GameIndexEntry]):
+        """Write the sidecar atomically so readers never see a partial index"""
+        temp_path = index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(f"{INDEX_MAGIC}\t{size}\t{fingerprint}\n")
+            for entry in entries:
+                f.write("\t".join([str(entry.offset), str(entry.length)] +
+                                  [_escape(value) for value in entry[2:]]) + "\n")
+        os.replace(temp_path, index_path)
+
+
+def read_first_game(pgn_path: str) -> Optional[PGNGame]:
+    """
+    Stream the first game of a PGN file (plain or compressed) without indexing it.
+    Like iter_game_spans, everything before the first tag line is skipped.
+    """
+    with open_pgn(pgn_path) as f:
+        for line in f:
+            if line.lstrip(" \t\r").startswith("["):
+                return next(PGNParser.iter_pgn(chain([line], f)), None)
+    return None
+
+
+def load_game(pgn_path: str, number: int, index: Optional[GameIndex] = None) -> Optional[PGNGame]:
+    """
+    Load game #number (0-based) of a PGN file. Returns None if the file has fewer games.
+    The first game is streamed; later games go through the index, which is built if needed
+    (compressed files cannot be indexed, so only their first game can be loaded).
+    """
+    if index is None:
+        if number == 0:
+            return read_first_game(pgn_path)
+        index = GameIndex.build(pgn_path)
+    if number >= len(index):
+        return None
+    return index.read_game(number)
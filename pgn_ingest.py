@@ -0,0 +1,212 @@
+"""
+Parallel PGN Ingestion Module
+
+This module parses, replays and analyses large PGN files on all cores.
+
+The file is split into byte ranges aligned on "[Event " tag boundaries, so
+every shard holds whole games. Each shard is read, parsed and analysed by a
+ProcessPoolExecutor worker, and results are merged back in file order.
+
+Compressed files cannot be seeked into, so they are processed as a single
+shard by one worker.
+
+With a cache path, every worker reads and writes analysis results (and move
+reviews) through a shared AnalysisCache, so positions seen in earlier runs or
+other games are not analysed again.
+"""
+
+import io
+import os
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import chess
+import chess.polyglot
+from chess_board import BoardState
+from pgn_manager import PGNGame, PGNParser, GAME_BOUNDARY, is_compressed, iter_games
+from san_resolver import replay_san
+from analysis import HELPERS, PositionAnalysis, mask_to_squares, move_flags
+from analysis_cache import AnalysisCache
+from config import PGNConfig
+
+# Statistic helpers reported for the final position of every game
+STATISTIC_KEYS = [helper.key for helper in HELPERS if helper.kind == "statistic"]
+
+# Pawn structure helpers reported for every ply by analyze_game_plies
+PAWN_KEYS = [helper.key for helper in HELPERS if helper.option_key == "pawn_statistics"]
+
+
+def find_shards(filename: str, chunk_size: int = PGNConfig.INGEST_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split a PGN file into (start, end) byte ranges of roughly chunk_size bytes.
+    Every range except the first starts at the "[Event " line of a game.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    file_size = os.path.getsize(filename)
+    if is_compressed(filename):
+        return [(0, file_size)]
+
+    starts = [0]
+    with open(filename, 'rb') as f:
+        position = chunk_size
+        while position < file_size:
+            # Step back one byte so a boundary sitting exactly at position is found
+            f.seek(position - 1)
+            window = b""
+            found = -1
+            while found < 0:
+                block = f.read(PGNConfig.READ_BUFFER_SIZE)
+                if not block:
+                    break
+                window = window[-len(GAME_BOUNDARY):] + block
+                found = window.find(GAME_BOUNDARY)
+            if found < 0:
+                break
+
+            # Offset of the '[' following the newline
+            boundary = f.tell() - len(window) + found + 1
+            starts.append(boundary)
+            position = boundary + chunk_size
+
+    ends = starts[1:] + [file_size]
+    return list(zip(starts, ends))
+
+
+def read_shard(filename: str, start: int, end: int) -> Iterator[PGNGame]:
+    """Parse the games stored in one byte range of a PGN file"""
+    if is_compressed(filename):
+        yield from iter_games(filename)
+        return
+
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    yield from PGNParser.iter_pgn(io.StringIO(data.decode('utf-8', errors='replace')))
+
+
+def analyze_game(game: PGNGame, cache: Optional[AnalysisCache] = None) -> Dict:
+    """
+    Replay a game through BoardState and analyse its final position.
+    Games with illegal moves are reported with an error instead of statistics.
+    """
+    record = {
+        "tags": dict(game.tags),
+        "result": game.result,
+        "plies": len(game.moves),
+    }
+    try:
+        moves = replay_san(game.moves)
+    except ValueError as e:
+        record["error"] = str(e)
+        return record
+
+    board_state = BoardState()
+    board_state.load_moves(moves)
+    record["fen"] = board_state.get_fen_position()
+    zobrist_hash = chess.polyglot.zobrist_hash(board_state.board) if cache is not None else None
+    record["statistics"] = PositionAnalysis(board_state, cache, zobrist_hash).run(STATISTIC_KEYS)
+    return record
+
+
+def snapshot_analysis(board, cache: Optional[AnalysisCache] = None) -> PositionAnalysis:
+    """Analyse a snapshot of board, so later pushes do not change it"""
+    board_state = BoardState()
+    board_state.board = board.copy(stack=False)
+    if cache is None:
+        return PositionAnalysis(board_state)
+    return PositionAnalysis(board_state, cache, chess.polyglot.zobrist_hash(board))
+
+
+def _squares_by_color(pair) -> Dict[str, List[str]]:
+    return {"white": [chess.square_name(square) for square in mask_to_squares(pair[0])],
+            "black": [chess.square_name(square) for square in mask_to_squares(pair[1])]}
+
+
+def analyze_game_plies(game: PGNGame, cache: Optional[AnalysisCache] = None) -> Dict:
+    """
+    Replay a game and report, for the position after every ply, the hanging
+    pieces, pins and pawn statistics of both sides and the move's flags
+    (see analysis.move_flags).
+    """
+    record = {"tags": dict(game.tags), "result": game.result, "plies": []}
+    try:
+        moves = replay_san(game.moves)
+    except ValueError as e:
+        record["error"] = str(e)
+        return record
+
+    board_state = BoardState()
+    before = snapshot_analysis(board_state.board, cache)
+    for ply, (san, move) in enumerate(zip(game.moves, moves), start=1):
+        color = "white" if board_state.board.turn == chess.WHITE else "black"
+        board_state.board.push(move)
+        after = snapshot_analysis(board_state.board, cache)
+
+        white_glows, black_glows = after.get("hanging_glows")
+        record["plies"].append({
+            "ply": ply,
+            "move": san,
+            "color": color,
+            "hanging": _squares_by_color((white_glows[0], black_glows[0])),
+            "pins": _squares_by_color(after.get("pins")),
+            "pawns": {side: {key: after.get(key)[index] for key in PAWN_KEYS}
+                      for index, side in enumerate(("white", "black"))},
+            "flags": move_flags(before, after, move),
+        })
+        before = after
+    return record
+
+
+def process_shard(filename: str, start: int, end: int,
+                  analyze: Callable[..., Dict] = analyze_game,
+                  cache_path: Optional[str] = None) -> List[Dict]:
+    """
+    Worker entry point: parse and analyse every game of one shard.
+    With a cache path, analyze is also given the opened AnalysisCache.
+    """
+    if cache_path is None:
+        return [analyze(game) for game in read_shard(filename, start, end)]
+    with AnalysisCache(cache_path) as cache:
+        return [analyze(game, cache) for game in read_shard(filename, start, end)]
+
+
+def ingest_pgn(filename: str, workers: Optional[int] = PGNConfig.INGEST_WORKERS,
+               chunk_size: int = PGNConfig.INGEST_CHUNK_SIZE,
+               analyze: Callable[..., Dict] = analyze_game,
+               cache_path: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Analyse every game of a PGN file in parallel, yielding results in file order.
+
+    workers defaults to the number of CPUs. analyze must be a module-level
+    function so it can be sent to worker processes; with a cache_path it must
+    also accept the AnalysisCache as its second argument.
+    """
+    shards = find_shards(filename, chunk_size)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(shards) == 1:
+        for start, end in shards:
+            yield from process_shard(filename, start, end, analyze, cache_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Only a bounded window of shards is in flight, so finished results never pile up
+        # when the consumer is slower than the workers. Futures are consumed in submission
+        # order, so shards are merged back in file order.
+        remaining = iter(shards)
+        pending = deque(executor.submit(process_shard, filename, start, end, analyze, cache_path)
+                        for start, end in islice(remaining, 2 * workers))
+        try:
+            while pending:
+                shard_results = pending.popleft().result()
+                for start, end in islice(remaining, 1):
+                    pending.append(executor.submit(process_shard, filename, start, end, analyze, cache_path))
+                yield from shard_results
+        finally:
+            # A consumer that stops early does not wait for shards that have not started
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,119 @@
+"""
+Background PGN Loading Module
+
+This module loads a game from a PGN file on a worker thread, so the GUI keeps
+responding while a large (or compressed) file is read and its moves are
+replayed.
+
+The GUI polls the job once per frame. progress() returns a consistent
+snapshot: the phase, the number of moves replayed so far out of the game's
+total, and the moves replayed so far, which can be shown as a preview. The
+moves are handed over only once the whole game has been replayed, so the
+board can be swapped in with a single BoardState.load_moves call.
+"""
+
+import threading
+from typing import List, NamedTuple, Optional
+import chess
+from san_resolver import resolve_san
+from config import PGNConfig
+
+PHASE_READING = "reading"      # Parsing the game from the file
+PHASE_REPLAYING = "replaying"  # Resolving SAN moves
+PHASE_DONE = "done"            # All moves resolved
+PHASE_FAILED = "failed"        # File unreadable, no game, or an illegal move
+
+
+class LoadProgress(NamedTuple):
+    """Snapshot of a load job"""
+    phase: str
+    replayed: int               # Moves resolved so far
+    total: int                  # Moves in the game (0 while reading)
+    moves: List[chess.Move]     # Moves resolved so far, refreshed every PGN_LOAD_PREVIEW_PLIES
+    error: Optional[str]
+
+
+class PGNLoadJob:
+    """Reads and replays one game of a PGN file on a background thread"""
+
+    def __init__(self, filename: str, game_number: int = 0,
+                 preview_plies: int = PGNConfig.LOAD_PREVIEW_PLIES):
+        self.filename = filename
+        self.game_number = game_number
+        self.preview_plies = preview_plies
+
+        self._lock = threading.Lock()
+        self._phase = PHASE_READING
+        self._replayed = 0
+        self._total = 0
+        self._preview: List[chess.Move] = []
+        self._moves: List[chess.Move] = []
+        self._error: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pgn-load", daemon=True)
+
+    def start(self) -> 'PGNLoadJob':
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Ask the worker to stop; it stops before resolving the next move"""
+        self._cancelled.set()
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return self._phase in (PHASE_DONE, PHASE_FAILED)
+
+    def progress(self) -> LoadProgress:
+        with self._lock:
+            return LoadProgress(self._phase, self._replayed, self._total, self._preview, self._error)
+
+    def result(self) -> List[chess.Move]:
+        """Get every move of the loaded game (only valid once the phase is PHASE_DONE)"""
+        with self._lock:
+            if self._phase != PHASE_DONE:
+                raise RuntimeError(f"load job is {self._phase}")
+            return self._moves
+
+    def _fail(self, message: str) -> None:
+        with self._lock:
+            self._phase = PHASE_FAILED
+            self._error = message
+
+    def _run(self) -> None:
+        # Imported here to avoid a circular import (pgn_manager depends on BoardState)
+        from pgn_index import load_game
+
+        try:
+            pgn = load_game(self.filename, self.game_number)
+            if pgn is None:
+                self._fail("no game found")
+                return
+
+            with self._lock:
+                self._phase = PHASE_REPLAYING
+                self._total = len(pgn.moves)
+
+            board = chess.Board()
+            moves = []
+            for san in pgn.moves:
+                if self._cancelled.is_set():
+                    self._fail("cancelled")
+                    return
+                move = resolve_san(board, san)
+                board.push(move)
+                moves.append(move)
+                if len(moves) % self.preview_plies == 0:
+                    with self._lock:
+                        self._replayed = len(moves)
+                        self._preview = list(moves)
+
+            with self._lock:
+                self._replayed = len(moves)
+                self._preview = moves
+                self._moves = moves
+                self._phase = PHASE_DONE
+
+        except Exception as e:
+            self._fail(str(e))
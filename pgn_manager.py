@@ -3,12 +3,118 @@ PGN (Portable Game Notation) parser and writer for chess games.
 
 This module provides functionality to load and save chess games in standard PGN format,
 allowing import/export of games with full move history and metadata.
+
+Large PGN databases can be read with iter_games(), which streams one game at a
+time from a buffered (optionally gzip/bzip2/xz compressed) file.
 """
 
 import re
-from typing import List, Dict, Optional, Tuple
+import io
+import gzip
+import bz2
+import lzma
+from typing import List, Dict, Optional, Sequence, Tuple, Iterable, Iterator, TextIO
 from datetime import datetime
-from chess_board import BoardState, Color, PieceType
+import chess
+from chess_board import BoardState
+from san_resolver import resolve_san, replay_san
+from config import PGNConfig
+
+# Magic bytes of the compression formats read transparently by open_pgn()
+COMPRESSION_MAGIC = [
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+]
+
+# Every game in a PGN export starts with its Event tag, so files can be split here
+GAME_BOUNDARY = b"\n[Event "
+
+
+def is_compressed(filename: str) -> bool:
+    """Check whether a PGN file starts with a known compression magic number"""
+    with open(filename, 'rb') as f:
+        magic = f.read(6)
+    return any(magic.startswith(prefix) for prefix, _ in COMPRESSION_MAGIC)
+
+# Seven Tag Roster, always written first and in this order
+REQUIRED_TAGS = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
+
+PGN_LINE_WIDTH = 80
+
+# Annotation written after a move: NAG values and a comment (empty for none)
+MoveAnnotation = Tuple[List[int], str]
+
+
+class _LineWrapper:
+    """Joins tokens into lines of at most width characters, writing each line once it is full"""
+
+    def __init__(self, out: TextIO, width: int):
+        self.out = out
+        self.width = width
+        self.tokens: List[str] = []
+        self.length = 0
+
+    def add(self, token: str):
+        if self.tokens and self.length + 1 + len(token) > self.width:
+            self.end_line()
+        self.length += len(token) + (1 if self.tokens else 0)
+        self.tokens.append(token)
+
+    def end_line(self):
+        if self.tokens:
+            self.out.write(" ".join(self.tokens) + "\n")
+            self.tokens = []
+            self.length = 0
+
+
+def _escape_tag_value(value: str) -> str:
+    """Escape backslashes, then quotes, so the tag parser reads the value back unchanged"""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def write_pgn_game(out: TextIO, tags: Dict[str, str], result: str, moves: Sequence[str],
+                   annotations: Optional[Sequence[Optional[MoveAnnotation]]] = None,
+                   width: int = PGN_LINE_WIDTH):
+    """
+    Write one game in PGN export format, line by line, to an open text file.
+    annotations optionally holds a (NAGs, comment) pair or None for every move.
+    """
+    for tag in REQUIRED_TAGS:
+        value = tags.get(tag, "?" if tag != "Result" else "*")
+        out.write(f'[{tag} "{_escape_tag_value(value)}"]\n')
+    for key, value in tags.items():
+        if key not in REQUIRED_TAGS:
+            out.write(f'[{key} "{_escape_tag_value(value)}"]\n')
+    out.write("\n")  # Empty line after tags
+
+    wrapper = _LineWrapper(out, width)
+    needs_number = False  # Black moves after a comment repeat the move number
+    for ply, san in enumerate(moves):
+        if ply % 2 == 0:
+            wrapper.add(f"{ply // 2 + 1}.")
+        elif needs_number:
+            wrapper.add(f"{ply // 2 + 1}...")
+        wrapper.add(san)
+        needs_number = False
+
+        annotation = annotations[ply] if annotations and ply < len(annotations) else None
+        if annotation:
+            nags, comment = annotation
+            for nag in nags:
+                wrapper.add(f"${nag}")
+            words = comment.replace("}", ")").split()
+            if words:
+                # Comments may span lines, so they wrap like any other text
+                words[0] = "{" + words[0]
+                words[-1] += "}"
+                for word in words:
+                    wrapper.add(word)
+                needs_number = True
+
+    wrapper.add(result)
+    wrapper.end_line()
+
 
 class PGNGame:
     """Represents a chess game with metadata and moves in PGN format"""
@@ -30,64 +136,195 @@ class PGNGame:
         """Add a move to the game"""
         self.moves.append(move)
 
+    def write_pgn(self, out: TextIO, annotations: Optional[Sequence[Optional[MoveAnnotation]]] = None):
+        """Write the game in PGN format to an open text file"""
+        write_pgn_game(out, self.tags, self.result, self.moves, annotations)
+
     def to_pgn(self) -> str:
         """Convert game to PGN format string"""
-        lines = []
-
-        # Add tags
-        required_tags = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
-        for tag in required_tags:
-            value = self.get_tag(tag, "?" if tag != "Result" else "*")
-            lines.append(f'[{tag} "{value}"]')
-
-        # Add any additional tags
-        for key, value in self.tags.items():
-            if key not in required_tags:
-                lines.append(f'[{key} "{value}"]')
-
-        lines.append("")  # Empty line after tags
-
-        # Add moves
-        if self.moves:
-            move_text = ""
-            for i, move in enumerate(self.moves):
-                if i % 2 == 0:  # White's move
-                    move_num = (i // 2) + 1
-                    move_text += f"{move_num}. {move} "
-                else:  # Black's move
-                    move_text += f"{move} "
-
-            # Add result
-            move_text += self.result
-
-            # Wrap lines at reasonable length
-            lines.extend(self._wrap_text(move_text, 80))
+        buffer = io.StringIO()
+        self.write_pgn(buffer)
+        return buffer.getvalue().rstrip("\n")
+
+
+# Token kinds emitted by tokenize_pgn()
+TOKEN_TAG = "tag"                    # value: (name, value)
+TOKEN_MOVE = "move"                  # value: SAN without check/annotation suffixes
+TOKEN_MOVE_NUMBER = "move_number"    # value: raw token, e.g. "12." or "12..."
+TOKEN_NAG = "nag"                    # value: int, e.g. 1 for $1 or "!"
+TOKEN_COMMENT = "comment"            # value: comment text without delimiters
+TOKEN_VARIATION_START = "variation_start"
+TOKEN_VARIATION_END = "variation_end"
+TOKEN_RESULT = "result"              # value: "1-0", "0-1", "1/2-1/2" or "*"
+TOKEN_GAME_END = "game_end"          # value: None
+
+PGN_RESULTS = frozenset(["1-0", "0-1", "1/2-1/2", "*"])
+
+# Suffix annotations mapped to their standard NAG values
+SUFFIX_NAGS = {"!": 1, "?": 2, "!!": 3, "??": 4, "!?": 5, "?!": 6}
+
+_MOVE_SUFFIX_CHARS = "+#!?"
+_SPECIAL_CHARS = frozenset("{}();")
+_SPECIAL_SPLIT = re.compile(r'([{}();])')
+_TAG_LINE = re.compile(r'\[\s*(\w+)\s*"((?:[^"\\]|\\.)*)"\s*\]')
+
+
+def _classify_word(word: str, tokens: list) -> bool:
+    """
+    Append the token(s) for a whitespace-free movetext word.
+    Returns True if the word was a game result.
+    """
+    first = word[0]
+    if first >= "A":
+        # Most common case: a SAN move starting with a piece letter, file or "O"
+        san = word.rstrip(_MOVE_SUFFIX_CHARS)
+        if len(san) == len(word):
+            tokens.append((TOKEN_MOVE, word))
+            return False
+    elif first.isdigit():
+        if word in PGN_RESULTS:
+            tokens.append((TOKEN_RESULT, word))
+            return True
+        rest = word.lstrip("0123456789")
+        if rest[:1] == ".":
+            # Move number, possibly glued to the move ("12.e4", "12...Nf6")
+            san = rest.lstrip(".")
+            if not san:
+                tokens.append((TOKEN_MOVE_NUMBER, word))
+                return False
+            tokens.append((TOKEN_MOVE_NUMBER, word[:len(word) - len(san)]))
+            word = san
+        san = word.rstrip(_MOVE_SUFFIX_CHARS)
+    elif first == "$":
+        if word[1:].isdigit():
+            tokens.append((TOKEN_NAG, int(word[1:])))
+        return False
+    elif first == "*":
+        tokens.append((TOKEN_RESULT, "*"))
+        return True
+    else:
+        san = word.rstrip(_MOVE_SUFFIX_CHARS)
+
+    if san:
+        tokens.append((TOKEN_MOVE, san))
+        suffix = word[len(san):].lstrip("+#")
+    else:
+        suffix = word
+    if suffix in SUFFIX_NAGS:
+        tokens.append((TOKEN_NAG, SUFFIX_NAGS[suffix]))
+    return False
+
+
+def tokenize_pgn(lines: Iterable[str]) -> Iterator[Tuple[str, object]]:
+    """
+    Single-pass PGN tokenizer.
+
+    Handles tag pairs, move numbers, SAN moves, NAGs and suffix annotations,
+    brace and rest-of-line comments, nested variations and "%" escape lines.
+    Emits TOKEN_GAME_END after each game's result, or when a game without a
+    result is terminated by a blank line, a new tag section or end of input.
+    Each line is split once on the delimiter characters; the text between
+    delimiters is tokenized with str.split().
+    """
+    comment_parts: Optional[List[str]] = None  # Open brace comment, possibly spanning lines
+    depth = 0                                  # Variation nesting depth
+    in_movetext = False                        # Movetext seen since the last game end
+    tokens: List[Tuple[str, object]] = []
+
+    for raw_line in lines:
+        line = raw_line.rstrip("\r\n")
+
+        if comment_parts is not None:
+            close = line.find("}")
+            if close < 0:
+                comment_parts.append(line)
+                continue
+            comment_parts.append(line[:close])
+            yield (TOKEN_COMMENT, "\n".join(comment_parts))
+            comment_parts = None
+            line = line[close + 1:]
+            if not line.strip():
+                continue  # The comment ended the line, which is not a blank line
+        elif line[:1] == "%":
+            continue  # Escape line
+
+        stripped = line.strip()
+        if not stripped:
+            if in_movetext and depth == 0:
+                yield (TOKEN_GAME_END, None)
+                in_movetext = False
+            continue
+
+        if stripped[0] == "[" and depth == 0:
+            if in_movetext:
+                yield (TOKEN_GAME_END, None)
+                in_movetext = False
+            tag_match = _TAG_LINE.match(stripped)
+            if tag_match:
+                name, value = tag_match.groups()
+                if "\\" in value:
+                    value = value.replace('\\"', '"').replace("\\\\", "\\")
+                yield (TOKEN_TAG, (name, value))
+            continue
+
+        in_movetext = True
+        ended = False
+
+        if _SPECIAL_CHARS.isdisjoint(stripped):
+            pieces = (stripped,)
         else:
-            lines.append(self.result)
-
-        return "\n".join(lines)
+            pieces = _SPECIAL_SPLIT.split(stripped)
 
-    def _wrap_text(self, text: str, width: int) -> List[str]:
-        """Wrap text to specified width while preserving move structure"""
-        words = text.split()
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if len(current_line + word) + 1 <= width:
-                if current_line:
-                    current_line += " " + word
+        for index, piece in enumerate(pieces):
+            if comment_parts is not None:
+                if piece == "}":
+                    tokens.append((TOKEN_COMMENT, "".join(comment_parts)))
+                    comment_parts = None
                 else:
-                    current_line = word
+                    comment_parts.append(piece)
+            elif len(piece) == 1 and piece in _SPECIAL_CHARS:
+                if piece == "{":
+                    comment_parts = []
+                elif piece == "(":
+                    depth += 1
+                    tokens.append((TOKEN_VARIATION_START, None))
+                elif piece == ")":
+                    if depth > 0:
+                        depth -= 1
+                        tokens.append((TOKEN_VARIATION_END, None))
+                elif piece == ";":
+                    tokens.append((TOKEN_COMMENT, "".join(pieces[index + 1:]).strip()))
+                    break
+                # A stray "}" is ignored
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
+                for word in piece.split():
+                    # Inline the two most common cases: plain SAN moves and move numbers
+                    if word[0] >= "A" and len(word.rstrip(_MOVE_SUFFIX_CHARS)) == len(word):
+                        tokens.append((TOKEN_MOVE, word))
+                    elif word[-1] == "." and word[0].isdigit() and word.rstrip(".").isdigit():
+                        tokens.append((TOKEN_MOVE_NUMBER, word))
+                    elif _classify_word(word, tokens) and depth == 0:
+                        ended = True
+                        break
+                if ended:
+                    break
+
+        if comment_parts is not None and len(comment_parts) > 1:
+            comment_parts = ["".join(comment_parts)]  # Comment continues on the next line
+        if tokens:
+            yield from tokens
+            tokens.clear()
+        if ended:
+            # Anything after the result on this line belongs to no game
+            comment_parts = None
+            yield (TOKEN_GAME_END, None)
+            in_movetext = False
+
+    if comment_parts is not None:
+        yield (TOKEN_COMMENT, "\n".join(comment_parts))
+    if in_movetext:
+        yield (TOKEN_GAME_END, None)
 
-        return lines
 
 class PGNParser:
     """Parser for PGN format chess games"""
@@ -95,92 +332,81 @@ class PGNParser:
     @staticmethod
     def parse_pgn(pgn_text: str) -> List[PGNGame]:
         """Parse PGN text and return list of games"""
-        games = []
-        lines = pgn_text.strip().split('\n')
+        return list(PGNParser.iter_pgn(pgn_text.splitlines()))
 
+    @staticmethod
+    def iter_pgn(lines: Iterable[str]) -> Iterator[PGNGame]:
+        """Parse PGN lines lazily, yielding each game as soon as it is complete"""
         current_game = None
-        in_moves = False
-        move_text = ""
-
-        for line in lines:
-            line = line.strip()
-
-            if not line:
-                if in_moves and move_text.strip():
-                    # End of current game
-                    moves, result = PGNParser._parse_moves(move_text)
-                    if current_game:
-                        current_game.moves = moves
-                        current_game.result = result
-                        games.append(current_game)
-
-                    current_game = None
-                    in_moves = False
-                    move_text = ""
-                continue
-
-            if line.startswith('[') and line.endswith(']'):
-                # Tag line
-                if not current_game:
+        depth = 0
+
+        for kind, value in tokenize_pgn(lines):
+            if kind == TOKEN_MOVE:
+                if depth == 0:
+                    if current_game is None:
+                        current_game = PGNGame()
+                    current_game.moves.append(value)
+            elif kind == TOKEN_TAG:
+                if current_game is None:
                     current_game = PGNGame()
-                    in_moves = False
-
-                tag_match = re.match(r'\[(\w+)\s+"(.*)"\]', line)
-                if tag_match:
-                    key, value = tag_match.groups()
-                    current_game.set_tag(key, value)
-            else:
-                # Move line
-                if not current_game:
+                current_game.set_tag(value[0], value[1])
+            elif kind == TOKEN_VARIATION_START:
+                depth += 1
+            elif kind == TOKEN_VARIATION_END:
+                depth -= 1
+            elif kind == TOKEN_RESULT:
+                if current_game is None:
                     current_game = PGNGame()
-                in_moves = True
-                move_text += " " + line
-
-        # Handle last game if file doesn't end with empty line
-        if current_game and (in_moves and move_text.strip()):
-            moves, result = PGNParser._parse_moves(move_text)
-            current_game.moves = moves
-            current_game.result = result
-            games.append(current_game)
-
-        return games
+                current_game.result = value
+            elif kind == TOKEN_GAME_END:
+                if current_game is not None:
+                    yield current_game
+                current_game = None
+                depth = 0
 
     @staticmethod
     def _parse_moves(move_text: str) -> Tuple[List[str], str]:
-        """Parse move text and extract moves and result"""
-        # Remove comments and variations (simplified)
-        text = re.sub(r'\{[^}]*\}', '', move_text)  # Remove comments
-        text = re.sub(r'\([^)]*\)', '', text)        # Remove variations
-
-        # Split into tokens
-        tokens = text.split()
+        """Parse move text and extract mainline moves and result"""
         moves = []
         result = "*"
+        depth = 0
+
+        for kind, value in tokenize_pgn([move_text]):
+            if kind == TOKEN_MOVE and depth == 0:
+                moves.append(value)
+            elif kind == TOKEN_VARIATION_START:
+                depth += 1
+            elif kind == TOKEN_VARIATION_END:
+                depth -= 1
+            elif kind == TOKEN_RESULT:
+                result = value
+                break
 
-        for token in tokens:
-            token = token.strip()
-            if not token:
-                continue
+        return moves, result
 
-            # Check for result
-            if token in ["1-0", "0-1", "1/2-1/2", "*"]:
-                result = token
-                break
+def open_pgn(filename: str) -> TextIO:
+    """Open a PGN file for buffered text reading, decompressing gzip/bzip2/xz transparently"""
+    with open(filename, 'rb') as f:
+        magic = f.read(6)
 
-            # Skip move numbers
-            if re.match(r'\d+\.', token):
-                continue
+    for prefix, opener in COMPRESSION_MAGIC:
+        if magic.startswith(prefix):
+            binary = opener(filename, 'rb')
+            break
+    else:
+        binary = open(filename, 'rb', buffering=PGNConfig.READ_BUFFER_SIZE)
 
-            # Skip ellipsis for black moves
-            if token == "...":
-                continue
+    return io.TextIOWrapper(binary, encoding='utf-8', errors='replace')
 
-            # Clean up move notation
-            move = re.sub(r'[?!+#]+$', '', token)  # Remove annotation symbols
-            if move and not re.match(r'\d+\.', move):
-                moves.append(move)
 
-        return moves, result
+def iter_games(filename: str) -> Iterator[PGNGame]:
+    """
+    Stream games from a PGN file one at a time.
+    Only the game currently being parsed is held in memory.
+    """
+    with open_pgn(filename) as f:
+        yield from PGNParser.iter_pgn(f)
+
 
 class PGNManager:
     """High-level PGN management for chess board integration"""
@@ -189,9 +415,7 @@ class PGNManager:
     def load_pgn_file(filename: str) -> List[PGNGame]:
         """Load PGN games from file"""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return PGNParser.parse_pgn(content)
+            return list(iter_games(filename))
         except Exception as e:
             raise Exception(f"Failed to load PGN file: {e}")
 
@@ -202,9 +426,8 @@ class PGNManager:
             with open(filename, 'w', encoding='utf-8') as f:
                 for i, game in enumerate(games):
                     if i > 0:
-                        f.write("\n\n")  # Separate games with blank lines
-                    f.write(game.to_pgn())
-                f.write("\n")  # End with newline
+                        f.write("\n")  # Separate games with blank lines
+                    game.write_pgn(f)
         except Exception as e:
             raise Exception(f"Failed to save PGN file: {e}")
 
@@ -229,7 +452,7 @@ class PGNManager:
 
         # Determine result
         if board_state.is_in_checkmate:
-            if board_state.current_turn == Color.WHITE:
+            if board_state.board.turn == chess.WHITE:
                 game.result = "0-1"  # Black wins
             else:
                 game.result = "1-0"  # White wins
@@ -244,238 +467,31 @@ class PGNManager:
 
     @staticmethod
     def _convert_moves_to_algebraic(board_state: BoardState) -> List[str]:
-        """Convert internal move history to algebraic notation"""
+        """Convert internal move history to standard algebraic notation"""
+        board = chess.Board()
         moves = []
-
-        # This is a simplified conversion - full algebraic notation
-        # would require reconstructing the game state at each move
         for move in board_state.move_history:
-            from_row, from_col, to_row, to_col = move[:4]
-
-            # Convert coordinates to algebraic
-            from_square = chr(ord('a') + from_col) + str(8 - from_row)
-            to_square = chr(ord('a') + to_col) + str(8 - to_row)
-
-            # Simple format for now - could be enhanced with proper algebraic notation
-            algebraic_move = f"{from_square}{to_square}"
-
-            # Add promotion if present
-            if len(move) > 4:
-                promotion_piece = move[4]
-                if promotion_piece:
-                    piece_symbols = {
-                        PieceType.QUEEN: 'Q',
-                        PieceType.ROOK: 'R',
-                        PieceType.BISHOP: 'B',
-                        PieceType.KNIGHT: 'N'
-                    }
-                    if promotion_piece in piece_symbols:
-                        algebraic_move += f"={piece_symbols[promotion_piece]}"
-
-            moves.append(algebraic_move)
-
+            moves.append(board.san(move))
+            board.push(move)
         return moves
 
     @staticmethod
     def apply_pgn_game_to_board(board_state: BoardState, game: PGNGame) -> bool:
         """Apply a PGN game's moves to the board state"""
         try:
-            # Reset board to starting position
-            board_state.reset_to_initial_position()
-
-            # Apply each move
-            for move_str in game.moves:
-                if not PGNManager._apply_algebraic_move(board_state, move_str):
-                    return False
-
+            board_state.load_moves(replay_san(game.moves))
             return True
-        except Exception:
+        except ValueError:
             return False
 
     @staticmethod
     def _apply_algebraic_move(board_state: BoardState, move_str: str) -> bool:
-        """Apply a single algebraic move to the board"""
+        """Apply a single algebraic (SAN or coordinate) move to the board"""
         try:
-            # Clean the move string
-            move = move_str.strip()
-            if not move:
-                return False
-
-            # Handle castling
-            if move in ["O-O", "0-0"]:  # Kingside castling
-                return PGNManager._apply_castling(board_state, True)
-            elif move in ["O-O-O", "0-0-0"]:  # Queenside castling
-                return PGNManager._apply_castling(board_state, False)
-
-            # Handle coordinate notation (e.g., e2e4, a7a8Q)
-            if len(move) >= 4 and move[0].islower() and move[1].isdigit() and move[2].islower() and move[3].isdigit():
-                return PGNManager._apply_coordinate_move(board_state, move)
-
-            # Handle standard algebraic notation (e.g., e4, Nf3, Qxd5+)
-            return PGNManager._apply_standard_algebraic_move(board_state, move)
-
-        except Exception:
-            return False
-
-    @staticmethod
-    def _apply_coordinate_move(board_state: BoardState, move_str: str) -> bool:
-        """Apply coordinate notation move (e.g., e2e4, a7a8Q)"""
-        try:
-            from_square = move_str[:2]
-            to_square = move_str[2:4]
-
-            from_col = ord(from_square[0]) - ord('a')
-            from_row = 8 - int(from_square[1])
-            to_col = ord(to_square[0]) - ord('a')
-            to_row = 8 - int(to_square[1])
-
-            # Check for promotion
-            promotion_piece = None
-            if len(move_str) > 4 and move_str[4] == '=':
-                promotion_char = move_str[5].upper()
-                promotion_map = {
-                    'Q': PieceType.QUEEN,
-                    'R': PieceType.ROOK,
-                    'B': PieceType.BISHOP,
-                    'N': PieceType.KNIGHT
-                }
-                promotion_piece = promotion_map.get(promotion_char)
-
-            # Apply the move
-            if promotion_piece:
-                return board_state.make_move_with_promotion(
-                    from_row, from_col, to_row, to_col, promotion_piece
-                )
-            else:
-                return board_state.make_move(from_row, from_col, to_row, to_col)
-
-        except (ValueError, IndexError):
-            return False
-
-    @staticmethod
-    def _apply_standard_algebraic_move(board_state: BoardState, move_str: str) -> bool:
-        """Apply standard algebraic notation move (e.g., e4, Nf3, Qxd5+)"""
-        move = move_str.strip()
-
-        # Remove check/checkmate indicators
-        move = re.sub(r'[+#]$', '', move)
-
-        # Parse promotion
-        promotion_piece = None
-        promotion_match = re.search(r'=([QRBN])$', move)
-        if promotion_match:
-            promotion_char = promotion_match.group(1)
-            promotion_map = {
-                'Q': PieceType.QUEEN,
-                'R': PieceType.ROOK,
-                'B': PieceType.BISHOP,
-                'N': PieceType.KNIGHT
-            }
-            promotion_piece = promotion_map.get(promotion_char)
-            move = re.sub(r'=[QRBN]$', '', move)
-
-        # Determine piece type
-        piece_type = PieceType.PAWN  # Default to pawn
-        piece_char = move[0] if move[0].isupper() else None
-
-        if piece_char:
-            piece_map = {
-                'K': PieceType.KING,
-                'Q': PieceType.QUEEN,
-                'R': PieceType.ROOK,
-                'B': PieceType.BISHOP,
-                'N': PieceType.KNIGHT
-            }
-            piece_type = piece_map.get(piece_char, PieceType.PAWN)
-            move = move[1:]  # Remove piece character
-
-        # Parse capture indicator
-        is_capture = 'x' in move
-        if is_capture:
-            move = move.replace('x', '')
-
-        # Extract destination square
-        dest_match = re.search(r'([a-h][1-8])$', move)
-        if not dest_match:
-            return False
-
-        dest_square = dest_match.group(1)
-        to_col = ord(dest_square[0]) - ord('a')
-        to_row = 8 - int(dest_square[1])
-
-        # Remove destination from move string
-        move = move[:dest_match.start()]
-
-        # Find the piece that can make this move
-        current_turn = board_state.current_turn
-        possible_pieces = []
-
-        for row in range(8):
-            for col in range(8):
-                piece = board_state.get_piece(row, col)
-                if piece and piece.color == current_turn and piece.type == piece_type:
-                    # Check if this piece can move to the destination
-                    legal_moves = board_state.get_possible_moves(row, col)
-                    if (to_row, to_col) in legal_moves:
-                        possible_pieces.append((row, col))
-
-        if not possible_pieces:
-            return False
-
-        # If multiple pieces can make the move, use disambiguation
-        if len(possible_pieces) > 1:
-            # Parse disambiguation (file, rank, or both)
-            from_piece = None
-
-            if move:
-                if move.isdigit():  # Rank disambiguation (e.g., "R1e4")
-                    from_rank = 8 - int(move)
-                    from_piece = next((p for p in possible_pieces if p[0] == from_rank), None)
-                elif move.isalpha() and len(move) == 1:  # File disambiguation (e.g., "Rae4")
-                    from_file = ord(move) - ord('a')
-                    from_piece = next((p for p in possible_pieces if p[1] == from_file), None)
-                elif len(move) == 2:  # Full square disambiguation (e.g., "Ra1e4")
-                    from_file = ord(move[0]) - ord('a')
-                    from_rank = 8 - int(move[1])
-                    from_piece = next((p for p in possible_pieces if p[0] == from_rank and p[1] == from_file), None)
-
-            if from_piece:
-                possible_pieces = [from_piece]
-            else:
-                # If we can't disambiguate, just use the first one
-                possible_pieces = possible_pieces[:1]
-
-        if len(possible_pieces) != 1:
+            move = resolve_san(board_state.board, move_str)
+        except ValueError:
             return False
 
-        from_row, from_col = possible_pieces[0]
-
-        # Apply the move
-        if promotion_piece:
-            return board_state.make_move_with_promotion(
-                from_row, from_col, to_row, to_col, promotion_piece
-            )
-        else:
-            return board_state.make_move(from_row, from_col, to_row, to_col)
-
-    @staticmethod
-    def _apply_castling(board_state: BoardState, kingside: bool) -> bool:
-        """Apply castling move"""
-        current_turn = board_state.current_turn
-
-        if current_turn == Color.WHITE:
-            king_row = 7
-            if kingside:
-                # White kingside castling: e1g1
-                return board_state.make_move(7, 4, 7, 6)
-            else:
-                # White queenside castling: e1c1
-                return board_state.make_move(7, 4, 7, 2)
-        else:
-            king_row = 0
-            if kingside:
-                # Black kingside castling: e8g8
-                return board_state.make_move(0, 4, 0, 6)
-            else:
-                # Black queenside castling: e8c8
-                return board_state.make_move(0, 4, 0, 2)
\ No newline at end of file
+        if move.promotion:
+            return board_state.make_move_with_promotion(move.from_square, move.to_square, move.promotion)
+        return board_state.make_move(move.from_square, move.to_square)
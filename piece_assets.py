@@ -0,0 +1,153 @@
+"""
+Piece Asset Module
+
+This module provides the piece images at the size the board is drawn at.
+
+The same piece set ships at several resolutions (pngs/128h up to pngs/1024h,
+plus pngs/1x and pngs/2x). Each piece is scaled down from the smallest source
+that is at least as large as the target, which keeps decoding and smoothscale
+cheap without losing sharpness. The scaled images are cached on disk as raw
+RGBA pixels, one file per square size, so later launches at the same window
+size neither decode PNGs nor scale anything. Once a video mode is set, images
+are converted to the display's pixel format (convert_alpha) for fast blits.
+"""
+
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+import chess
+import pygame
+from config import GameConstants
+
+# Source resolutions, smallest first: (subdirectory, height of the tallest piece, file name)
+# File names are formatted with color ("w"/"b"), name ("knight") and symbol ("N")
+PIECE_SOURCES = [
+    ("128h", 128, "{color}_{name}_png_128px.png"),
+    ("256h", 256, "{color}_{name}_png_256px.png"),
+    ("1x", 389, "{color}_{name}_1x_ns.png"),
+    ("512h", 512, "{color}_{name}_png_512px.png"),
+    ("2x", 777, "{color}{symbol}.png"),
+    ("1024h", 1024, "{color}_{name}_png_1024px.png"),
+]
+
+# Cache file layout: magic, header length, JSON header, then the RGBA pixels of each image
+_CACHE_MAGIC = b"blundex-pieces v1\n"
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def piece_image_key(color: bool, piece_type: int) -> str:
+    """Get the image key of a piece, e.g. "w1" for a white pawn or "b6" for a black king"""
+    return f"{'w' if color == chess.WHITE else 'b'}{piece_type}"
+
+
+def piece_image_size(square_size: int, piece_type: int) -> int:
+    """Get the drawn size of a piece (pawns are drawn smaller than the other pieces)"""
+    factor = GameConstants.PAWN_SIZE_FACTOR if piece_type == chess.PAWN else GameConstants.PIECE_SIZE_FACTOR
+    return int(square_size * factor)
+
+
+def find_piece_source(color: bool, piece_type: int, size: int,
+                      directory: str = GameConstants.PIECE_IMAGE_DIRECTORY) -> Optional[str]:
+    """
+    Get the path of the smallest source image of a piece that is at least size pixels tall,
+    or of the largest one if none is. Returns None if no resolution has the piece.
+    """
+    best = None
+    for subdirectory, height, file_name in PIECE_SOURCES:
+        path = os.path.join(directory, subdirectory, file_name.format(
+            color="w" if color == chess.WHITE else "b",
+            name=chess.piece_name(piece_type),
+            symbol=chess.piece_symbol(piece_type).upper()))
+        if os.path.exists(path):
+            best = path
+            if height >= size:
+                break
+    return best
+
+
+def _source_signature(sources: Dict[str, str]) -> List:
+    """Identify the source files, so the cache is rebuilt when one of them changes"""
+    return [[key, path, os.stat(path).st_mtime_ns] for key, path in sorted(sources.items())]
+
+
+def _read_cache(path: str, signature: List) -> Optional[Dict[str, pygame.Surface]]:
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(_CACHE_MAGIC)) != _CACHE_MAGIC:
+                return None
+            header_length, = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+            header = json.loads(f.read(header_length))
+            if header["sources"] != signature:
+                return None
+
+            images = {}
+            for key, width, height in header["images"]:
+                pixels = f.read(width * height * 4)
+                images[key] = pygame.image.frombytes(pixels, (width, height), "RGBA")
+            return images
+    except (OSError, ValueError, KeyError, struct.error):
+        # Missing, truncated or foreign cache files are rebuilt
+        return None
+
+
+def _write_cache(path: str, signature: List, images: Dict[str, pygame.Surface]) -> None:
+    header = json.dumps({
+        "sources": signature,
+        "images": [[key, *image.get_size()] for key, image in images.items()],
+    }).encode('utf-8')
+
+    # Write to a temporary file first, so a crash never leaves a torn cache behind
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_CACHE_MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for image in images.values():
+            f.write(pygame.image.tobytes(image, "RGBA"))
+    os.replace(temp_path, path)
+
+
+def load_piece_images(square_size: int, directory: str = GameConstants.PIECE_IMAGE_DIRECTORY,
+                      cache_directory: Optional[str] = GameConstants.PIECE_CACHE_DIRECTORY) -> Dict[str, pygame.Surface]:
+    """
+    Get every piece image scaled for the given square size, keyed by piece_image_key.
+    Pieces without any readable source image are left out.
+    Pass cache_directory=None to always load and scale the source images.
+    """
+    sources = {}
+    sizes: Dict[str, Tuple[int, int]] = {}
+    for color in [chess.WHITE, chess.BLACK]:
+        for piece_type in chess.PIECE_TYPES:
+            key = piece_image_key(color, piece_type)
+            size = piece_image_size(square_size, piece_type)
+            path = find_piece_source(color, piece_type, size, directory)
+            if path is not None:
+                sources[key] = path
+                sizes[key] = (size, size)
+
+    cache_path = None
+    images = None
+    if cache_directory is not None:
+        cache_path = os.path.join(cache_directory, f"pieces_{square_size}.bin")
+        signature = _source_signature(sources)
+        images = _read_cache(cache_path, signature)
+
+    if images is None:
+        images = {}
+        for key, path in sources.items():
+            try:
+                images[key] = pygame.transform.smoothscale(pygame.image.load(path), sizes[key])
+            except pygame.error as e:
+                print(f"Warning: Could not load {path}: {e}")
+        if cache_path is not None:
+            try:
+                _write_cache(cache_path, signature, images)
+            except OSError as e:
+                print(f"Warning: Could not cache piece images: {e}")
+
+    # Blits are much faster once the images match the screen's pixel format
+    if pygame.display.get_surface() is not None:
+        images = {key: image.convert_alpha() for key, image in images.items()}
+    return images
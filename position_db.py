@@ -0,0 +1,255 @@
+"""
+Position Database Module
+
+This module maps positions to the games that reach them, across a whole PGN
+collection, in a local SQLite file.
+
+Positions are keyed by their polyglot Zobrist hash (chess.polyglot.zobrist_hash,
+stored as a signed 64-bit integer). For every position the database keeps the
+(game id, ply) pairs that reach it and aggregate White win / draw / Black win
+counts, so "how often has this position occurred and how did it go" is a
+single primary-key lookup.
+
+Hashes are updated incrementally while replaying a game, which is much cheaper
+than hashing every position from scratch.
+"""
+
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import chess
+import chess.polyglot
+from pgn_manager import PGNGame, iter_games
+from san_resolver import resolve_san
+from config import DatabaseConfig
+
+_ZOBRIST = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_HASHER = chess.polyglot.ZobristHasher(_ZOBRIST)
+_TURN_KEY = _ZOBRIST[780]
+
+# Result -> (white win, draw, black win) increments
+_RESULT_COUNTS = {
+    "1-0": (1, 0, 0),
+    "1/2-1/2": (0, 1, 0),
+    "0-1": (0, 0, 1),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    white TEXT, black TEXT, result TEXT, date TEXT, event TEXT
+);
+CREATE TABLE IF NOT EXISTS positions (
+    hash INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    ply INTEGER NOT NULL,
+    PRIMARY KEY (hash, game_id, ply)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS position_stats (
+    hash INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL,
+    white_wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    black_wins INTEGER NOT NULL
+);
+"""
+
+
+class PositionStats(NamedTuple):
+    """How often a position occurred and how those games ended"""
+    games: int
+    white_wins: int
+    draws: int
+    black_wins: int
+
+
+def to_signed(zobrist_hash: int) -> int:
+    """Convert an unsigned 64-bit hash to the signed range SQLite can store"""
+    return zobrist_hash - (1 << 64) if zobrist_hash >= 1 << 63 else zobrist_hash
+
+
+def _piece_key(piece_type: int, color: bool, square: chess.Square) -> int:
+    return _ZOBRIST[64 * ((piece_type - 1) * 2 + color) + square]
+
+
+class ZobristTracker:
+    """
+    Keeps the Zobrist hash of a board up to date as moves are pushed.
+    hash() equals chess.polyglot.zobrist_hash(board) at every point.
+    """
+
+    def __init__(self, board: Optional[chess.Board] = None):
+        self.board = chess.Board() if board is None else board.copy(stack=False)
+        self.piece_hash = _HASHER.hash_board(self.board)
+        self.castling_hashes: Dict[int, int] = {}
+
+    def hash(self) -> int:
+        """Get the Zobrist hash of the current position"""
+        board = self.board
+        rights = board.castling_rights
+        castling = self.castling_hashes.get(rights)
+        if castling is None:
+            castling = self.castling_hashes[rights] = _HASHER.hash_castling(board)
+        zobrist_hash = self.piece_hash ^ castling
+        if board.ep_square is not None:
+            zobrist_hash ^= _HASHER.hash_ep_square(board)
+        if board.turn == chess.WHITE:
+            zobrist_hash ^= _TURN_KEY
+        return zobrist_hash
+
+    def push(self, move: chess.Move) -> None:
+        """Push a legal move, updating only the piece keys that change"""
+        board = self.board
+        color = board.turn
+        from_square, to_square = move.from_square, move.to_square
+        piece_type = board.piece_type_at(from_square)
+
+        piece_hash = self.piece_hash
+        piece_hash ^= _piece_key(piece_type, color, from_square)
+        piece_hash ^= _piece_key(move.promotion or piece_type, color, to_square)
+
+        captured = board.piece_type_at(to_square)
+        if captured:
+            piece_hash ^= _piece_key(captured, not color, to_square)
+        elif piece_type == chess.PAWN and to_square == board.ep_square:
+            captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+            piece_hash ^= _piece_key(chess.PAWN, not color, captured_square)
+        elif piece_type == chess.KING and abs(to_square - from_square) == 2:
+            if to_square > from_square:
+                rook_from, rook_to = from_square + 3, from_square + 1
+            else:
+                rook_from, rook_to = from_square - 4, from_square - 1
+            piece_hash ^= _piece_key(chess.ROOK, color, rook_from) ^ _piece_key(chess.ROOK, color, rook_to)
+
+        self.piece_hash = piece_hash
+        board.push(move)
+
+
+def iter_position_hashes(moves: Iterable[chess.Move], board: Optional[chess.Board] = None) -> Iterator[int]:
+    """Yield the Zobrist hash of the starting position and after each move"""
+    tracker = ZobristTracker(board)
+    yield tracker.hash()
+    for move in moves:
+        tracker.push(move)
+        yield tracker.hash()
+
+
+def san_position_hashes(sans: Iterable[str]) -> List[int]:
+    """
+    Resolve SAN moves from the standard position and hash every position in
+    the same replay. Raises ValueError on an illegal move.
+    """
+    tracker = ZobristTracker()
+    hashes = [tracker.hash()]
+    for san in sans:
+        tracker.push(resolve_san(tracker.board, san))
+        hashes.append(tracker.hash())
+    return hashes
+
+
+class PositionDatabase:
+    """SQLite index from position hash to (game id, ply) pairs and W/D/L counts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'PositionDatabase':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_games(self, games: Iterable[Tuple[Dict[str, str], str, List[chess.Move]]]) -> int:
+        """Add (tags, result, moves) games in one transaction. Returns the number added"""
+        return self._add_hashed_games((tags, result, list(iter_position_hashes(moves)))
+                                      for tags, result, moves in games)
+
+    def _add_hashed_games(self, games: Iterable[Tuple[Dict[str, str], str, List[int]]]) -> int:
+        """
+        Add (tags, result, position hashes) games in one transaction.
+        Every position of a game is counted once in the W/D/L statistics,
+        even if the game repeats it.
+        """
+        positions = []
+        stats = defaultdict(lambda: [0, 0, 0, 0])
+        added = 0
+
+        with self.connection:
+            cursor = self.connection.cursor()
+            for tags, result, hashes in games:
+                cursor.execute("INSERT INTO games (white, black, result, date, event) VALUES (?, ?, ?, ?, ?)",
+                               (tags.get("White", ""), tags.get("Black", ""), result,
+                                tags.get("Date", ""), tags.get("Event", "")))
+                game_id = cursor.lastrowid
+                white_win, draw, black_win = _RESULT_COUNTS.get(result, (0, 0, 0))
+
+                seen = set()
+                for ply, zobrist_hash in enumerate(hashes):
+                    zobrist_hash = to_signed(zobrist_hash)
+                    positions.append((zobrist_hash, game_id, ply))
+                    if zobrist_hash not in seen:
+                        seen.add(zobrist_hash)
+                        counts = stats[zobrist_hash]
+                        counts[0] += 1
+                        counts[1] += white_win
+                        counts[2] += draw
+                        counts[3] += black_win
+                added += 1
+
+            cursor.executemany("INSERT OR IGNORE INTO positions VALUES (?, ?, ?)", positions)
+            cursor.executemany(
+                "INSERT INTO position_stats VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET games = games + excluded.games, "
+                "white_wins = white_wins + excluded.white_wins, draws = draws + excluded.draws, "
+                "black_wins = black_wins + excluded.black_wins",
+                [(zobrist_hash, *counts) for zobrist_hash, counts in stats.items()])
+        return added
+
+    def ingest_games(self, games: Iterable[PGNGame],
+                     batch_size: int = DatabaseConfig.POSITION_DB_BATCH_SIZE) -> int:
+        """Add parsed PGN games in batches. Games with illegal moves are skipped"""
+        total = 0
+        batch = []
+        for game in games:
+            try:
+                batch.append((game.tags, game.result, san_position_hashes(game.moves)))
+            except ValueError:
+                continue
+            if len(batch) >= batch_size:
+                total += self._add_hashed_games(batch)
+                batch = []
+        if batch:
+            total += self._add_hashed_games(batch)
+        return total
+
+    def ingest_pgn(self, filename: str, batch_size: int = DatabaseConfig.POSITION_DB_BATCH_SIZE) -> int:
+        """Add every game of a PGN file (plain or compressed)"""
+        return self.ingest_games(iter_games(filename), batch_size)
+
+    def lookup(self, board: chess.Board) -> PositionStats:
+        """Get how many games reached a position and how they ended"""
+        row = self.connection.execute(
+            "SELECT games, white_wins, draws, black_wins FROM position_stats WHERE hash = ?",
+            (to_signed(chess.polyglot.zobrist_hash(board)),)).fetchone()
+        return PositionStats(*row) if row else PositionStats(0, 0, 0, 0)
+
+    def occurrences(self, board: chess.Board, limit: int = 100) -> List[Tuple[int, int]]:
+        """Get up to limit (game id, ply) pairs that reach a position"""
+        return self.connection.execute(
+            "SELECT game_id, ply FROM positions WHERE hash = ? ORDER BY game_id, ply LIMIT ?",
+            (to_signed(chess.polyglot.zobrist_hash(board)), limit)).fetchall()
+
+    def game_info(self, game_id: int) -> Optional[Dict[str, str]]:
+        """Get the stored headers of a game"""
+        row = self.connection.execute(
+            "SELECT white, black, result, date, event FROM games WHERE id = ?", (game_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("White", "Black", "Result", "Date", "Event"), row))
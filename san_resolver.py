@@ -0,0 +1,156 @@
+"""
+SAN Resolver Module
+
+This module resolves Standard Algebraic Notation (e.g. e4, Nbd7, exd6, R1e2,
+e8=Q, O-O) and coordinate notation (e.g. e2e4, e7e8q) to chess.Move objects.
+
+Moves are resolved directly against python-chess attacker and pawn masks, so
+only the few pieces that can actually reach the destination square are checked
+for legality instead of generating every legal move.
+"""
+
+import re
+from typing import Iterable, List, Optional
+import chess
+
+# Piece letter, disambiguation file/rank, capture, destination, promotion
+_SAN_PATTERN = re.compile(r"^([NBKRQ])?([a-h])?([1-8])?([\-x])?([a-h][1-8])(?:=?([NBRQnbrq]))?$")
+
+_PIECE_TYPES = {
+    "N": chess.KNIGHT,
+    "B": chess.BISHOP,
+    "R": chess.ROOK,
+    "Q": chess.QUEEN,
+    "K": chess.KING,
+}
+
+_CASTLING = {
+    "O-O": True, "0-0": True,        # Kingside
+    "O-O-O": False, "0-0-0": False,  # Queenside
+}
+
+
+def _resolve_castling(board: chess.Board, kingside: bool) -> chess.Move:
+    """Resolve a castling move for the side to move"""
+    king_square = board.king(board.turn)
+    if king_square is None:
+        raise ValueError("cannot castle without a king")
+    target_file = 6 if kingside else 2
+    move = chess.Move(king_square, chess.square(target_file, chess.square_rank(king_square)))
+    if not board.is_castling(move) or not board.is_legal(move):
+        raise ValueError(f"illegal castling in {board.fen()}")
+    return move
+
+
+def _pawn_sources(board: chess.Board, to_square: chess.Square, captures: bool = True, pushes: bool = True) -> int:
+    """Squares from which a pawn of the side to move could capture on or push to to_square"""
+    color = board.turn
+    pawns = board.pieces_mask(chess.PAWN, color)
+    to_mask = chess.BB_SQUARES[to_square]
+
+    # Captures (including en passant onto the ep square)
+    sources = 0
+    if captures and (board.occupied_co[not color] & to_mask or to_square == board.ep_square):
+        sources |= chess.BB_PAWN_ATTACKS[not color][to_square] & pawns
+
+    # Single and double pushes onto an empty square
+    if pushes and not board.occupied & to_mask:
+        step = -8 if color == chess.WHITE else 8
+        one_back = to_square + step
+        if 0 <= one_back < 64:
+            if pawns & chess.BB_SQUARES[one_back]:
+                sources |= chess.BB_SQUARES[one_back]
+            elif not board.occupied & chess.BB_SQUARES[one_back]:
+                double_rank = 3 if color == chess.WHITE else 4
+                if chess.square_rank(to_square) == double_rank:
+                    sources |= pawns & chess.BB_SQUARES[one_back + step]
+
+    return sources
+
+
+def resolve_san(board: chess.Board, san: str) -> chess.Move:
+    """
+    Resolve a SAN (or coordinate) move string for the side to move.
+    Raises ValueError if the move is illegal, ambiguous or cannot be parsed.
+    """
+    token = san.strip().rstrip("+#!?")
+
+    if token in _CASTLING:
+        return _resolve_castling(board, _CASTLING[token])
+
+    match = _SAN_PATTERN.match(token)
+    if match is None:
+        # Null moves, piece letters like "P" and other rare forms
+        return board.parse_san(san)
+
+    piece_letter, from_file, from_rank, separator, to_name, promotion_letter = match.groups()
+    to_square = chess.parse_square(to_name)
+    promotion = _PIECE_TYPES[promotion_letter.upper()] if promotion_letter else None
+    color = board.turn
+
+    # Coordinate notation: the origin square is given explicitly
+    if piece_letter is None and from_file and from_rank:
+        from_square = chess.parse_square(from_file + from_rank)
+        piece = board.piece_at(from_square)
+        if piece is not None and piece.color == color and piece.piece_type != chess.PAWN:
+            move = chess.Move(from_square, to_square, promotion)
+            if board.is_legal(move):
+                return move
+            raise ValueError(f"illegal move {san!r} in {board.fen()}")
+
+    if piece_letter is None:
+        if from_file and from_rank:
+            # Coordinate notation, e.g. e4d5: no capture marker needed
+            candidates = _pawn_sources(board, to_square)
+        elif separator == "x":
+            # SAN pawn captures always name the source file (exd5)
+            if not from_file:
+                raise ValueError(f"pawn capture without a source file: {san!r}")
+            candidates = _pawn_sources(board, to_square, pushes=False)
+        else:
+            candidates = _pawn_sources(board, to_square, captures=False)
+        last_rank = 7 if color == chess.WHITE else 0
+        if (chess.square_rank(to_square) == last_rank) != (promotion is not None):
+            raise ValueError(f"invalid promotion in {san!r}")
+        if promotion == chess.KING:
+            raise ValueError(f"cannot promote to a king: {san!r}")
+    else:
+        if promotion is not None:
+            raise ValueError(f"only pawns can promote: {san!r}")
+        piece_type = _PIECE_TYPES[piece_letter]
+        candidates = board.attackers_mask(color, to_square) & board.pieces_mask(piece_type, color)
+        if board.occupied_co[color] & chess.BB_SQUARES[to_square]:
+            candidates = 0
+
+    if from_file:
+        candidates &= chess.BB_FILES[chess.FILE_NAMES.index(from_file)]
+    if from_rank:
+        candidates &= chess.BB_RANKS[int(from_rank) - 1]
+
+    # Candidates are pseudo-legal by construction, so only king safety is left to check
+    resolved = None
+    for from_square in chess.scan_forward(candidates):
+        move = chess.Move(from_square, to_square, promotion)
+        if not board.is_into_check(move):
+            if resolved is not None:
+                raise ValueError(f"ambiguous move {san!r} in {board.fen()}")
+            resolved = move
+
+    if resolved is None:
+        raise ValueError(f"illegal move {san!r} in {board.fen()}")
+    return resolved
+
+
+def replay_san(moves: Iterable[str], board: Optional[chess.Board] = None) -> List[chess.Move]:
+    """
+    Resolve and push a sequence of SAN moves, returning the resolved moves.
+    Starts from the standard position unless a board is given.
+    """
+    if board is None:
+        board = chess.Board()
+    resolved = []
+    for san in moves:
+        move = resolve_san(board, san)
+        board.push(move)
+        resolved.append(move)
+    return resolved
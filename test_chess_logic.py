@@ -4,8 +4,15 @@ Tests all core functionality: moves, captures, special moves, game states
 """
 
 import chess
+import chess.polyglot
+import os
 import sys
+import tempfile
 from chess_board import BoardState, square_from_coords, coords_from_square
+from analysis import (PositionAnalysis, HELPERS, helpers_for_options, mask_to_squares, resolve_intermediates,
+                      move_review, FLAG_HANGS_PIECE)
+from analysis_cache import AnalysisCache
+from move_journal import MoveJournal
 
 def test_initial_position():
     """Test that initial position is set up correctly"""
@@ -466,6 +473,260 @@ def test_castling_rights():
 
     print("[PASS] Castling rights tracking working")
 
+def test_helper_registry():
+    """Test that registry helpers match the BoardState statistics and compute only what is needed"""
+    print("\nTesting helper registry...")
+    board = BoardState()
+
+    # Open position with pawn weaknesses and hanging pieces
+    for uci in ["e2e4", "d7d5", "e4d5", "g8f6", "f1b5", "c7c6", "d5c6", "b8c6", "g1f3", "e7e5"]:
+        board.board.push(chess.Move.from_uci(uci))
+
+    analysis = PositionAnalysis(board)
+    assert analysis.get("activity") == board.get_activity_scores()
+    assert analysis.get("development") == board.get_development_scores()
+    assert analysis.get("attacked") == board.get_attacked_scores()
+    assert analysis.get("hanging") == board.get_hanging_scores()
+    assert analysis.get("pawns") == board.get_pawn_counts()
+
+    white_stats, black_stats = board.get_pawn_statistics()
+    for i, key in enumerate(["backward", "isolated", "doubled", "passed"]):
+        assert analysis.get(key) == (white_stats[i], black_stats[i])
+
+    # Only the intermediates of the requested helpers are computed
+    analysis = PositionAnalysis(board)
+    analysis.run(["hanging"])
+    assert set(analysis.intermediates) == {"attack_maps", "hanging_masks"}
+
+    # Dependencies come before their dependents and appear once
+    order = resolve_intermediates(["backward", "hanging", "attacked"])
+    assert order.index("pawn_masks") < order.index("pawn_attack_maps")
+    assert order.index("attack_maps") < order.index("hanging_masks")
+    assert len(order) == len(set(order))
+
+    # Help options select helpers
+    assert helpers_for_options([]) == []
+    assert "pins" in helpers_for_options(["pins"])
+    assert "activity" not in helpers_for_options(["pawn_statistics"])
+
+    print("[PASS] Helper registry working")
+
+def test_statistic_highlights():
+    """Test that statistic highlights are computed with the counts and memoized per position"""
+    print("\nTesting statistic highlights...")
+    board = BoardState()
+    for uci in ["e2e4", "d7d5", "e4d5", "g8f6", "f1b5", "c7c6", "d5c6", "b8c6", "g1f3", "e7e5"]:
+        board.board.push(chess.Move.from_uci(uci))
+
+    analysis = PositionAnalysis(board)
+    for helper in HELPERS:
+        if helper.kind != "statistic":
+            continue
+        white_mask, black_mask = analysis.highlights(helper.key)
+        if helper.key != "doubled":
+            assert analysis.get(helper.key) == (chess.popcount(white_mask), chess.popcount(black_mask))
+
+    # Highlights are the pieces behind each count
+    white_developed, _ = analysis.highlights("development")
+    assert mask_to_squares(white_developed) == [chess.F3, chess.B5]
+    _, black_attacked = analysis.highlights("attacked")
+    assert black_attacked == chess.BB_C6 | chess.BB_E5
+    assert analysis.highlights("activity") is analysis.highlights("activity")
+
+    # Doubled pawns highlight every pawn on the file, while the count is the extra pawns
+    board = BoardState()
+    board.board.set_fen("4k3/8/8/8/4P3/4P3/P3P3/4K3 w - - 0 1")
+    analysis = PositionAnalysis(board)
+    assert analysis.get("doubled") == (2, 0)
+    assert analysis.highlights("doubled") == (chess.BB_E2 | chess.BB_E3 | chess.BB_E4, 0)
+
+    # Computing a count also memoizes its highlights
+    analysis = PositionAnalysis(board)
+    analysis.get("isolated")
+    assert "isolated" in analysis.highlight_masks
+
+    print("[PASS] Statistic highlights working")
+
+def test_exchange_masks():
+    """Test that exchange highlights are precomputed for every attacked piece without touching the board"""
+    print("\nTesting exchange masks...")
+    board = BoardState()
+    for uci in ["e2e4", "d7d5", "e4d5", "g8f6", "f1b5", "c7c6", "d5c6", "b8c6", "g1f3", "e7e5"]:
+        board.board.push(chess.Move.from_uci(uci))
+    fen = board.board.fen()
+
+    exchange_masks = PositionAnalysis(board).intermediate("exchange_masks")
+    assert set(exchange_masks) == set(board.get_tactically_interesting_squares())
+    assert board.board.fen() == fen
+    for square, mask in exchange_masks.items():
+        attackers, defenders = board.get_all_attackers_and_defenders(square)
+        assert set(mask_to_squares(mask)) == set(attackers + defenders + [square])
+
+    # The c6 knight: attacked by the b5 bishop and defended by the b7 pawn
+    assert exchange_masks[chess.C6] == chess.BB_C6 | chess.BB_B5 | chess.BB_B7
+
+    print("[PASS] Exchange masks working")
+
+def test_batch_analysis():
+    """Test that vectorised batch statistics match the per-position BoardState results"""
+    print("\nTesting batch analysis...")
+    try:
+        import batch_analysis
+    except ImportError:
+        print("[SKIP] NumPy not available")
+        return
+
+    # Collect positions along a game with captures, pins and pawn weaknesses
+    board = BoardState()
+    positions = [board.board.copy()]
+    for uci in ["e2e4", "d7d5", "e4d5", "g8f6", "f1b5", "c7c6", "d5c6", "b8c6",
+                "g1f3", "e7e5", "d2d4", "e5d4", "c1g5", "f8b4", "c2c3", "d4c3"]:
+        board.board.push(chess.Move.from_uci(uci))
+        positions.append(board.board.copy())
+
+    bitboards = batch_analysis.boards_to_array(positions)
+    hanging = batch_analysis.get_hanging_scores(bitboards)
+    attacked = batch_analysis.get_attacked_scores(bitboards)
+    pawn_counts = batch_analysis.get_pawn_counts(bitboards)
+    pawn_stats = batch_analysis.get_pawn_statistics(bitboards)
+    assert hanging.shape == (len(positions), 2)
+    assert pawn_stats.shape == (len(positions), 2, 4)
+
+    for i, position in enumerate(positions):
+        state = BoardState()
+        state.board = position
+        white_stats, black_stats = state.get_pawn_statistics()
+        assert tuple(hanging[i]) == state.get_hanging_scores()
+        assert tuple(attacked[i]) == state.get_attacked_scores()
+        assert tuple(pawn_counts[i]) == state.get_pawn_counts()
+        assert tuple(pawn_stats[i, 0]) == white_stats
+        assert tuple(pawn_stats[i, 1]) == black_stats
+
+    print("[PASS] Batch analysis matches scalar statistics")
+
+def test_analysis_cache():
+    """Test that persisted helper results are reused and evicted by size"""
+    print("\nTesting analysis cache...")
+    board = BoardState()
+    for uci in ["e2e4", "d7d5", "e4d5", "g8f6", "f1b5", "c7c6"]:
+        board.board.push(chess.Move.from_uci(uci))
+    key = chess.polyglot.zobrist_hash(board.board)
+    all_keys = [helper.key for helper in HELPERS]
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        with AnalysisCache(path, batch_size=100) as cache:
+            expected = PositionAnalysis(board, cache, key).run(all_keys)
+            # Buffered results are visible before they are flushed
+            assert cache.get(key)["pins"] == expected["pins"]
+
+        # A new session reuses every result without computing intermediates
+        with AnalysisCache(path) as cache:
+            analysis = PositionAnalysis(board, cache, key)
+            assert analysis.run(all_keys) == expected
+            assert analysis.intermediates == {}
+
+        # Move reviews are persisted with the position before the move
+        move = chess.Move.from_uci("d1g4")
+        after = BoardState()
+        after.board = board.board.copy()
+        after.board.push(move)
+        after_key = chess.polyglot.zobrist_hash(after.board)
+        with AnalysisCache(path) as cache:
+            review = move_review(PositionAnalysis(board, cache, key), PositionAnalysis(after, cache, after_key), move)
+            assert review == {FLAG_HANGS_PIECE: chess.BB_G4}
+
+        # A new session reviews the move without analysing the position after it
+        with AnalysisCache(path) as cache:
+            after_analysis = PositionAnalysis(after)
+            assert move_review(PositionAnalysis(board, cache, key), after_analysis, move) == review
+            assert after_analysis.intermediates == {}
+
+        # Results of another analysis version are never returned
+        with AnalysisCache(path, version=-1) as cache:
+            assert cache.get(key) == {}
+
+        # Past the size budget, least recently used positions are evicted
+        with AnalysisCache(path, max_bytes=64 * 1024, batch_size=50) as cache:
+            for i in range(2000):
+                cache.put(i, {"pawns": (i, i)})
+            cache.flush()
+            assert cache.size_bytes() <= 64 * 1024
+            assert cache.get(1999) == {"pawns": (1999, 1999)}
+            assert cache.get(0) == {}
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    print("[PASS] Analysis cache working")
+
+def test_move_journal():
+    """Test that the autosave journal rebuilds moves and undo/redo after a restart"""
+    print("\nTesting move journal...")
+
+    fd, path = tempfile.mkstemp(suffix=".journal")
+    os.close(fd)
+    os.remove(path)
+    try:
+        journal = MoveJournal(path, sync_every=2)
+        board = BoardState()
+        journal.restore(board)
+        board.make_move(chess.E2, chess.E4)
+        board.make_move(chess.E7, chess.E5)
+        board.make_move(chess.G1, chess.F3)
+        board.undo_move()
+        board.undo_move()
+        board.redo_move()
+        assert journal.pending == 0  # Six records, synced in batches of two
+        journal.close()
+
+        # A crash mid-write leaves a torn record, which is dropped
+        with open(path, 'ab') as f:
+            f.write(b"m b8c")
+
+        journal = MoveJournal(path)
+        restored = BoardState()
+        assert journal.restore(restored) == 6
+        assert restored.board.fen() == board.board.fen()
+        assert restored.move_history == board.move_history
+        assert restored.redo_move()  # The redo stack survives too
+        assert restored.board.piece_at(chess.F3) == chess.Piece(chess.KNIGHT, chess.WHITE)
+
+        # Promotions keep their piece; loading or resetting starts a new journal
+        restored.load_moves([chess.Move.from_uci(uci) for uci in
+                             ["a2a4", "h7h5", "a4a5", "h5h4", "a5a6", "h4h3", "a6b7", "h3g2"]])
+        restored.make_move_with_promotion(chess.B7, chess.A8, chess.KNIGHT)
+        journal.close()
+
+        journal = MoveJournal(path)
+        again = BoardState()
+        assert journal.restore(again) == 2
+        assert again.board.piece_at(chess.A8) == chess.Piece(chess.KNIGHT, chess.WHITE)
+        assert again.undo_move()
+        again.reset_to_initial_position()
+        journal.close()
+        with open(path, 'rb') as f:
+            assert f.read().count(b"\n") == 2  # Header and one empty game record
+
+        # A pending record is due for fsync once the sync interval has passed
+        journal = MoveJournal(path)
+        board = BoardState()
+        journal.restore(board)
+        assert journal.sync_due_in() is None  # Nothing pending
+        board.make_move(chess.E2, chess.E4)
+        assert 0 < journal.sync_due_in() <= journal.sync_interval
+        journal.last_sync -= journal.sync_interval
+        assert journal.sync_due_in() == 0
+        journal.close()
+    finally:
+        for suffix in ("", ".tmp"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    print("[PASS] Move journal working")
+
 def run_all_tests():
     """Run all test cases"""
     print("=" * 60)
@@ -489,6 +750,12 @@ def run_all_tests():
         test_fen_export,
         test_legal_move_generation,
         test_castling_rights,
+        test_helper_registry,
+        test_statistic_highlights,
+        test_exchange_masks,
+        test_batch_analysis,
+        test_analysis_cache,
+        test_move_journal,
     ]
 
     passed = 0
@@ -0,0 +1,305 @@
+"""
+Test suite for board rendering
+Runs headless (SDL dummy video driver) and checks that incremental frames
+draw exactly the same pixels as redrawing the whole window
+"""
+
+import os
+import sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import shutil
+import tempfile
+import chess
+import pygame
+from chess_board import BoardState, square_from_coords
+from config import GameConfig
+from display import ChessDisplay
+from piece_assets import find_piece_source, load_piece_images, piece_image_key
+
+WINDOW_WIDTH = 1000
+WINDOW_HEIGHT = 700
+
+def _make_display() -> ChessDisplay:
+    """Create a display that writes no analysis or piece image cache files"""
+    return ChessDisplay(WINDOW_WIDTH, WINDOW_HEIGHT, analysis_cache_path=None, piece_cache_directory=None)
+
+class _Renderer:
+    """Draws every frame twice: incrementally, and from scratch as the reference"""
+
+    def __init__(self):
+        self.display = _make_display()
+        self.screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.reference_display = _make_display()
+        self.reference_screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    def frame(self, board_state, *args, overlay=None):
+        """Draw one frame on both screens and return the incremental frame's dirty rects"""
+        self.reference_display.invalidate()
+        for display, screen in ((self.display, self.screen), (self.reference_display, self.reference_screen)):
+            display.update_display(screen, board_state, *args)
+            if overlay:
+                overlay(display, screen)
+        dirty_rects = self.display.take_dirty_rects()
+        assert pygame.image.tobytes(self.screen, "RGB") == pygame.image.tobytes(self.reference_screen, "RGB"), \
+            "incremental frame differs from a full redraw"
+        return dirty_rects
+
+def test_dirty_rect_rendering():
+    """Test that frames only redraw the squares and rows that changed"""
+    print("\nTesting dirty-rectangle rendering...")
+    pygame.init()
+    renderer = _Renderer()
+    board = BoardState()
+    full_window = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    # The first frame draws the whole window
+    assert renderer.frame(board) == [full_window]
+
+    # An unchanged frame draws nothing
+    assert renderer.frame(board) == []
+
+    # Selecting a pawn redraws its square and the two target squares
+    e2 = (6, 4)
+    targets = [(5, 4), (4, 4)]
+    assert len(renderer.frame(board, e2, targets)) == 3
+
+    # Hovering a square for exchange evaluation grays out the rest of the board
+    hover = renderer.display.get_square_display_position(6, 3)
+    renderer.frame(board, None, [], False, None, None, None, hover)
+    renderer.frame(board)
+
+    # A move updates its squares and the statistics rows
+    board.make_move(square_from_coords(6, 4), square_from_coords(4, 4))
+    dirty_rects = renderer.frame(board)
+    assert 0 < len(dirty_rects) < 64
+
+    # Dragging a piece draws it over the board, and the next frame repairs the square
+    knight = board.board.piece_at(chess.G8)
+    drag_pos = renderer.display.get_square_display_position(2, 5)
+    drag_args = (None, [], False, None, knight, (0, 6), drag_pos)
+    renderer.frame(board, *drag_args,
+                   overlay=lambda display, screen: display.draw_dragged_piece(screen, knight, drag_pos))
+    renderer.frame(board, *drag_args)
+
+    # Translucent overlays are repaired rather than drawn over themselves
+    for _ in range(2):
+        renderer.frame(board, overlay=lambda display, screen: display.draw_loading_indicator(screen, "Loading", 0.5))
+    renderer.frame(board)
+
+    # Flipping the board redraws everything
+    assert renderer.frame(board, None, [], True) == [full_window]
+
+    print("[PASS] Dirty-rectangle rendering working")
+
+def test_board_layer():
+    """Test that the static board background is rendered once per orientation"""
+    print("\nTesting board layer cache...")
+    pygame.init()
+    display = _make_display()
+
+    layer = display.get_board_layer(False)
+    flipped_layer = display.get_board_layer(True)
+    assert display.get_board_layer(False) is layer
+    assert flipped_layer is not layer
+
+    # The layer holds the plain squares: a1 is dark, and sits in the top right when flipped
+    x, y = display.get_square_display_position(7, 0)
+    assert layer.get_at((x + 1, y + 1))[:3] == display.DARK_SQUARE
+    x, y = display.get_square_display_position(7, 0, True)
+    assert (x, y) == (display.board_margin_x + 7 * display.square_size, display.board_margin_y)
+    assert flipped_layer.get_at((x + 1, y + 1))[:3] == display.DARK_SQUARE
+
+    print("[PASS] Board layer cache working")
+
+def test_overlay_layers():
+    """Test that overlay layers are only rebuilt when their input squares change"""
+    print("\nTesting overlay layers...")
+    pygame.init()
+    display = _make_display()
+    move_dots = [(5, 4), (4, 4)]
+
+    colors, glows, pins, dots, dimming = display.get_overlay_layers(
+        False, {(6, 4): display.SELECTED}, 0, 0, 0, move_dots, None)
+    assert colors is not None and dots is not None
+    assert glows is None and pins is None and dimming is None
+
+    # Same inputs reuse the cached surfaces
+    layers = display.get_overlay_layers(False, {(6, 4): display.SELECTED}, 0, 0, 0, list(reversed(move_dots)), None)
+    assert layers[0] is colors and layers[3] is dots
+
+    # A new highlight set rebuilds only the dimming layer
+    layers = display.get_overlay_layers(False, {(6, 4): display.SELECTED}, 0, 0, 0, move_dots, {(6, 4)})
+    assert layers[0] is colors and layers[3] is dots and layers[4] is not None
+    x, y = display.square_size * 4, display.square_size * 6
+    assert layers[4].get_at((x + display.square_size // 2, y + display.square_size // 2)).a == 0
+    assert layers[4].get_at((x + 1, y - display.square_size // 2)).a == 153
+
+    # Flipping the board rebuilds every layer
+    assert display.get_overlay_layers(True, {(6, 4): display.SELECTED}, 0, 0, 0, move_dots, None)[0] is not colors
+
+    print("[PASS] Overlay layers working")
+
+def test_piece_assets():
+    """Test that pieces are scaled from the nearest source resolution and cached on disk"""
+    print("\nTesting piece assets...")
+    pygame.init()
+
+    # The smallest source at least as tall as the piece is used
+    assert find_piece_source(chess.WHITE, chess.KNIGHT, 100).endswith(os.path.join("128h", "w_knight_png_128px.png"))
+    assert find_piece_source(chess.WHITE, chess.KNIGHT, 600).endswith(os.path.join("2x", "wN.png"))
+    assert find_piece_source(chess.WHITE, chess.KNIGHT, 5000).endswith(os.path.join("1024h", "w_knight_png_1024px.png"))
+
+    cache_directory = tempfile.mkdtemp()
+    load = pygame.image.load
+    try:
+        images = load_piece_images(80, cache_directory=cache_directory)
+        assert len(images) == 12
+        assert images[piece_image_key(chess.BLACK, chess.KING)].get_size() == (60, 60)
+        assert images[piece_image_key(chess.WHITE, chess.PAWN)].get_size() == (52, 52)
+        assert os.listdir(cache_directory) == ["pieces_80.bin"]
+
+        # A second launch reads the scaled pixels back without decoding any PNG
+        def fail_load(*args):
+            raise AssertionError("source image decoded despite the cache")
+        pygame.image.load = fail_load
+        cached = load_piece_images(80, cache_directory=cache_directory)
+        for key, image in images.items():
+            assert pygame.image.tobytes(cached[key], "RGBA") == pygame.image.tobytes(image, "RGBA")
+    finally:
+        pygame.image.load = load
+        shutil.rmtree(cache_directory)
+
+    print("[PASS] Piece assets working")
+
+def test_sprite_atlas():
+    """Test that pieces and indicators are packed into one atlas without overlaps"""
+    print("\nTesting sprite atlas...")
+    pygame.init()
+    display = _make_display()
+
+    names = list(display.sprite_rects)
+    assert len(names) == 16  # 12 pieces, 2 glows, the move dot and the pin
+    atlas_rect = display.sprite_atlas.get_rect()
+    for i, name in enumerate(names):
+        assert atlas_rect.contains(display.sprite_rects[name])
+        for other in names[i + 1:]:
+            assert not display.sprite_rects[name].colliderect(display.sprite_rects[other])
+
+    # Piece images are views into the atlas
+    white_queen = display.piece_images[piece_image_key(chess.WHITE, chess.QUEEN)]
+    assert white_queen.get_parent() is display.sprite_atlas
+    assert white_queen.get_abs_offset() == display.sprite_rects[piece_image_key(chess.WHITE, chess.QUEEN)].topleft
+
+    print("[PASS] Sprite atlas working")
+
+def test_text_cache():
+    """Test that rendered text is reused and evicted least recently used first"""
+    print("\nTesting text cache...")
+    pygame.init()
+    display = _make_display()
+    font = display.font_small
+    black = display.RGB_BLACK
+
+    label = display.render_text(font, "Activity", black)
+    assert display.render_text(font, "Activity", black) is label
+    assert display.render_text(font, "Activity", (255, 0, 0)) is not label
+    assert display.render_text(display.font_medium, "Activity", black) is not label
+
+    # Coordinates and panel labels come from the cache after the first frame
+    screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    display.update_display(screen, BoardState())
+    cached = len(display.text_cache)
+    display.invalidate()
+    display.update_display(screen, BoardState())
+    assert len(display.text_cache) == cached
+
+    cache_size = GameConfig.TEXT_CACHE_SIZE
+    GameConfig.TEXT_CACHE_SIZE = 3
+    try:
+        display.text_cache.clear()
+        for text in ["a", "b", "c"]:
+            display.render_text(font, text, black)
+        display.render_text(font, "a", black)  # "b" is now the least recently used
+        display.render_text(font, "d", black)
+        assert [key[1] for key in display.text_cache] == ["c", "a", "d"]
+    finally:
+        GameConfig.TEXT_CACHE_SIZE = cache_size
+
+    print("[PASS] Text cache working")
+
+def test_statistics_table():
+    """Test that the statistics table is re-rendered only for changed positions and cells"""
+    print("\nTesting statistics table cache...")
+    pygame.init()
+    display = _make_display()
+    board = BoardState()
+
+    assert display._update_statistics_table(board, False)  # First render draws every row
+    table = display.statistics_table
+    assert display._update_statistics_table(board.copy(), False) == []  # Same position
+    assert display.statistics_table is table
+
+    # After a move, only the changed cells are redrawn into the same surface...
+    board.make_move(chess.E2, chess.E4)
+    changed = display._update_statistics_table(board, False)
+    assert display.statistics_table is table
+    assert 0 < len(changed) < len(display.statistics_table_rows) * 3
+
+    # ...and the result matches a table rendered from scratch
+    fresh = _make_display()
+    fresh._update_statistics_table(board, False)
+    assert pygame.image.tobytes(table, "RGB") == pygame.image.tobytes(fresh.statistics_table, "RGB")
+
+    # Flipping swaps the player and opponent columns
+    assert display._update_statistics_table(board, True)
+    fresh = _make_display()
+    fresh._update_statistics_table(board, True)
+    assert pygame.image.tobytes(table, "RGB") == pygame.image.tobytes(fresh.statistics_table, "RGB")
+
+    print("[PASS] Statistics table cache working")
+
+def run_all_tests():
+    """Run all rendering tests"""
+    print("=" * 60)
+    print("RUNNING RENDERING TEST SUITE")
+    print("=" * 60)
+
+    tests = [
+        test_dirty_rect_rendering,
+        test_board_layer,
+        test_overlay_layers,
+        test_piece_assets,
+        test_sprite_atlas,
+        test_text_cache,
+        test_statistics_table,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"[FAIL] {test.__name__} FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"[FAIL] {test.__name__} ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"TEST RESULTS: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    if failed == 0:
+        print("\n ALL TESTS PASSED! Rendering is working correctly.")
+        return 0
+    else:
+        print(f"\n[WARNING] {failed} test(s) failed. Please review.")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())